@@ -0,0 +1,162 @@
+"""
+Experiment 4: Writing Clean Code
+Objective: Use the Calculator as a Unix filter over large pipelines instead
+of one input() prompt per run.
+
+Every input line is a record "a op b" (op: + - * / or add/sub/mul/div and the
+Calculator method names). Every output line holds the result of the
+matching input line, or "error: <message>" for that line, so input and
+output stay aligned. The exit status is 1 if any line failed.
+
+Input is read in blocks of about 1 MiB. A block whose lines all parse is
+evaluated column-wise in one batch. A block containing a bad line or a
+zero divisor falls back to per-line evaluation through the Calculator
+methods. Either way the block's output is written with one call. With
+--processes, blocks are evaluated in a process pool and written in input
+order; at most IN_FLIGHT blocks per process are read ahead, so a fast
+producer or a slow consumer never buffers the whole input in memory.
+
+    python calc_filter.py records.txt > results.txt
+    generate | python calc_filter.py --processes 4 | consume
+"""
+
+import argparse
+import operator
+import re
+import sys
+from collections import deque
+from contextlib import ExitStack
+from multiprocessing import Pool
+from typing import BinaryIO, Iterable, Iterator, List, Tuple
+
+from clean import Calculator
+
+BLOCK_SIZE = 1 << 20
+IN_FLIGHT = 2  # blocks queued or being evaluated per worker process
+RECORD = re.compile(rb"^[ \t]*(\S+)[ \t]+(\S+)[ \t]+(\S+)[ \t]*\r?$", re.MULTILINE)
+
+# Operator spellings -> Calculator method name
+METHODS = {
+    b'+': 'add', b'-': 'subtract', b'*': 'multiply', b'/': 'divide',
+    b'add': 'add', b'sub': 'subtract', b'mul': 'multiply', b'div': 'divide',
+    b'subtract': 'subtract', b'multiply': 'multiply', b'divide': 'divide',
+}
+# Batch equivalents; a zero divisor raises ZeroDivisionError and sends the
+# block back to the per-line path, which reports it as the Calculator does
+BATCH = {'add': operator.add, 'subtract': operator.sub, 'multiply': operator.mul, 'divide': operator.truediv}
+FAST = {op: BATCH[name] for op, name in METHODS.items()}
+
+
+def read_blocks(stream: BinaryIO, block_size: int = BLOCK_SIZE) -> Iterator[bytes]:
+    """Yield chunks of whole lines (each ending in a newline) from a binary stream."""
+    pending = b''
+    while True:
+        chunk = stream.read(block_size)
+        if not chunk:
+            break
+        cut = chunk.rfind(b'\n')
+        if cut < 0:
+            pending += chunk
+            continue
+        yield pending + chunk[:cut + 1]
+        pending = chunk[cut + 1:]
+    if pending:
+        yield pending + b'\n'
+
+
+def _evaluate_lines(block: bytes, calc: Calculator) -> Tuple[List[str], int]:
+    """Per-line path: every line gets a result or its own error message."""
+    out, errors = [], 0
+    for line in block.split(b'\n')[:-1]:
+        parts = line.split()
+        try:
+            if len(parts) != 3:
+                raise ValueError("expected 'a op b'")
+            a, op, b = parts
+            if op not in METHODS:
+                raise ValueError(f"unknown operator {op.decode(errors='replace')!r}")
+            result = getattr(calc, METHODS[op])(float(a), float(b))
+            out.append(repr(result))
+        except (ValueError, ArithmeticError) as e:
+            out.append(f"error: {e}")
+            errors += 1
+    return out, errors
+
+
+def evaluate_block(block: bytes) -> Tuple[bytes, int]:
+    """Evaluate a block of whole lines. Returns (output bytes, error count)."""
+    records = RECORD.findall(block)
+    if len(records) == block.count(b'\n'):
+        try:
+            results = [FAST[op](float(a), float(b)) for a, op, b in records]
+        except (KeyError, ValueError, ZeroDivisionError):
+            pass  # some line is bad: redo this block line by line
+        else:
+            return ('\n'.join(map(repr, results)) + '\n' if results else '').encode(), 0
+    out, errors = _evaluate_lines(block, Calculator())
+    return ('\n'.join(out) + '\n' if out else '').encode(), errors
+
+
+def _input_blocks(paths: Iterable[str], block_size: int) -> Iterator[bytes]:
+    if not paths:
+        yield from read_blocks(sys.stdin.buffer, block_size)
+        return
+    for path in paths:
+        if path == '-':
+            yield from read_blocks(sys.stdin.buffer, block_size)
+            continue
+        with open(path, 'rb') as f:
+            yield from read_blocks(f, block_size)
+
+
+def _pool_results(pool, blocks: Iterable[bytes], limit: int) -> Iterator[Tuple[bytes, int]]:
+    """evaluate_block over blocks in pool, in input order, with at most limit blocks in flight."""
+    # Unlike pool.imap, the next block is read only once the oldest result is taken
+    window = deque()
+    for block in blocks:
+        window.append(pool.apply_async(evaluate_block, (block,)))
+        if len(window) >= limit:
+            yield window.popleft().get()
+    while window:
+        yield window.popleft().get()
+
+
+def run_filter(paths: Iterable[str] = (), out: BinaryIO = None, processes: int = 1,
+               block_size: int = BLOCK_SIZE) -> Tuple[int, int]:
+    """Stream records from paths (default stdin) to out (default stdout). Returns (lines, errors)."""
+    out = out or sys.stdout.buffer
+    blocks = _input_blocks(paths, block_size)
+    lines = errors = 0
+    with ExitStack() as stack:
+        if processes > 1:
+            pool = stack.enter_context(Pool(processes))
+            results = _pool_results(pool, blocks, IN_FLIGHT * processes)
+        else:
+            results = map(evaluate_block, blocks)
+        for data, block_errors in results:
+            out.write(data)
+            lines += data.count(b'\n')
+            errors += block_errors
+    out.flush()
+    return lines, errors
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Evaluate 'a op b' records from stdin or files")
+    parser.add_argument('files', nargs='*', help="input files ('-' or none: stdin)")
+    parser.add_argument('-p', '--processes', type=int, default=1, help="worker processes (output stays in order)")
+    parser.add_argument('--block-size', type=int, default=BLOCK_SIZE)
+    parser.add_argument('--stats', action='store_true', help="print line/error counts to stderr")
+    args = parser.parse_args(argv)
+    try:
+        lines, errors = run_filter(args.files, processes=args.processes, block_size=args.block_size)
+    except BrokenPipeError:  # e.g. piped into head
+        sys.stderr.close()
+        return 0
+    if args.stats:
+        print(f"{lines:,} lines, {errors:,} errors", file=sys.stderr)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+"""
+Experiment 4: Calculator Metrics
+Objective: Count calls, errors and latencies per Calculator operation in
+fixed-size arrays, without slowing down calculators that are not measured.
+
+instrument() replaces the operation methods of one Calculator instance with
+timing wrappers; uninstrument() removes them again, so a calculator with
+metrics turned off runs its plain class methods with no extra work at all.
+Latencies go into power-of-two buckets: bucket k counts calls that took
+fewer than 2**k nanoseconds (and at least 2**(k-1)). Calculator classes get
+enable_metrics()/disable_metrics() from MetricsMixin.
+
+Periodic dumps are driven by calls, not by a timer: the dump_interval is
+checked when a measured call finishes, so an idle calculator logs nothing
+until its next call. Call dump() directly for a summary at a given moment.
+"""
+
+import logging
+import time
+from array import array
+
+BUCKETS = 32  # the last bucket also collects everything slower than ~1 s
+NEVER = 1 << 63
+
+
+class OperationMetrics:
+    """Per-operation call counters, error counters and latency histograms.
+
+    With a dump_interval, record() logs a summary once that many seconds have
+    passed since the last one (checked on each recorded call only).
+    """
+
+    def __init__(self, operations, dump_interval=None, logger=None):
+        self.operations = tuple(operations)
+        self.index = {op: i for i, op in enumerate(self.operations)}
+        size = len(self.operations)
+        self.calls = array('Q', bytes(8 * size))
+        self.errors = array('Q', bytes(8 * size))
+        self.latency = array('Q', bytes(8 * size * BUCKETS))  # row-major: operation x bucket
+        self.logger = logger or logging.getLogger('calculator.metrics')
+        self.dump_interval = dump_interval
+        self._next_dump = time.perf_counter_ns() + int(dump_interval * 1e9) if dump_interval else NEVER
+
+    def record(self, index, end_ns, elapsed_ns, errors=0):
+        """Count one call of operation `index`; called by the instrumented methods."""
+        self.calls[index] += 1
+        if errors:
+            self.errors[index] += errors
+        self.latency[index * BUCKETS + min(elapsed_ns.bit_length(), BUCKETS - 1)] += 1
+        if end_ns >= self._next_dump:
+            self._next_dump = end_ns + int(self.dump_interval * 1e9)
+            self.dump()
+
+    def percentile(self, operation, fraction):
+        """Upper bound (ns) of the histogram bucket holding the given fraction of calls."""
+        i = self.index[operation]
+        calls = self.calls[i]
+        if not calls:
+            return None
+        target, seen = fraction * calls, 0
+        for bucket in range(BUCKETS):
+            seen += self.latency[i * BUCKETS + bucket]
+            if seen >= target:
+                return 1 << bucket
+        return 1 << (BUCKETS - 1)
+
+    def export(self):
+        """Snapshot as {operation: {calls, errors, p50_ns, p99_ns, latency_buckets}}."""
+        snapshot = {}
+        for op, i in self.index.items():
+            snapshot[op] = {
+                'calls': self.calls[i],
+                'errors': self.errors[i],
+                'p50_ns': self.percentile(op, 0.50),
+                'p99_ns': self.percentile(op, 0.99),
+                'latency_buckets': self.latency[i * BUCKETS:(i + 1) * BUCKETS].tolist(),
+            }
+        return snapshot
+
+    def dump(self, level=logging.INFO):
+        """Log one line per operation that has been called."""
+        for op, stats in self.export().items():
+            if stats['calls']:
+                self.logger.log(level, "%s: %d calls, %d errors, p50 <= %d ns, p99 <= %d ns",
+                                op, stats['calls'], stats['errors'], stats['p50_ns'], stats['p99_ns'])
+
+    def reset(self):
+        for counters in (self.calls, self.errors, self.latency):
+            counters[:] = array('Q', bytes(8 * len(counters)))
+
+
+def _timed(method, metrics, index, count_errors):
+    clock = time.perf_counter_ns
+    record = metrics.record
+
+    def wrapper(*args, **kwargs):
+        start = clock()
+        try:
+            result = method(*args, **kwargs)
+        except Exception:
+            end = clock()
+            record(index, end, end - start, 1)
+            raise
+        end = clock()
+        record(index, end, end - start, count_errors(result) if count_errors else 0)
+        return result
+
+    wrapper.__wrapped__ = method
+    return wrapper
+
+
+def instrument(calc, operations, dump_interval=None, logger=None, error_counters=None):
+    """
+    Wrap calc's methods named in `operations` and return their OperationMetrics.
+    Raised exceptions count as errors; error_counters can map an operation to a
+    function returning the number of failures in a returned result.
+    """
+    uninstrument(calc)
+    metrics = OperationMetrics(operations, dump_interval, logger)
+    error_counters = error_counters or {}
+    for op, index in metrics.index.items():
+        setattr(calc, op, _timed(getattr(calc, op), metrics, index, error_counters.get(op)))
+    calc.metrics = metrics
+    return metrics
+
+
+def uninstrument(calc):
+    """Remove the wrappers so calls go straight to the class methods again."""
+    metrics = calc.__dict__.pop('metrics', None)
+    if metrics is not None:
+        for op in metrics.operations:
+            calc.__dict__.pop(op, None)
+    return metrics
+
+
+class MetricsMixin:
+    """
+    enable_metrics()/disable_metrics() for a Calculator class. The class names
+    the methods to measure in METRIC_OPERATIONS and can override
+    metric_error_counters() for failures that are returned instead of raised.
+    """
+
+    METRIC_OPERATIONS = ()
+    metrics = None  # OperationMetrics while instrumentation is enabled
+
+    def metric_error_counters(self):
+        """{operation: function(result) -> number of failures in that result}."""
+        return None
+
+    def enable_metrics(self, dump_interval=None):
+        """Count calls, errors and latencies per operation; a summary is logged on the
+        first call finishing dump_interval seconds or more after the previous one."""
+        return instrument(self, self.METRIC_OPERATIONS, dump_interval,
+                          error_counters=self.metric_error_counters())
+
+    def disable_metrics(self):
+        """Stop measuring; returns the collected OperationMetrics (or None)."""
+        return uninstrument(self)
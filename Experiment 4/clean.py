@@ -3,9 +3,17 @@ Experiment 4: Writing Clean Code
 Objective: Refactor a calculator into professional, documented code.
 """
 
-class Calculator:
+import sys
+
+from calc_metrics import MetricsMixin
+
+OPERATIONS = ('add', 'subtract', 'multiply', 'divide')
+
+class Calculator(MetricsMixin):
     """A class to handle basic mathematical operations with error handling."""
 
+    METRIC_OPERATIONS = OPERATIONS  # measured by enable_metrics()
+
     def add(self, x: float, y: float) -> float:
         """Returns the sum of two numbers."""
         return x + y
@@ -44,5 +52,8 @@ def main():
         print(f"Input Error: {e}")
 
 if __name__ == "__main__":
+    if '--pipe' in sys.argv[1:]:  # filter mode: python clean.py --pipe < records.txt
+        from calc_filter import main as filter_main
+        sys.exit(filter_main([a for a in sys.argv[1:] if a != '--pipe']))
     run_tests()  # Run internal verification
     main()
\ No newline at end of file
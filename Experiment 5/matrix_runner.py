@@ -0,0 +1,214 @@
+"""
+University of South Asia
+Experiment 5: Large-Matrix Unit Testing
+Objective: Check the Calculator against hundreds of thousands of generated
+operand combinations, sharded across worker processes.
+
+Operands mix edge values (zeros, infinities, NaN, subnormals, huge
+magnitudes) with seeded random numbers. Every (operation, a, b) case is
+compared with reference(), an oracle that never uses the operation under
+test: special values follow the IEEE-754 rules and finite operands are
+computed exactly with Fraction and rounded once. Division by zero is checked
+separately against its own contract (divide returns None). Whole shards are
+timed and the slowest shards reported. The hand-written TestCalculator cases
+run once, with their setUp/tearDown output silenced.
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import math
+import os
+import random
+import sys
+import time
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from fractions import Fraction
+
+EDGE_VALUES = [
+    0.0, -0.0, 1.0, -1.0, 0.5, 2.0, 10.0, -10.0,
+    5e-324, -5e-324, 2.2250738585072014e-308,   # subnormal / smallest normal
+    1e308, -1e308, 1.7976931348623157e308,     # huge magnitudes
+    2.0 ** 53, 2.0 ** 53 + 1, -(2.0 ** 63),     # integer precision limits
+    math.inf, -math.inf, math.nan,
+]
+
+OPERATIONS = ['add', 'subtract', 'multiply', 'divide']
+
+
+def _negative(x):
+    return math.copysign(1.0, x) < 0
+
+
+def _round(exact):
+    """Round an exact Fraction to the nearest double, overflowing to +-inf."""
+    try:
+        return float(exact)
+    except OverflowError:
+        return -math.inf if exact < 0 else math.inf
+
+
+def reference(op, a, b):
+    """
+    Expected double result of the Calculator's `op` on floats a and b, worked
+    out without the float operation itself. Not defined for divide by zero.
+    """
+    if op == 'divide' and b == 0:
+        raise ValueError("division by zero is checked against its own contract")
+    if math.isnan(a) or math.isnan(b):
+        return math.nan
+    if op == 'subtract':
+        op, b = 'add', -b  # negation only flips the sign bit, so it is exact
+    if op == 'add':
+        if math.isinf(a) or math.isinf(b):
+            if math.isinf(a) and math.isinf(b) and _negative(a) != _negative(b):
+                return math.nan  # inf - inf
+            return a if math.isinf(a) else b
+        exact = Fraction(a) + Fraction(b)
+        if exact == 0:
+            # Exact cancellation rounds to +0; only -0 + -0 stays negative
+            return -0.0 if _negative(a) and _negative(b) else 0.0
+        return _round(exact)
+
+    negative = _negative(a) != _negative(b)
+    if op == 'multiply':
+        if math.isinf(a) or math.isinf(b):
+            if a == 0 or b == 0:
+                return math.nan  # inf * 0
+            return -math.inf if negative else math.inf
+        exact = Fraction(a) * Fraction(b)
+    elif op == 'divide':
+        if math.isinf(a):
+            if math.isinf(b):
+                return math.nan  # inf / inf
+            return -math.inf if negative else math.inf
+        if math.isinf(b):
+            return -0.0 if negative else 0.0
+        exact = Fraction(a) / Fraction(b)
+    else:
+        raise ValueError(f"unknown operation {op!r}")
+    # copysign also restores the sign of results that underflow to zero
+    return math.copysign(_round(exact), -1.0 if negative else 1.0)
+
+
+def load_calculator_module():
+    """Load test.py by path; the name 'test' would clash with the stdlib package."""
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test.py')
+    spec = importlib.util.spec_from_file_location('calculator_unit', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def operand_values(random_count, seed=5):
+    rng = random.Random(seed)
+    values = list(EDGE_VALUES)
+    for _ in range(random_count):
+        magnitude = 10.0 ** rng.randint(-300, 300)
+        values.append(rng.uniform(-1, 1) * magnitude)
+    return values
+
+
+def same(actual, expected):
+    """Equality that treats NaN == NaN, tells -0.0 from 0.0 and distinguishes None."""
+    if actual is None or expected is None:
+        return actual is expected
+    if not isinstance(actual, float):
+        return False
+    if math.isnan(actual) or math.isnan(expected):
+        return math.isnan(actual) and math.isnan(expected)
+    return actual == expected and _negative(actual) == _negative(expected)
+
+
+def run_shard(task):
+    """Worker: check one operation for every (a-index, b) combination in one shard."""
+    values, op, a_indices = task
+    module = load_calculator_module()
+    method = getattr(module.Calculator(), op)
+
+    # Time the calls for the whole shard at once (a single ~100 ns call is below
+    # the clock's useful resolution), then check the outcomes outside the timing
+    outcomes = []
+    start = time.perf_counter_ns()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i in a_indices:
+            a = values[i]
+            for b in values:
+                try:
+                    outcomes.append(method(a, b))
+                except Exception as e:  # record, never abort the shard
+                    outcomes.append(f"{type(e).__name__}: {e}")
+    elapsed = time.perf_counter_ns() - start
+
+    failures = []
+    checked = zero_checked = 0
+    pairs = ((values[i], b) for i in a_indices for b in values)
+    for (a, b), actual in zip(pairs, outcomes):
+        if op == 'divide' and b == 0:
+            # Separate contract: dividing by (signed) zero returns None
+            zero_checked += 1
+            if actual is not None and len(failures) < 100:
+                failures.append((op, a, b, repr(actual), "None (division by zero)"))
+            continue
+        checked += 1
+        expected = reference(op, a, b)
+        if not same(actual, expected) and len(failures) < 100:
+            failures.append((op, a, b, repr(actual), repr(expected)))
+    return checked, zero_checked, failures, elapsed
+
+
+def run_unit_tests():
+    """Run the hand-written TestCalculator cases quietly; returns (run, problems)."""
+    module = load_calculator_module()
+    module.TestCalculator.verbose = False
+    suite = unittest.defaultTestLoader.loadTestsFromTestCase(module.TestCalculator)
+    result = unittest.TextTestRunner(stream=io.StringIO(), verbosity=0).run(suite)
+    return result.testsRun, len(result.failures) + len(result.errors)
+
+
+def run_matrix(random_count=480, processes=None, shards=None, slowest_count=10):
+    values = operand_values(random_count)
+    processes = processes or os.cpu_count() or 1
+    shards = shards or processes * 4
+    a_shards = [list(range(k, len(values), shards)) for k in range(shards)]
+    tasks = [(values, op, idx) for op in OPERATIONS for idx in a_shards]
+    total = len(values) ** 2 * len(OPERATIONS)
+    print(f"🧪 Matrix: {len(values)} x {len(values)} operands x {len(OPERATIONS)} operations "
+          f"= {total:,} cases on {processes} processes ({len(tasks)} shards)")
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        results = list(pool.map(run_shard, tasks))
+    wall = time.perf_counter() - start
+
+    checked = sum(r[0] for r in results)
+    zero_checked = sum(r[1] for r in results)
+    failures = [f for r in results for f in r[2]]
+    busy = sum(r[3] for r in results) / 1e9  # time spent in Calculator calls
+
+    unit_run, unit_problems = run_unit_tests()
+    print(f"✅ Unit tests: {unit_run} run, {unit_problems} failed")
+    print(f"{'✅' if not failures else '❌'} Matrix: {checked:,} cases checked against the oracle and "
+          f"{zero_checked:,} division-by-zero cases, {len(failures)} failures "
+          f"in {wall:.2f}s wall ({busy:.3f}s in Calculator calls)")
+    for op, a, b, actual, expected in failures[:10]:
+        print(f"   ❌ {op}({a!r}, {b!r}) -> {actual}, expected {expected}")
+
+    timings = sorted(((r[3], task[1], k % shards, r[0] + r[1]) for k, (task, r) in enumerate(zip(tasks, results))),
+                     reverse=True)[:slowest_count]
+    print(f"\n🐢 Slowest {len(timings)} shards:")
+    for elapsed, op, k, cases in timings:
+        print(f"   {elapsed / 1e6:8.1f} ms  {op:<8} shard {k:<3} {elapsed / cases:7.1f} ns/case")
+    return not failures and not unit_problems
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sharded large-matrix tests for the Calculator")
+    parser.add_argument('--random', type=int, default=480, help="random operands added to the edge values")
+    parser.add_argument('--processes', type=int)
+    parser.add_argument('--shards', type=int)
+    parser.add_argument('--slowest', type=int, default=10, help="number of slowest shards to list")
+    args = parser.parse_args()
+    sys.exit(0 if run_matrix(args.random, args.processes, args.shards, args.slowest) else 1)
@@ -20,16 +20,21 @@ class Calculator:
 # [Concept 2: Test Class] Inherits from unittest.TestCase
 class TestCalculator(unittest.TestCase):
 
+    # Set to False to silence setUp/tearDown (e.g. in matrix_runner.py workers)
+    verbose = True
+
     # [Concept 3: setUp Method]
     def setUp(self):
         """Prepares the environment before each test."""
         self.calc = Calculator()
-        print("Test Setup: Instance created.")
+        if self.verbose:
+            print("Test Setup: Instance created.")
 
     # [Concept 4: tearDown Method]
     def tearDown(self):
         """Cleans up resources after each test."""
-        print("Test Teardown: Resources cleared.")
+        if self.verbose:
+            print("Test Teardown: Resources cleared.")
 
     # [Concept 5: Assertion Methods]
     def test_addition(self):
@@ -54,6 +59,59 @@ class TestCalculator(unittest.TestCase):
         results = [self.calc.add(1, 1), self.calc.add(2, 2)]
         self.assertIn(2, results)
 
+# [Concept 6: Generated Cases with subTest]
+# The edge values and seeded random operands of matrix_runner.py, checked
+# against its exact-arithmetic oracle; each failing case is reported on its own.
+class TestCalculatorMatrix(unittest.TestCase):
+
+    def setUp(self):
+        from matrix_runner import operand_values  # sibling module, imported lazily
+        self.calc = Calculator()
+        self.values = operand_values(20)
+
+    def test_generated_cases(self):
+        from matrix_runner import OPERATIONS, reference, same
+        for op in OPERATIONS:
+            method = getattr(self.calc, op)
+            for a in self.values:
+                for b in self.values:
+                    if op == 'divide' and b == 0:
+                        continue  # covered by test_divide_by_zero_contract
+                    with self.subTest(op=op, a=a, b=b):
+                        expected = reference(op, a, b)
+                        self.assertTrue(same(method(a, b), expected), f"expected {expected!r}")
+
+    def test_divide_by_zero_contract(self):
+        for a in self.values:
+            for zero in (0, 0.0, -0.0):
+                with self.subTest(a=a, zero=zero):
+                    self.assertIsNone(self.calc.divide(a, zero))
+
+    def test_oracle_known_answers(self):
+        # Hand-checked IEEE-754 results, so the oracle itself is tested too
+        from matrix_runner import reference, same
+        nan, inf = float('nan'), float('inf')
+        for op, a, b, expected in [
+            ('add', 0.1, 0.2, 0.30000000000000004),
+            ('add', 2.0 ** 53, 1.0, 2.0 ** 53),         # tie rounds to even
+            ('add', -0.0, -0.0, -0.0),
+            ('add', 1.0, -1.0, 0.0),
+            ('add', inf, -inf, nan),
+            ('subtract', 0.0, 0.0, 0.0),
+            ('subtract', -0.0, 0.0, -0.0),
+            ('subtract', 1e308, -1e308, inf),
+            ('multiply', 1e200, -1e200, -inf),
+            ('multiply', 5e-324, 0.5, 0.0),             # tie rounds to even (zero)
+            ('multiply', -1e-200, 1e-200, -0.0),
+            ('multiply', inf, 0.0, nan),
+            ('divide', 1.0, 3.0, 0.3333333333333333),
+            ('divide', 5e-324, -2.0, -0.0),
+            ('divide', -1.0, inf, -0.0),
+            ('divide', 1.7976931348623157e308, 0.5, inf),
+        ]:
+            with self.subTest(op=op, a=a, b=b):
+                self.assertTrue(same(reference(op, a, b), expected), f"oracle gave {reference(op, a, b)!r}")
+
 # ==========================================
 # EXECUTION ENGINE
 # ==========================================
@@ -0,0 +1,148 @@
+"""
+Experiment 5: Unit Testing Implementation
+Tests for the cached, parallel build runner of Experiment 7 (build_runner.py).
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from importlib import metadata
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Experiment 7'))
+
+from build_runner import REQUIREMENTS, BuildRunner, Task, build_tasks, write_if_changed  # noqa: E402
+
+
+class TestBuildRunner(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        patcher = mock.patch('builtins.print')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.state = self.path('.build_state.json')
+        self.source = self.path('source.txt')
+        self.compiled = self.path('compiled.txt')
+        self.packaged = self.path('packaged.txt')
+        write_if_changed(self.source, "v1")
+        self.calls = []
+
+    def path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    def copy(self, name, src, dst, transform=str.upper):
+        def action():
+            self.calls.append(name)
+            with open(src) as f:
+                write_if_changed(dst, transform(f.read()))
+        return action
+
+    def runner(self, params=None, probe=None, fail=False):
+        def package():
+            if fail:
+                raise RuntimeError("packaging failed")
+            self.copy('package', self.compiled, self.packaged, str.strip)()
+
+        tasks = [
+            Task('package', package, inputs=[self.compiled], outputs=[self.packaged], deps=['compile']),
+            Task('compile', self.copy('compile', self.source, self.compiled), inputs=[self.source],
+                 outputs=[self.compiled], params=params),
+            Task('notes', lambda: self.calls.append('notes'), probe=probe),
+        ]
+        return BuildRunner(tasks, state_file=self.state, workers=2)
+
+    def test_second_run_is_cached(self):
+        self.assertEqual(self.runner().run(), {'compile': 'ran', 'notes': 'ran', 'package': 'ran'})
+        self.assertLess(self.calls.index('compile'), self.calls.index('package'))
+        self.calls.clear()
+        self.assertEqual(set(self.runner().run().values()), {'cached'})
+        self.assertEqual(self.calls, [])
+        with open(self.packaged) as f:
+            self.assertEqual(f.read(), "V1")
+
+    def test_changed_input_reruns_the_task_and_what_depends_on_it(self):
+        self.runner().run()
+        write_if_changed(self.source, "v2 longer")
+        self.calls.clear()
+        self.assertEqual(self.runner().run(), {'compile': 'ran', 'notes': 'cached', 'package': 'ran'})
+        with open(self.packaged) as f:
+            self.assertEqual(f.read(), "V2 LONGER")
+
+    def test_params_missing_outputs_and_force(self):
+        self.runner().run()
+        self.assertEqual(self.runner(params={'level': 2}).run()['compile'], 'ran')
+        os.remove(self.packaged)
+        self.assertEqual(self.runner(params={'level': 2}).run(),
+                         {'compile': 'cached', 'notes': 'cached', 'package': 'ran'})
+        self.assertEqual(set(self.runner(params={'level': 2}).run(force=True).values()), {'ran'})
+
+    def test_probe_detects_state_outside_the_files(self):
+        installed = {'numpy': '2.0.0'}
+        probe = lambda: dict(installed)  # noqa: E731
+        self.runner(probe=probe).run()
+        self.assertEqual(self.runner(probe=probe).run()['notes'], 'cached')
+        installed['numpy'] = None
+        self.assertEqual(self.runner(probe=probe).run()['notes'], 'ran')
+
+    def test_targets_select_their_dependencies(self):
+        self.assertEqual(self.runner().run(['package']), {'compile': 'ran', 'package': 'ran'})
+
+    def test_failure_keeps_the_tasks_that_succeeded(self):
+        with self.assertRaisesRegex(RuntimeError, "packaging failed"):
+            self.runner(fail=True).run()
+        self.calls.clear()
+        self.assertEqual(self.runner().run(), {'compile': 'cached', 'notes': 'cached', 'package': 'ran'})
+
+    def test_tasks_still_running_at_a_failure_are_kept(self):
+        failed = threading.Event()
+
+        def fail():
+            failed.set()
+            raise RuntimeError("lint failed")
+
+        tasks = [Task('docs', lambda: failed.wait(5)), Task('lint', fail)]
+        with self.assertRaisesRegex(RuntimeError, "lint failed"):
+            BuildRunner(tasks, state_file=self.state, workers=2).run()
+        self.assertEqual(BuildRunner(tasks[:1], state_file=self.state).run(), {'docs': 'cached'})
+
+    def test_main_thread_tasks(self):
+        threads = {}
+        tasks = [Task(name, lambda name=name: threads.setdefault(name, threading.current_thread()),
+                      main_thread=name == 'plot') for name in ('plot', 'write')]
+        BuildRunner(tasks, state_file=self.state).run()
+        self.assertIs(threads['plot'], threading.main_thread())
+        self.assertIsNot(threads['write'], threading.main_thread())
+
+    def test_bad_graphs(self):
+        with self.assertRaisesRegex(ValueError, "unknown"):
+            BuildRunner([Task('a', None, deps=['b'])], state_file=self.state)
+        with self.assertRaisesRegex(ValueError, "cycle"):
+            BuildRunner([Task('a', None, deps=['b']), Task('b', None, deps=['a'])], state_file=self.state)
+
+    def test_lab_install_task_rechecks_installed_packages(self):
+        cwd = os.getcwd()
+        os.chdir(self.tmp.name)
+        self.addCleanup(os.chdir, cwd)
+        installs = []
+
+        def requirements():
+            write_if_changed('requirements.txt', REQUIREMENTS)
+
+        def run(versions):
+            with mock.patch.object(metadata, 'version', side_effect=versions.__getitem__):
+                tasks = build_tasks(requirements, lambda: write_if_changed('setup.py', ''), installs.append, '')
+                return BuildRunner(tasks, state_file=self.state).run()
+
+        versions = {'numpy': '1.24.3', 'pandas': '2.0.2', 'matplotlib': '3.7.1'}
+        self.assertEqual(set(run(versions).values()), {'ran'})
+        self.assertEqual(set(run(versions).values()), {'cached'})
+        self.assertEqual(run({**versions, 'pandas': '2.2.0'})['install'], 'ran')
+        self.assertEqual(installs, [None, None])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+"""
+Experiment 5: Unit Testing Implementation
+Tests for the Calculator Unix filter of Experiment 4 (calc_filter.py).
+"""
+
+import io
+import os
+import sys
+import tempfile
+import unittest
+from multiprocessing import Pool
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Experiment 4'))
+
+from calc_filter import _pool_results, evaluate_block, run_filter  # noqa: E402
+
+RECORDS = b"".join(b"%d %s %d\n" % (i, op, i % 4) for i in range(2000)
+                   for op in (b'+', b'/', b'mul', b'pow'))
+
+
+class TestCalcFilter(unittest.TestCase):
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp()
+        with os.fdopen(handle, 'wb') as f:
+            f.write(RECORDS)
+        self.addCleanup(os.remove, self.path)
+
+    def test_pool_output_matches_serial_output(self):
+        serial, pooled = io.BytesIO(), io.BytesIO()
+        self.assertEqual(run_filter([self.path], serial, block_size=4096), (8000, 2500))
+        self.assertEqual(run_filter([self.path], pooled, processes=2, block_size=4096), (8000, 2500))
+        self.assertEqual(pooled.getvalue(), serial.getvalue())
+        self.assertIn(b"error: Cannot divide by zero", serial.getvalue())
+
+    def test_read_ahead_is_bounded(self):
+        blocks = [RECORDS[i:i + 40] for i in range(0, 4000, 40)]
+        blocks = [block[:block.rfind(b'\n') + 1] for block in blocks]
+        read = []
+
+        def source():
+            for block in blocks:
+                read.append(block)
+                yield block
+
+        with Pool(2) as pool:
+            for taken, result in enumerate(_pool_results(pool, source(), 4), 1):
+                self.assertLessEqual(len(read) - taken, 3)
+                self.assertEqual(result, evaluate_block(blocks[taken - 1]))
+        self.assertEqual(taken, len(blocks))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+"""
+Experiment 5: Unit Testing Implementation
+Tests for the optional per-operation metrics of Experiment 4 (calc_metrics.py)
+on clean.Calculator and Experiment 7's marven.Calculator.
+"""
+
+import importlib.util
+import logging
+import os
+import sys
+import unittest
+from unittest import mock
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..', 'Experiment 4'))
+sys.path.insert(0, os.path.join(HERE, '..', 'Experiment 7'))
+
+from calc_metrics import BUCKETS, OperationMetrics  # noqa: E402
+from clean import Calculator  # noqa: E402
+
+HAVE_NUMPY = importlib.util.find_spec('numpy')
+
+
+class TestCleanCalculatorMetrics(unittest.TestCase):
+
+    def setUp(self):
+        self.calc = Calculator()
+
+    def test_disabled_by_default(self):
+        self.assertIsNone(self.calc.metrics)
+        self.assertNotIn('add', vars(self.calc))
+
+    def test_calls_errors_and_latency(self):
+        metrics = self.calc.enable_metrics()
+        for i in range(5):
+            self.calc.add(i, 1)
+        self.calc.divide(6, 3)
+        with self.assertRaises(ValueError):
+            self.calc.divide(1, 0)
+        stats = metrics.export()
+        self.assertEqual((stats['add']['calls'], stats['add']['errors']), (5, 0))
+        self.assertEqual((stats['divide']['calls'], stats['divide']['errors']), (2, 1))
+        self.assertEqual(stats['multiply']['calls'], 0)
+        self.assertIsNone(stats['multiply']['p50_ns'])
+        self.assertEqual(sum(stats['add']['latency_buckets']), 5)
+        self.assertLessEqual(stats['add']['p50_ns'], stats['add']['p99_ns'])
+
+    def test_disable_restores_the_plain_methods(self):
+        metrics = self.calc.enable_metrics()
+        self.calc.add(1, 2)
+        self.assertIs(self.calc.disable_metrics(), metrics)
+        self.assertIsNone(self.calc.metrics)
+        self.assertEqual(self.calc.add.__func__, Calculator.add)
+        self.assertEqual(self.calc.add(1, 2), 3)
+        self.assertEqual(metrics.calls[metrics.index['add']], 1)
+        self.assertIsNone(self.calc.disable_metrics())
+
+    def test_enabling_again_starts_fresh(self):
+        self.calc.enable_metrics()
+        self.calc.add(1, 2)
+        metrics = self.calc.enable_metrics()
+        self.calc.add(1, 2)
+        self.assertEqual(metrics.export()['add']['calls'], 1)
+        self.assertIs(self.calc.add.__wrapped__.__func__, Calculator.add)
+
+    def test_dump_is_driven_by_calls(self):
+        metrics = self.calc.enable_metrics(dump_interval=3600)
+        with mock.patch.object(metrics, 'dump') as dump:
+            self.calc.add(1, 2)
+        dump.assert_not_called()
+        metrics._next_dump = 0  # the interval has passed
+        with self.assertLogs('calculator.metrics', logging.INFO) as logs:
+            self.calc.subtract(1, 2)
+        self.assertEqual(len(logs.records), 2)
+        self.assertIn("add: 1 calls, 0 errors", logs.output[0])
+
+
+class TestOperationMetrics(unittest.TestCase):
+
+    def test_histogram_buckets_and_percentiles(self):
+        metrics = OperationMetrics(['op'])
+        for elapsed in [1, 3, 3, 100, 10 ** 12]:
+            metrics.record(0, 0, elapsed)
+        buckets = metrics.export()['op']['latency_buckets']
+        self.assertEqual((buckets[1], buckets[2], buckets[7], buckets[BUCKETS - 1]), (1, 2, 1, 1))
+        self.assertEqual(metrics.percentile('op', 0.5), 4)  # 3 ns lies in [2, 4)
+        self.assertEqual(metrics.percentile('op', 1.0), 1 << (BUCKETS - 1))
+        metrics.reset()
+        self.assertEqual(metrics.export()['op']['calls'], 0)
+
+
+@unittest.skipUnless(HAVE_NUMPY, "needs numpy")
+class TestMarvenCalculatorMetrics(unittest.TestCase):
+
+    def setUp(self):
+        import marven
+        with mock.patch('builtins.print'):
+            self.calc = marven.Calculator()
+
+    def test_returned_errors_are_counted(self):
+        metrics = self.calc.enable_metrics()
+        self.assertEqual(self.calc.divide(1, 0), "Error")
+        self.calc.divide(4, 2)
+        self.calc.divide_batch([1, 2, 3], [0, 1, 0])
+        self.calc.add_batch([1, 2], [3, 4])
+        stats = metrics.export()
+        self.assertEqual((stats['divide']['calls'], stats['divide']['errors']), (2, 1))
+        self.assertEqual((stats['divide_batch']['calls'], stats['divide_batch']['errors']), (1, 2))
+        self.assertEqual(stats['add_batch']['calls'], 1)
+        self.calc.disable_metrics()
+        self.calc.divide(1, 0)
+        self.assertEqual(metrics.export()['divide']['calls'], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
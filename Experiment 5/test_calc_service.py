@@ -0,0 +1,147 @@
+"""
+Experiment 5: Unit Testing Implementation
+Tests for the asyncio Calculator service of Experiment 7 (calc_service.py),
+run against a real server listening on an ephemeral localhost port.
+"""
+
+import asyncio
+import importlib.util
+import itertools
+import math
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Experiment 7'))
+
+from calc_service import (HEADER, LENGTH, MAX_FRAME, STATUS_ERROR,  # noqa: E402
+                          CalculatorClient, CalculatorServer, ServiceError)
+
+HAVE_NUMPY = importlib.util.find_spec('numpy')
+
+
+class TestCalculatorService(unittest.IsolatedAsyncioTestCase):
+
+    backend = 'clean'
+
+    async def asyncSetUp(self):
+        self.server = CalculatorServer(self.backend, history_capacity=5)
+        self.listener = await self.server.start('127.0.0.1', 0)
+        self.port = self.listener.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self):
+        self.listener.close()
+        await self.listener.wait_closed()
+
+    async def test_calculations_and_history(self):
+        async with CalculatorClient(port=self.port, pool_size=2) as client:
+            self.assertEqual(await client.add(10, 5), 15.0)
+            self.assertTrue(math.isnan(await client.divide(1, 0)))
+            results = await asyncio.gather(*(client.batch('multiply', [i, i + 1], [2, 2]) for i in range(10)))
+            self.assertEqual([list(r) for r in results], [[2 * i, 2 * i + 2] for i in range(10)])
+            history = await client.history(2)
+            self.assertEqual(len(history), 2)
+            self.assertEqual(history[-1][0], 'multiply')
+            self.assertEqual(await client.history(0), [])
+
+    async def test_mismatched_batch_is_rejected(self):
+        async with CalculatorClient(port=self.port, pool_size=1) as client:
+            with self.assertRaises(ValueError):
+                await client.batch('add', [1, 2, 3], [1, 2])
+            with self.assertRaises(ValueError):
+                await client.batch('add', iter([1]), (x for x in [1, 2]))
+            self.assertEqual(list(await client.batch('add', iter([1, 2]), [3, 4])), [4.0, 6.0])
+
+    async def test_history_is_bounded(self):
+        async with CalculatorClient(port=self.port, pool_size=1) as client:
+            await client.batch('add', list(range(20)), [1] * 20)
+            history = await client.history(100)
+            self.assertEqual([entry[1] for entry in history], [15.0, 16.0, 17.0, 18.0, 19.0])
+            self.assertEqual([entry[1] for entry in await client.history(2)], [18.0, 19.0])
+
+    async def test_request_ids_skip_zero_when_wrapping(self):
+        async with CalculatorClient(port=self.port, pool_size=1) as client:
+            client._ids = itertools.count(0xFFFFFFFF - 2)
+            conn = client._pool[0]
+            send, used = conn.send, []
+
+            def recording_send(request_id, *args):
+                used.append(request_id)
+                return send(request_id, *args)
+
+            conn.send = recording_send
+            for _ in range(4):
+                await client.ping()
+            self.assertEqual(used, [0xFFFFFFFE, 0xFFFFFFFF, 1, 2])
+
+    async def test_short_frame_gets_an_error_status(self):
+        reader, writer = await asyncio.open_connection('127.0.0.1', self.port)
+        writer.write(LENGTH.pack(3) + b'abc')
+        (length,) = LENGTH.unpack(await reader.readexactly(LENGTH.size))
+        request_id, status, _ = HEADER.unpack(await reader.readexactly(HEADER.size))
+        message = await reader.readexactly(length - HEADER.size)
+        self.assertEqual((request_id, status), (0, STATUS_ERROR))
+        self.assertIn(b'shorter', message)
+        # The connection stays usable for well-formed requests
+        writer.write(LENGTH.pack(HEADER.size) + HEADER.pack(7, 11, 0))
+        await reader.readexactly(LENGTH.size)
+        self.assertEqual(HEADER.unpack(await reader.readexactly(HEADER.size))[:2], (7, 0))
+        writer.close()
+
+    async def test_bad_request_raises_service_error(self):
+        async with CalculatorClient(port=self.port, pool_size=1) as client:
+            with self.assertRaises(ServiceError):
+                await client._request(99, 0)
+            self.assertEqual(await client.add(1, 1), 2.0)
+
+    async def test_dead_connection_is_replaced(self):
+        async with CalculatorClient(port=self.port, pool_size=1) as client:
+            client._pool[0].writer.transport.abort()
+            await asyncio.sleep(0.05)
+            self.assertFalse(client._pool[0].alive)
+            self.assertEqual(await asyncio.wait_for(client.add(2, 3), 5), 5.0)
+
+
+class TestConnectionFailures(unittest.IsolatedAsyncioTestCase):
+    """A misbehaving server must fail pending requests instead of hanging them."""
+
+    async def serve_once(self, reply):
+        async def handler(reader, writer):
+            await reader.readexactly(LENGTH.size)
+            writer.write(reply)
+            await writer.drain()
+            writer.close()
+        listener = await asyncio.start_server(handler, '127.0.0.1', 0)
+        self.addAsyncCleanup(listener.wait_closed)
+        self.addCleanup(listener.close)
+        return listener.sockets[0].getsockname()[1]
+
+    async def check_fails(self, reply):
+        port = await self.serve_once(reply)
+        async with CalculatorClient(port=port, pool_size=1) as client:
+            pending = [client.add(1, 2), client.add(3, 4)]
+            for outcome in await asyncio.wait_for(asyncio.gather(*pending, return_exceptions=True), 5):
+                self.assertIsInstance(outcome, ConnectionError)
+            conn = client._pool[0]
+            self.assertFalse(conn.alive)
+            with self.assertRaises(ConnectionError):
+                await asyncio.wait_for(conn.send(99, 11, 0, b''), 5)
+
+    async def test_connection_closed(self):
+        await self.check_fails(b'')
+
+    async def test_oversized_frame(self):
+        await self.check_fails(LENGTH.pack(MAX_FRAME + 1))
+
+    async def test_short_frame(self):
+        await self.check_fails(LENGTH.pack(2) + b'xx')
+
+
+@unittest.skipUnless(HAVE_NUMPY, "needs numpy")
+class TestMarvenService(TestCalculatorService):
+
+    backend = 'marven'
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+"""
+Experiment 5: Unit Testing Implementation
+Tests for concurrent issue/return of Experiment 9 (concurrency.py).
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Experiment 9'))
+
+from concurrency import AsyncLibrary, HolderCheck, ShardedLibrary, async_load, make_backend, thread_load  # noqa: E402
+from library import Library, LibraryError  # noqa: E402
+
+
+class Recorder:
+    """Observer that records the events it hears, in order."""
+
+    def __init__(self):
+        self.events = []
+
+    def issued(self, row, member_id):
+        self.events.append(('issued', row, member_id))
+
+    def returned(self, row):
+        self.events.append(('returned', row))
+
+
+class SlowCounterLibrary(Library):
+    """A Library whose available_count updates let other threads run between read and write."""
+
+    @property
+    def available_count(self):
+        return self._available_count
+
+    @available_count.setter
+    def available_count(self, value):
+        time.sleep(0)
+        self._available_count = value
+
+
+class TestShardedLibrary(unittest.TestCase):
+
+    def setUp(self):
+        self.library = make_backend('memory', 16)
+        self.member = self.library.register_member("Ayesha")
+
+    def test_issue_and_return(self):
+        row = self.library.issue_book("9780000000003", self.member)
+        self.assertFalse(self.library.is_available("9780000000003"))
+        with self.assertRaises(LibraryError):
+            self.library.issue_book("9780000000003", self.member)
+        self.assertEqual(self.library.return_book("9780000000003"), self.member)
+        self.assertEqual(row, 3)
+        self.assertEqual(self.library.library.available_count, 16)
+
+    def test_observer_hears_only_successful_calls(self):
+        recorder = self.library.observer = Recorder()
+        with self.assertRaises(LibraryError):
+            self.library.return_book("9780000000001")  # never issued
+        self.library.issue_book("9780000000001", self.member)
+        with self.assertRaises(LibraryError):
+            self.library.issue_book("9780000000001", self.member)
+        self.library.return_book("9780000000001")
+        self.assertEqual(recorder.events, [('issued', 1, self.member), ('returned', 1)])
+
+    def test_adds_and_loans_keep_available_count(self):
+        self.library = ShardedLibrary(SlowCounterLibrary())
+        for i in range(16):
+            self.library.add_book(9780000000000 + i, f"Title {i}")
+        members = [self.library.register_member(f"Desk {w}") for w in range(4)]
+
+        def circulate(member):
+            for _ in range(50):
+                for i in range(16):
+                    isbn = f"{9780000000000 + i}"
+                    try:
+                        self.library.issue_book(isbn, member)
+                    except LibraryError:
+                        continue
+                    self.library.return_book(isbn)
+
+        def add():
+            for i in range(500):
+                self.library.add_book(9781000000000 + i, f"New {i}")
+
+        threads = [threading.Thread(target=circulate, args=(m,)) for m in members]
+        threads.append(threading.Thread(target=add))
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.library.library.available_count, len(self.library))
+
+    def test_holder_check_flags_a_double_issue(self):
+        check = HolderCheck()
+        check.issued(5, 0)
+        check.returned(5)
+        check.issued(5, 1)
+        self.assertEqual(check.double_issues, 0)
+        check.issued(5, 2)
+        self.assertEqual(check.double_issues, 1)
+
+
+class TestLoad(unittest.TestCase):
+
+    def check_load(self, kind, run):
+        with tempfile.TemporaryDirectory() as directory:
+            backend = make_backend(kind, 200, directory)
+            try:
+                issued, conflicts, _, doubles = run(backend)
+                self.assertEqual(doubles, 0)
+                self.assertEqual(issued + conflicts, 4 * 300)
+                self.assertEqual(backend.library.available_count, len(backend.library))
+            finally:
+                if kind == 'durable':
+                    backend.close()
+
+    def test_threads(self):
+        for kind in ('memory', 'durable'):
+            with self.subTest(kind=kind):
+                self.check_load(kind, lambda backend: thread_load(backend, 4, 300, 200, hot=5))
+
+    def test_asyncio(self):
+        for kind in ('memory', 'durable'):
+            with self.subTest(kind=kind):
+                self.check_load(kind, lambda backend: asyncio.run(async_load(backend, 4, 300, 200, hot=5)))
+
+    def test_async_front_end_releases_book_locks(self):
+        async def run():
+            front = AsyncLibrary(ShardedLibrary())
+            await front.add_book(9780000000001, "Dune")
+            member = await front.register_member("Ayesha")
+            await asyncio.gather(front.issue_book("9780000000001", member),
+                                 front.get_book("9780000000001"))
+            self.assertEqual(await front.return_book("9780000000001"), member)
+            self.assertEqual(front._books, {})
+        asyncio.run(run())
+
+
+if __name__ == "__main__":
+    unittest.main()
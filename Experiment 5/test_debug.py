@@ -0,0 +1,104 @@
+"""
+Experiment 5: Unit Testing Implementation
+Tests for the streaming mode of Experiment 6 (debug.DataProcessor): every
+input form must give the same percentages as calculate_results.
+"""
+
+import importlib.util
+import logging
+import os
+import random
+import sys
+import tempfile
+import unittest
+from array import array
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Experiment 6'))
+
+from debug import DataProcessor, _read_text_chunks  # noqa: E402
+
+HAVE_NUMPY = importlib.util.find_spec('numpy')
+
+
+class TestStreaming(unittest.TestCase):
+
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+        self.addCleanup(logging.disable, logging.NOTSET)
+        rng = random.Random(4)
+        self.data = [rng.uniform(-5, 1000) for _ in range(1000)]
+        self.expected = DataProcessor(self.data).calculate_results()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    def test_in_memory_inputs_match_calculate_results(self):
+        for name, data in [('list', self.data), ('array', array('d', self.data))]:
+            for chunk_size in (1, 97, 1000, 5000):
+                with self.subTest(data=name, chunk_size=chunk_size):
+                    out = DataProcessor(data).calculate_results_streaming(chunk_size=chunk_size)
+                    self.assertEqual(list(out), self.expected)
+
+    def test_generator_is_spilled_and_cleaned_up(self):
+        spills, named_temporary_file = [], tempfile.NamedTemporaryFile
+
+        def spill(**kwargs):
+            spills.append(named_temporary_file(dir=self.tmp.name, **kwargs))
+            return spills[-1]
+
+        with mock.patch('debug.tempfile.NamedTemporaryFile', side_effect=spill):
+            out = DataProcessor(value for value in self.data).calculate_results_streaming(chunk_size=97)
+        self.assertEqual(list(out), self.expected)
+        self.assertEqual(len(spills), 1)
+        self.assertFalse(os.path.exists(spills[0].name))
+
+    def test_file_inputs_match_calculate_results(self):
+        text = self.path('values.txt')
+        with open(text, 'w') as f:
+            f.write(' '.join(map(repr, self.data[:500])) + '\n' + '\n'.join(map(repr, self.data[500:])))
+        binary = self.path('values.f64')
+        with open(binary, 'wb') as f:
+            array('d', self.data).tofile(f)
+        self.assertEqual(list(DataProcessor(text).calculate_results_streaming(chunk_size=100)), self.expected)
+        out = DataProcessor(binary).calculate_results_streaming(chunk_size=100, file_format='f64')
+        self.assertEqual(list(out), self.expected)
+
+    def test_text_numbers_split_across_read_blocks(self):
+        text = self.path('values.txt')
+        with open(text, 'w') as f:
+            f.write(' '.join(map(repr, self.data)))
+        values = [v for chunk in _read_text_chunks(text, 33, block_size=7) for v in chunk]
+        self.assertEqual(values, self.data)
+
+    def test_outputs(self):
+        target = self.path('out.f64')
+        DataProcessor(self.data).calculate_results_streaming(out=target, chunk_size=128)
+        written = array('d')
+        with open(target, 'rb') as f:
+            written.frombytes(f.read())
+        self.assertEqual(list(written), self.expected)
+        buffer = array('d', bytes(8 * len(self.data)))
+        self.assertIs(DataProcessor(self.data).calculate_results_streaming(out=buffer, chunk_size=128), buffer)
+        self.assertEqual(list(buffer), self.expected)
+
+    @unittest.skipUnless(HAVE_NUMPY, "needs numpy")
+    def test_memmap_input_and_output(self):
+        import numpy as np
+        source = np.memmap(self.path('in.f64'), dtype=np.float64, mode='w+', shape=len(self.data))
+        source[:] = self.data
+        out = np.memmap(self.path('out.f64'), dtype=np.float64, mode='w+', shape=len(self.data))
+        DataProcessor(source).calculate_results_streaming(out=out, chunk_size=100)
+        self.assertEqual(out.tolist(), self.expected)
+
+    def test_empty_and_zero_sum_inputs_yield_nothing(self):
+        self.assertEqual(DataProcessor([]).calculate_results(), 0)
+        for data in ([], iter([]), [5, -5]):
+            with self.subTest(data=data):
+                self.assertEqual(list(DataProcessor(data).calculate_results_streaming()), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
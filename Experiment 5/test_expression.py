@@ -0,0 +1,65 @@
+"""
+Experiment 5: Unit Testing Implementation
+Tests for the compiled infix expression engine of Experiment 4 (expression.py).
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Experiment 4'))
+
+from expression import ExpressionError, compile_expression, evaluate, tokenize  # noqa: E402
+
+
+class TestExpression(unittest.TestCase):
+
+    def test_tokenize(self):
+        self.assertEqual(tokenize("a ** 2.5e1 // b"),
+                         [('name', 'a'), ('op', '**'), ('num', '2.5e1'), ('op', '//'), ('name', 'b')])
+
+    def test_precedence_matches_python(self):
+        for text, expected in [("2 + 3 * 4", 14), ("(2 + 3) * 4", 20), ("-2 ** 2", -4),
+                               ("2 ** -1", 0.5), ("2 ** 3 ** 2", 512), ("7 // 2 % 3", 0),
+                               ("10 - 4 - 3", 3), ("-(1 - 4) * +2", 6)]:
+            self.assertEqual(evaluate(text), expected, text)
+
+    def test_variables_in_first_use_order(self):
+        plan = compile_expression("(a + b) * c / d")
+        self.assertEqual(plan.variables, ('a', 'b', 'c', 'd'))
+        self.assertEqual(plan(1, 2, 3, 4), 2.25)
+        self.assertEqual(plan(d=4, c=3, b=2, a=1), 2.25)
+
+    def test_variable_names_do_not_collide_with_parameters(self):
+        self.assertEqual(evaluate("text * 2", text=3), 6)
+        self.assertEqual(compile_expression("self + 1")(self=1), 2)
+        self.assertEqual(compile_expression("self + 1").evaluate_columns(self=4), 5)
+
+    def test_evaluate_many(self):
+        plan = compile_expression("x - y")
+        self.assertEqual(plan.evaluate_many([(5, 1), (2, 2)]), [4, 0])
+        self.assertEqual(plan.evaluate_many([{'x': 1, 'y': 3}]), [-2])
+        self.assertEqual(plan.evaluate_many([]), [])
+
+    def test_plans_are_cached(self):
+        self.assertIs(compile_expression("a % b"), compile_expression("a % b"))
+
+    def test_division_by_zero_is_not_a_parse_error(self):
+        with self.assertRaises(ZeroDivisionError):
+            evaluate("a / b", a=1, b=0)
+
+    def test_int_literals_stay_ints(self):
+        self.assertEqual(repr(evaluate("7 // 2")), '3')
+        self.assertEqual(evaluate("12345678901234567891 * 10 + 1"), 123456789012345678911)
+        self.assertEqual(repr(evaluate("007 + 1.5")), '8.5')
+        self.assertEqual(repr(evaluate("x / 2", x=4)), '2.0')
+
+    def test_invalid_expressions(self):
+        for text in ["", "1 +", "(1 + 2", "1 2", "a $ b", "lambda + 1", "__import__('os')", "1e999",
+                     "a² + 1", "__debug__ * 2", "ﬁ + 1", "9" * 5000]:
+            with self.subTest(text=text), self.assertRaises(ExpressionError):
+                compile_expression(text)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+"""
+Experiment 5: Unit Testing Implementation
+Tests for the binary calculation history of Experiment 8 (history_db.HistoryDB).
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Experiment 8'))
+
+from history_db import HEADER, RECORD, HistoryDB  # noqa: E402
+
+
+class TestHistoryDB(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'history.bin')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def fill(self, db, timestamps, first=0):
+        ops = '+-*/'
+        for i, ts in enumerate(timestamps, first):
+            db.append(ops[i % 4], float(i), 2.0, float(i) * 10, timestamp=ts)
+
+    def test_append_and_read_back(self):
+        with HistoryDB(self.path) as db:
+            db.append('+', 1.0, 2.0, 3.0, timestamp=datetime(2026, 1, 28, 17, 0))
+            self.assertEqual(db[0], (datetime(2026, 1, 28, 17, 0), '+', 1.0, 2.0, 3.0))
+            self.assertEqual(len(db), 1)
+
+    def test_reopen_keeps_records_and_index(self):
+        with HistoryDB(self.path, block_size=4) as db:
+            self.fill(db, range(10))
+        with HistoryDB(self.path, block_size=4) as db:
+            self.assertEqual(len(db), 10)
+            self.assertEqual([r[4] for r in db.query(op='*')], [20.0, 60.0])
+            self.fill(db, range(10, 13), first=10)
+            self.assertEqual([r[4] for r in db.query(start=8, end=11)], [80.0, 90.0, 100.0, 110.0])
+
+    def test_torn_tail_is_dropped_on_open(self):
+        with HistoryDB(self.path) as db:
+            self.fill(db, range(3))
+        with open(self.path, 'ab') as f:
+            f.write(b'\x00junk\xff\x01')  # half-written record
+        with HistoryDB(self.path) as db:
+            self.assertEqual(len(db), 3)
+            db.append('+', 5.0, 6.0, 11.0, timestamp=100)
+            self.assertEqual(db[-1][1:], ('+', 5.0, 6.0, 11.0))
+        self.assertEqual(os.path.getsize(self.path), HEADER.size + 4 * RECORD.size)
+        with HistoryDB(self.path) as db:
+            self.assertEqual([r[4] for r in db][-2:], [20.0, 11.0])
+
+    def test_range_query_matches_full_scan(self):
+        with HistoryDB(self.path, block_size=8) as db:
+            self.fill(db, [i * 0.5 for i in range(100)])
+            for lo, hi in [(0, 49.5), (3.2, 7.9), (-5, 0), (49.5, 60), (20, 10), (60, 70)]:
+                expected = [r for r in db if lo <= r[0].timestamp() <= hi]
+                self.assertEqual(list(db.query(start=lo, end=hi)), expected, (lo, hi))
+
+    def test_out_of_order_timestamps_still_found(self):
+        timestamps = [50 - i if i < 16 else i for i in range(40)]
+        with HistoryDB(self.path, block_size=8) as db:
+            self.fill(db, timestamps)
+            expected = sorted(i for i, ts in enumerate(timestamps) if 35 <= ts <= 45)
+            self.assertEqual(sorted(int(r[2]) for r in db.query(start=35, end=45)), expected)
+
+    def test_readers_survive_appends(self):
+        with HistoryDB(self.path, block_size=4) as db:
+            self.fill(db, range(10))
+            scan, by_op, by_time = iter(db), db.query(op='+'), db.query(start=5, end=100)
+            self.assertEqual(next(scan)[4], 0.0)
+            self.assertEqual(next(by_op)[4], 0.0)
+            self.assertEqual(next(by_time)[4], 50.0)
+            self.fill(db, range(10, 16), first=10)  # completes a block while the readers are live
+            self.assertEqual(db[-1][4], 150.0)  # remaps the grown file
+            self.assertEqual([r[4] for r in scan], [i * 10.0 for i in range(1, 10)])
+            self.assertEqual([r[4] for r in by_op], [40.0, 80.0])
+            self.assertEqual([r[4] for r in by_time], [60.0, 70.0, 80.0, 90.0])
+
+    def test_truncated_header_is_rejected(self):
+        with open(self.path, 'wb') as f:
+            f.write(HEADER.pack(b'CALCHIST', 1, RECORD.size)[:10])
+        with self.assertRaises(ValueError):
+            HistoryDB(self.path)
+
+    def test_foreign_file_is_rejected(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'not a calculation history file')
+        with self.assertRaises(ValueError):
+            HistoryDB(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
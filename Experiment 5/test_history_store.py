@@ -0,0 +1,94 @@
+"""
+Experiment 5: Unit Testing Implementation
+Tests for the columnar calculation history of Experiment 7 (marven.HistoryStore).
+"""
+
+import importlib.util
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Experiment 7'))
+
+HAVE_PANDAS = importlib.util.find_spec('numpy') and importlib.util.find_spec('pandas')
+
+
+@unittest.skipUnless(HAVE_PANDAS, "needs numpy and pandas")
+class TestHistoryStore(unittest.TestCase):
+
+    def setUp(self):
+        from marven import HistoryStore
+        self.HistoryStore = HistoryStore
+
+    def results(self, store):
+        return store.arrays()[3].tolist()
+
+    def test_scalar_and_batch_appends_keep_order(self):
+        store = self.HistoryStore(buffer_size=2)
+        store.append('add', 1, 2, 3)
+        store.extend('multiply', [2, 3], 10, [20, 30])
+        store.append('divide', 9, 3, 3)
+        self.assertEqual(self.results(store), [3, 20, 30, 3])
+        self.assertEqual(store.arrays()[0].tolist(), [0, 2, 2, 3])
+        self.assertEqual(len(store), 4)
+
+    def test_ring_buffer_evicts_oldest(self):
+        store = self.HistoryStore(capacity=4)
+        store.extend('add', 0, 0, [1, 2, 3])
+        store.extend('add', 0, 0, [4, 5, 6])
+        self.assertEqual(self.results(store), [3, 4, 5, 6])
+        store.extend('add', 0, 0, range(10))
+        self.assertEqual(self.results(store), [6, 7, 8, 9])
+
+    def test_last_entries_only(self):
+        for store in (self.HistoryStore(capacity=4), self.HistoryStore(initial_size=2)):
+            store.extend('add', 0, 0, [1, 2, 3, 4, 5, 6])
+            store.append('add', 0, 0, 7)
+            self.assertEqual(store.arrays(last=1)[3].tolist(), [7])
+            self.assertEqual(store.arrays(last=3)[3].tolist(), [5, 6, 7])
+            self.assertEqual(store.arrays(last=0)[3].tolist(), [])
+            self.assertEqual(store.arrays(last=100)[3].tolist(), self.results(store))
+
+    def test_reading_does_not_modify_the_store(self):
+        store = self.HistoryStore(capacity=4)
+        store.extend('add', 0, 0, [1, 2, 3, 4, 5])
+        start = store._start
+        self.assertEqual(self.results(store), [2, 3, 4, 5])
+        self.assertEqual(store._start, start)
+
+    def test_bounded_dataframe_is_not_rewritten_by_later_writes(self):
+        store = self.HistoryStore(capacity=4)
+        store.extend('add', 0, 0, [1, 2, 3, 4])
+        df = store.to_dataframe()
+        arrays = store.arrays()
+        store.extend('add', 0, 0, [9, 9])
+        self.assertEqual(df['result'].tolist(), [1, 2, 3, 4])
+        self.assertEqual(arrays[3].tolist(), [1, 2, 3, 4])
+        self.assertEqual(self.results(store), [3, 4, 9, 9])
+
+    def test_unbounded_views_survive_growth_and_clear(self):
+        store = self.HistoryStore(initial_size=2)
+        store.extend('subtract', 5, 1, [4, 4])
+        df = store.to_dataframe()
+        view = store.arrays()[3]
+        store.extend('add', 1, 1, [2, 2, 2])
+        store.clear()
+        store.extend('add', 0, 0, [0, 0])
+        self.assertEqual(df['result'].tolist(), [4, 4])
+        self.assertEqual(view.tolist(), [4, 4])
+        self.assertFalse(view.flags.writeable)
+
+    def test_dataframe_columns(self):
+        store = self.HistoryStore()
+        store.extend('divide', [1, 4], 2, [0.5, 2.0])
+        df = store.to_dataframe()
+        self.assertEqual(list(df.columns), ['operation', 'a', 'b', 'result'])
+        self.assertEqual(df['operation'].tolist(), ['divide', 'divide'])
+
+    def test_invalid_capacity(self):
+        with self.assertRaises(ValueError):
+            self.HistoryStore(capacity=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
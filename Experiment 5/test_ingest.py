@@ -0,0 +1,133 @@
+"""
+Experiment 5: Unit Testing Implementation
+Tests for the vectorized scenario ingestion of Experiment 8 (ingest.py):
+every row must be classified exactly like the try/except loop in log.py.
+"""
+
+import importlib.util
+import itertools
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Experiment 8'))
+
+HAVE_PANDAS = importlib.util.find_spec('numpy') and importlib.util.find_spec('pandas')
+
+
+def loop_outcome(item):
+    """The sequential reference: (category or 'ok', message or result)."""
+    try:
+        a = float(item['num1'])
+        b = float(item['num2'])
+        op = item['op']
+        if op == '+':
+            return 'ok', a + b
+        if op == '/':
+            if b == 0:
+                raise ZeroDivisionError("Math error: Division by zero is not allowed.")
+            return 'ok', a / b
+        raise KeyError(f"The operator '{op}' is not supported in this build.")
+    except (ValueError, ZeroDivisionError, KeyError) as e:
+        return type(e).__name__, str(e)
+
+
+@unittest.skipUnless(HAVE_PANDAS, "needs numpy and pandas")
+class TestIngest(unittest.TestCase):
+
+    SCENARIOS = [
+        {"num1": "50", "num2": "5", "op": "/"},
+        {"num1": "abc", "num2": "5", "op": "+"},
+        {"num1": "10", "num2": "0", "op": "/"},
+        {"num1": "10", "num2": "5", "op": "%"},
+        {"num1": "1_000", "num2": "1", "op": "+"},
+        {"num1": "inf", "num2": "-2.5e3", "op": "+"},
+        {"num1": "3", "num2": "y", "op": "+"},
+        {"num1": "x", "num2": "0", "op": "/"},
+        {"num2": "2", "op": "+"},
+        {"num1": "2", "num2": "2"},
+        {"num1": " 7 ", "num2": "2", "op": "/"},
+    ]
+
+    def setUp(self):
+        import pandas as pd
+        from ingest import evaluate_batch, ingest_file
+        self.pd = pd
+        self.evaluate_batch = evaluate_batch
+        self.ingest_file = ingest_file
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def outcomes(self, scenarios):
+        batch = self.pd.DataFrame(scenarios, columns=['num1', 'num2', 'op'])
+        results, errors = self.evaluate_batch(batch)
+        outcomes = {}
+        for i, row in results.iterrows():
+            outcomes[i] = ('ok', row['result'])
+        for i, row in errors.iterrows():
+            outcomes[i] = (row['category'], row['message'])
+        return [outcomes[i] for i in range(len(scenarios))]
+
+    def test_matches_sequential_loop(self):
+        for item, outcome in zip(self.SCENARIOS, self.outcomes(self.SCENARIOS)):
+            self.assertEqual(outcome, loop_outcome(item), item)
+
+    def test_missing_and_invalid_fields_fail_in_loop_order(self):
+        values = {'num1': [None, "abc", "4"], 'num2': [None, "x", "5", "0"], 'op': [None, "+", "/", "%"]}
+        scenarios = []
+        for num1, num2, op in itertools.product(values['num1'], values['num2'], values['op']):
+            item = {key: value for key, value in (('num1', num1), ('num2', num2), ('op', op))
+                    if value is not None}
+            scenarios.append(item)
+        for item, outcome in zip(scenarios, self.outcomes(scenarios)):
+            self.assertEqual(outcome, loop_outcome(item), item)
+
+    def test_float_spellings(self):
+        from ingest import to_float
+        spellings = ["1_000", "1_0.2_5e1_0", "-1_000", "1__0", "_1", "1_", "1_.5", "nan", "-NaN", "+inf",
+                     "-Infinity", "INFINITY", "infinit", "info", " \t-inf\n", "1e5", ".5", "5.", "1e",
+                     "e1", "--1", "0x10", "", " ", "١٢"]
+        values, messages = to_float(self.pd.Series(spellings, dtype=object))
+        for i, text in enumerate(spellings):
+            with self.subTest(text=text):
+                try:
+                    expected = float(text)
+                except ValueError as e:
+                    self.assertEqual(messages.get(i), str(e))
+                    continue
+                if text == "١٢":
+                    continue  # non-ASCII digits are reported as invalid
+                self.assertNotIn(i, messages)
+                self.assertEqual(repr(float(values[i])), repr(expected))
+
+    def test_nan_operand_is_accepted_like_float(self):
+        (category, result), = self.outcomes([{"num1": "nan", "num2": "1", "op": "+"}])
+        self.assertEqual(category, 'ok')
+        self.assertNotEqual(result, result)
+
+    def test_jsonl_schema_changes_keep_csv_columns_aligned(self):
+        source = os.path.join(self.tmp.name, 'scenarios.jsonl')
+        rows = ([{"num1": "1", "num2": "2", "op": "+"}] * 2
+                + [{"desc": "extra field", "op": "+", "num2": "4", "num1": "3"}] * 2
+                + [{"num1": "5", "num2": "0"}] * 2)
+        with open(source, 'w') as f:
+            f.writelines(json.dumps(row) + '\n' for row in rows)
+        results_path = os.path.join(self.tmp.name, 'results.csv')
+        errors_path = os.path.join(self.tmp.name, 'errors.csv')
+
+        counts = self.ingest_file(source, results_path, errors_path, batch_size=2)
+
+        self.assertEqual(counts, {'ok': 4, 'ValueError': 0, 'ZeroDivisionError': 0, 'KeyError': 2})
+        results = self.pd.read_csv(results_path)
+        self.assertEqual(list(results.columns), ['num1', 'num2', 'op', 'result'])
+        self.assertEqual(results['result'].tolist(), [3.0, 3.0, 7.0, 7.0])
+        errors = self.pd.read_csv(errors_path)
+        self.assertEqual(errors['message'].tolist(), ["'op'", "'op'"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+"""
+Experiment 5: Unit Testing Implementation
+Tests for the lazy-import helpers of Experiment 7 (lazy_imports.py) and the
+startup of the scripts that use them (marven.py, Experiment 9's man.py).
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..', 'Experiment 7'))
+
+from lazy_imports import LazyModule, is_installed, load_experiment_module  # noqa: E402
+
+HEAVY = ('numpy', 'pandas', 'matplotlib')
+
+
+class TestLazyImports(unittest.TestCase):
+
+    def test_lazy_module_imports_on_first_use(self):
+        sys.modules.pop('colorsys', None)
+        colorsys = LazyModule('colorsys')
+        self.assertNotIn('colorsys', sys.modules)
+        self.assertEqual(colorsys.rgb_to_hsv(1.0, 0.0, 0.0), (0.0, 1.0, 1.0))
+        self.assertIn('colorsys', sys.modules)
+        self.assertIn('colorsys', LazyModule.import_times)
+
+    def test_is_installed(self):
+        self.assertTrue(is_installed('pip'))
+        self.assertFalse(is_installed('no-such-package-for-this-lab'))
+
+    def test_load_experiment_module_once(self):
+        module = load_experiment_module('Experiment 4', 'calc_metrics', alias='lab_calc_metrics')
+        self.addCleanup(sys.modules.pop, 'lab_calc_metrics', None)
+        self.assertIs(sys.modules['lab_calc_metrics'], module)
+        self.assertIs(load_experiment_module('Experiment 4', 'calc_metrics', alias='lab_calc_metrics'), module)
+
+    def test_failed_import_is_not_registered(self):
+        with tempfile.TemporaryDirectory(dir=os.path.join(HERE, '..')) as folder:
+            with open(os.path.join(folder, 'broken.py'), 'w') as f:
+                f.write("raise RuntimeError('broken at import')\n")
+            with self.assertRaises(RuntimeError):
+                load_experiment_module(os.path.basename(folder), 'broken', alias='lab_broken')
+        self.assertNotIn('lab_broken', sys.modules)
+
+    def test_scripts_start_without_heavy_libraries(self):
+        for folder, script in (('Experiment 7', 'marven'), ('Experiment 9', 'man')):
+            with self.subTest(script=script):
+                loaded = subprocess.run(
+                    [sys.executable, '-c', f"import sys, {script}; print(*sorted(set(sys.modules) & {set(HEAVY)!r}))"],
+                    cwd=os.path.join(HERE, '..', folder), capture_output=True, text=True, check=True)
+                self.assertEqual(loaded.stdout.strip(), '')
+
+
+if __name__ == "__main__":
+    unittest.main()
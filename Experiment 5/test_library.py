@@ -0,0 +1,88 @@
+"""
+Experiment 5: Unit Testing Implementation
+Tests for the LMS catalog engine of Experiment 9 (library.py).
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Experiment 9'))
+
+from library import Library, LibraryError, normalize_isbn  # noqa: E402
+
+
+class TestNormalizeIsbn(unittest.TestCase):
+
+    def test_accepted_forms(self):
+        for isbn in ["9780306406157", "978-0-306-40615-7", "978 0 306 40615 7", "0-306-40615-2",
+                     "0306406152", 9780306406157]:
+            with self.subTest(isbn=isbn):
+                self.assertEqual(normalize_isbn(isbn), 9780306406157)
+        self.assertEqual(normalize_isbn("0-8044-2957-x"), 9780804429573)
+
+    def test_rejected_forms(self):
+        for isbn in ["0-306-40615-3", "080442957-0", "12345", "97803064061X7", "", -1, 10 ** 13, 2 ** 64,
+                     9780306406157.0, None, True]:
+            with self.subTest(isbn=isbn), self.assertRaises(ValueError):
+                normalize_isbn(isbn)
+
+
+class TestLibrary(unittest.TestCase):
+
+    def setUp(self):
+        self.library = Library()
+        self.library.add_book("0-306-40615-2", "Dune")
+
+    def assertConsistent(self):
+        library = self.library
+        rows = len(library)
+        columns = library.columns()
+        self.assertEqual(len(library._index), rows)
+        self.assertEqual(len(columns['title_offsets']), rows + 1)
+        self.assertEqual(len(columns['available']), (rows + 7) // 8)
+        self.assertEqual(len(columns['borrower']), rows)
+        for row, book in enumerate(library):
+            self.assertEqual(library.row_of(book.isbn), row)
+
+    def test_invalid_book_changes_nothing(self):
+        for isbn, title in [(9780000000001, None), (9780000000001, b"bytes"), (-5, "Negative"),
+                            (10 ** 13, "Too long"), ("0-306-40615-2", "Duplicate"),
+                            ("9780000000001", "\ud800 lone surrogate")]:
+            with self.subTest(isbn=isbn, title=title), self.assertRaises((ValueError, TypeError, LibraryError)):
+                self.library.add_book(isbn, title)
+            self.assertEqual(len(self.library), 1)
+            self.assertConsistent()
+        self.assertEqual(self.library.add_book(9780000000001, "Emma"), 1)
+        self.assertEqual(self.library.get_book(9780000000001).title, "Emma")
+        self.assertEqual(self.library.available_count, 2)
+
+    def test_bulk_load_stops_consistently_at_a_bad_row(self):
+        books = [(9780000000000 + i, f"Title {i}") for i in range(1, 12)]
+        books[9] = (9780000000010, 42)
+        with self.assertRaises(TypeError):
+            self.library.add_books(books)
+        self.assertEqual(len(self.library), 10)
+        self.assertConsistent()
+        self.assertEqual(self.library.available_count, 10)
+        self.assertEqual(self.library.add_books([(9780000000010, "Fixed")]), 1)
+        self.assertEqual(self.library.title_at(10), "Fixed")
+        self.assertConsistent()
+
+    def test_issue_and_return(self):
+        member = self.library.register_member("Ayesha")
+        self.library.issue_book("9780306406157", member)
+        self.assertFalse(self.library.is_available("0306406152"))
+        with self.assertRaises(LibraryError):
+            self.library.issue_book("9780306406157", member)
+        self.assertEqual(self.library.loans(member), 1)
+        self.assertEqual(self.library.return_book("9780306406157"), member)
+        with self.assertRaises(LibraryError):
+            self.library.return_book("9780306406157")
+        with self.assertRaises(KeyError):
+            self.library.issue_book("9780306406157", member + 1)
+        self.assertEqual((self.library.loans(member), self.library.available_count), (0, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+"""
+Experiment 5: Unit Testing Implementation
+Tests for the indexed log queries and rotation of Experiment 8 (log_index.py):
+every query must return exactly the lines a full scan of the logs would.
+"""
+
+import gzip
+import os
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Experiment 8'))
+
+from log_index import ENTRY, LEGACY_HEADER, LogIndex, build_index, query, rotate  # noqa: E402
+
+START = datetime(2026, 1, 28, 17, 0)
+LEVELS = ['INFO', 'DEBUG', 'ERROR', 'WARNING', 'INFO', 'CRITICAL']
+
+
+def log_lines(count, first=0, tag='run'):
+    """count formatted records, one every 7 seconds; every 5th has a traceback line."""
+    lines = []
+    for i in range(first, first + count):
+        moment = START + timedelta(seconds=7 * i, milliseconds=i % 1000)
+        stamp = moment.strftime('%Y-%m-%d %H:%M:%S') + f",{moment.microsecond // 1000:03d}"
+        lines.append(f"{stamp} - {LEVELS[i % len(LEVELS)]} - {tag} record {i}")
+        if i % 5 == 0:
+            lines.append(f"Traceback line of {tag} record {i}")
+    return lines
+
+
+def scan(lines, start, end, levels):
+    """The reference: filter records (with their continuation lines) by a full scan."""
+    keep, out = False, []
+    for line in lines:
+        if line[:4].isdigit():
+            moment = datetime.strptime(line[:23], '%Y-%m-%d %H:%M:%S,%f')
+            level = line.split(' - ')[1]
+            keep = start <= moment <= end and level in levels
+        if keep:
+            out.append(line)
+    return out
+
+
+class TestLogIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'app.log')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, lines, mode='a'):
+        with open(self.path, mode) as f:
+            f.writelines(line + '\n' for line in lines)
+
+    def check(self, lines, start_s=0, end_s=10**6, levels=('ERROR', 'CRITICAL')):
+        start, end = START + timedelta(seconds=start_s), START + timedelta(seconds=end_s)
+        self.assertEqual(list(query(self.path, start, end, list(levels))), scan(lines, start, end, levels))
+
+    def test_queries_match_a_full_scan(self):
+        lines = log_lines(500)
+        self.write(lines)
+        for window in [(0, 10**6), (600, 1200), (1234, 1235), (-100, 30), (5000, 10**6)]:
+            for levels in [('ERROR',), ('INFO', 'WARNING'), ('DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL')]:
+                with self.subTest(window=window, levels=levels):
+                    self.check(lines, *window, levels)
+
+    def test_incremental_index_skips_a_partial_last_line(self):
+        lines = log_lines(100)
+        self.write(lines)
+        first = build_index(self.path)
+        with open(self.path, 'a') as f:
+            f.write(log_lines(1, 100)[0])  # no newline yet
+        self.assertEqual(build_index(self.path).indexed, first.indexed)
+        with open(self.path, 'a') as f:
+            f.write('\n')
+        lines += log_lines(1, 100)
+        self.assertEqual(build_index(self.path).indexed, os.path.getsize(self.path))
+        self.check(lines)
+
+    def test_log_rewritten_in_place_is_reindexed(self):
+        self.write(log_lines(60, tag='first'))
+        build_index(self.path)
+        inode = os.stat(self.path).st_ino
+        lines = log_lines(100, tag='second')  # a new run with file_mode='w': same file, longer
+        self.write(lines, mode='w')
+        self.assertEqual(os.stat(self.path).st_ino, inode)
+        self.check(lines)
+        lines = log_lines(30, first=3, tag='third')  # shorter than what was indexed
+        self.write(lines, mode='w')
+        self.check(lines)
+
+    def test_legacy_index_is_rebuilt(self):
+        lines = log_lines(50)
+        self.write(lines)
+        with open(self.path + '.idx', 'wb') as f:  # a version 1 index covering the wrong bytes
+            f.write(LEGACY_HEADER.pack(b'LOGIDX01', 10, 60, 1) + ENTRY.pack(0, 0, 10, 31))
+        self.assertFalse(LogIndex.load(self.path + '.idx').compressed)
+        self.check(lines)
+        self.assertEqual(LogIndex.load(self.path + '.idx').inode, os.stat(self.path).st_ino)
+
+    def test_rotation_keeps_every_line_queryable(self):
+        lines = []
+        for part in range(3):
+            batch = log_lines(200, first=200 * part)
+            self.write(batch)
+            lines += batch
+            self.assertTrue(rotate(self.path, max_bytes=1000, backup_count=5))
+        tail = log_lines(50, first=600)
+        self.write(tail)
+        lines += tail
+        self.assertFalse(rotate(self.path, max_bytes=10**6))
+        self.assertTrue(os.path.exists(self.path + '.3.gz'))
+        with gzip.open(self.path + '.3.gz', 'rt') as f:
+            self.assertEqual(f.read().splitlines(), lines[:len(log_lines(200))])
+        self.check(lines)
+        self.check(lines, 1300, 2900, ('INFO',))
+
+    def test_rotation_drops_archives_beyond_backup_count(self):
+        for part in range(4):
+            self.write(log_lines(20, first=20 * part))
+            rotate(self.path, max_bytes=1, backup_count=2)
+        self.assertEqual(sorted(name for name in os.listdir(self.tmp.name)),
+                         ['app.log.1.gz', 'app.log.1.idx', 'app.log.2.gz', 'app.log.2.idx'])
+        # Only the last two parts remain
+        self.assertEqual(list(query(self.path, levels=['CRITICAL'])),
+                         scan(log_lines(40, first=40), START, START + timedelta(days=1), ('CRITICAL',)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+"""
+Experiment 5: Unit Testing Implementation
+Tests for the non-blocking logging pipeline of Experiment 8 (log_pipeline.py).
+"""
+
+import json
+import logging
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Experiment 8'))
+
+from log_pipeline import setup_logging  # noqa: E402
+
+
+class TestLoggingPipeline(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.log_file = os.path.join(self.tmp.name, 'app.log')
+
+    def pipeline(self, name, **options):
+        pipeline = setup_logging(name, log_file=self.log_file, console=False, **options)
+        self.addCleanup(pipeline.shutdown)
+        return pipeline
+
+    def lines(self):
+        with open(self.log_file, encoding='utf-8') as f:
+            return f.read().splitlines()
+
+    def test_setup_is_idempotent(self):
+        pipeline = self.pipeline('test.idempotent')
+        self.assertIs(setup_logging('test.idempotent', log_file=self.log_file, console=False), pipeline)
+        self.assertEqual(len(pipeline.logger.handlers), 1)
+        with self.assertRaises(ValueError):
+            setup_logging('test.idempotent', log_file=self.log_file, console=False, json_lines=True)
+        pipeline.logger.info("once")
+        pipeline.flush()
+        self.assertEqual(len(self.lines()), 1)
+        pipeline.shutdown()
+        replacement = self.pipeline('test.idempotent', json_lines=True)
+        self.assertIsNot(replacement, pipeline)
+        self.assertEqual(len(replacement.logger.handlers), 1)
+
+    def test_full_queue_drops_and_counts(self):
+        pipeline = self.pipeline('test.drops', queue_size=1, batch_size=1)
+        with pipeline.listener.write_lock:  # the listener stalls on its first record
+            for i in range(10):
+                pipeline.logger.info("record %d", i)
+            stats = pipeline.stats()
+        pipeline.flush()
+        self.assertIn(stats['enqueued'], (1, 2))  # one held by the listener, one queued
+        self.assertEqual(stats['enqueued'] + stats['dropped'], 10)
+        self.assertEqual(pipeline.stats()['written'], stats['enqueued'])
+        self.assertEqual(len(self.lines()), stats['enqueued'])
+
+    def test_json_lines(self):
+        pipeline = self.pipeline('test.json', json_lines=True)
+        pipeline.logger.warning("disk at %d%%", 91)
+        try:
+            1 / 0
+        except ZeroDivisionError:
+            pipeline.logger.exception("failed")
+        pipeline.flush()
+        first, second = (json.loads(line) for line in self.lines())
+        self.assertEqual((first['level'], first['logger'], first['message']), ('WARNING', 'test.json', "disk at 91%"))
+        self.assertNotIn('exception', first)
+        self.assertEqual((second['level'], second['message']), ('ERROR', "failed"))
+        self.assertIn("ZeroDivisionError", second['exception'])
+
+    def test_bad_format_args_do_not_raise_into_the_caller(self):
+        pipeline = self.pipeline('test.bad_args')
+        with mock.patch.object(pipeline.handler, 'handleError') as handle_error:
+            pipeline.logger.info("%d items", "many")
+            pipeline.logger.info("%s and %s", "one")
+        self.assertEqual(handle_error.call_count, 2)
+        pipeline.logger.info("still %s", "working")
+        pipeline.flush()
+        self.assertEqual(len(self.lines()), 1)
+        self.assertTrue(self.lines()[0].endswith("INFO - still working"))
+        self.assertEqual(pipeline.stats()['enqueued'], 1)
+
+    def test_records_below_the_level_are_not_queued(self):
+        pipeline = self.pipeline('test.level', level=logging.WARNING)
+        pipeline.logger.info("ignored")
+        pipeline.logger.error("kept")
+        pipeline.flush()
+        self.assertEqual(len(self.lines()), 1)
+        self.assertEqual(pipeline.stats()['enqueued'], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+"""
+Experiment 5: Unit Testing Implementation
+Tests for the offline, hash-locked installer of Experiment 7 (offline_install.py).
+pip itself is not run: subprocess.check_call and the installed versions are mocked.
+"""
+
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import unittest
+from importlib import metadata
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Experiment 7'))
+
+import offline_install  # noqa: E402
+from offline_install import install_requirements, parse_requirements, resolve, scan_wheelhouse  # noqa: E402
+
+WHEELS = {'numpy-2.0.0-cp311-none-any.whl': b'numpy wheel',
+          'pandas-2.2.0-cp311-none-any.whl': b'pandas wheel',
+          'python_dateutil-2.9.0-py3-none-any.whl': b'dateutil wheel'}
+
+
+class TestOfflineInstall(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.wheelhouse = os.path.join(self.tmp.name, 'wheelhouse')
+        os.mkdir(self.wheelhouse)
+        for filename, content in WHEELS.items():
+            self.write_wheel(filename, content)
+        self.requirements = self.path('requirements.txt')
+        self.lockfile = self.path('requirements.lock')
+        self.write_requirements("numpy==2.0.0  # arrays\npandas==2.2.0\n")
+        self.installed = {}
+
+    def path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    def write_wheel(self, filename, content):
+        with open(os.path.join(self.wheelhouse, filename), 'wb') as f:
+            f.write(content)
+
+    def write_requirements(self, text):
+        with open(self.requirements, 'w') as f:
+            f.write(text)
+
+    def version(self, name):
+        try:
+            return self.installed[name]
+        except KeyError:
+            raise metadata.PackageNotFoundError(name) from None
+
+    def install(self, **options):
+        """Run install_requirements with pip replaced by a fake that 'installs' every wheel."""
+        def pip(command):
+            self.commands.append(command)
+            self.installed.update(scan_wheelhouse(self.wheelhouse).keys())
+
+        self.commands = []
+        with mock.patch.object(offline_install.subprocess, 'check_call', side_effect=pip), \
+                mock.patch.object(offline_install.metadata, 'version', side_effect=self.version), \
+                mock.patch('builtins.print'):
+            return install_requirements(self.requirements, self.wheelhouse, self.lockfile, **options)
+
+    def test_parse_requirements(self):
+        self.write_requirements("# pinned\nNumPy==2.0.0 \\\n    --hash=sha256:" + "a" * 64 + "\n"
+                                "python_dateutil\n--find-links wheels\n\npandas == 2.2.0 ; python_version >= '3.8'\n")
+        self.assertEqual(parse_requirements(self.requirements),
+                         [('numpy', '2.0.0'), ('python-dateutil', None), ('pandas', '2.2.0')])
+
+    def test_resolve_reports_every_missing_requirement(self):
+        wheels = scan_wheelhouse(self.wheelhouse)
+        self.assertEqual(resolve([('numpy', '2.0.0'), ('python-dateutil', None)], wheels), [])
+        self.assertEqual(resolve([('numpy', '1.26.4'), ('scipy', None)], wheels),
+                         ["numpy==1.26.4 (wheelhouse has 2.0.0)", "scipy (no wheel)"])
+
+    def test_install_once_then_skip_until_inputs_change(self):
+        self.assertTrue(self.install())
+        self.assertEqual(len(self.commands), 1)
+        self.assertIn('--no-index', self.commands[0])
+        self.assertNotIn('--require-hashes', self.commands[0])
+        with open(self.lockfile) as f:
+            lock = json.load(f)
+        self.assertEqual(sorted(entry['name'] for entry in lock['packages']), ['numpy', 'pandas', 'python-dateutil'])
+        self.assertEqual(lock['packages'][0]['sha256'], hashlib.sha256(b'numpy wheel').hexdigest())
+
+        self.assertFalse(self.install())
+        self.assertEqual(self.commands, [])
+        self.installed['pandas'] = '2.1.0'  # changed behind the lock's back
+        self.assertTrue(self.install())
+        self.assertTrue(self.install(force=True))
+
+    def test_replaced_wheel_is_rejected(self):
+        self.install()
+        self.write_wheel('numpy-2.0.0-cp311-none-any.whl', b'tampered numpy wheel')
+        with self.assertRaisesRegex(RuntimeError, "numpy-2.0.0"):
+            self.install()
+        self.assertEqual(self.commands, [])
+
+    def test_hash_pins(self):
+        good = hashlib.sha256(b'numpy wheel').hexdigest()
+        self.write_requirements(f"numpy==2.0.0 --hash=sha256:{good}\n")
+        self.install()
+        self.assertIn('--require-hashes', self.commands[0])
+        self.write_requirements(f"numpy==2.0.0 --hash=sha256:{'0' * 64}\n")
+        os.remove(self.lockfile)
+        with self.assertRaises(RuntimeError):
+            self.install()
+
+    def test_unsatisfiable_requirements_install_nothing(self):
+        self.write_requirements("numpy==2.0.0\nscipy==1.13.0\n")
+        with self.assertRaisesRegex(RuntimeError, "scipy"):
+            self.install()
+        self.assertEqual(self.commands, [])
+        self.assertFalse(os.path.exists(self.lockfile))
+
+
+if __name__ == "__main__":
+    unittest.main()
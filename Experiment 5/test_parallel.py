@@ -0,0 +1,53 @@
+"""
+Experiment 5: Unit Testing Implementation
+Tests for the process-pool runner of Experiment 6 (parallel.py): batch and
+sharded results must equal DataProcessor.calculate_results.
+"""
+
+import logging
+import os
+import random
+import sys
+import unittest
+from array import array
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Experiment 6'))
+
+from debug import DataProcessor  # noqa: E402
+from parallel import calculate_results_sharded, run_batch  # noqa: E402
+
+
+class TestParallel(unittest.TestCase):
+
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+        self.addCleanup(logging.disable, logging.NOTSET)
+        rng = random.Random(5)
+        self.datasets = [[rng.uniform(1, 100) for _ in range(rng.choice([1, 3, 40, 300, 2000]))]
+                         for _ in range(12)]
+        self.datasets[4] = []
+        self.datasets[7] = array('d', self.datasets[7])
+
+    def test_batch_matches_calculate_results_in_order(self):
+        expected = [DataProcessor(data).calculate_results() for data in self.datasets]
+        for threshold in (10 ** 9, 100, 1):  # all pickled, mixed, all through shared memory
+            with self.subTest(shm_threshold=threshold):
+                self.assertEqual(run_batch(self.datasets, processes=2, chunksize=3, shm_threshold=threshold),
+                                 expected)
+
+    def test_sharded_matches_calculate_results(self):
+        data = [v for dataset in self.datasets for v in dataset]
+        expected = DataProcessor(data).calculate_results()
+        for shards in (1, 3, 7):
+            with self.subTest(shards=shards):
+                self.assertEqual(list(calculate_results_sharded(data, processes=2, shards=shards)), expected)
+        self.assertEqual(list(calculate_results_sharded(array('d', data[:5]), processes=2, shards=9)),
+                         DataProcessor(data[:5]).calculate_results())
+
+    def test_sharded_guards(self):
+        self.assertEqual(calculate_results_sharded([], processes=2), 0)
+        self.assertEqual(calculate_results_sharded([3.0, -3.0], processes=2), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
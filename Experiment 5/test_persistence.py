@@ -0,0 +1,202 @@
+"""
+Experiment 5: Unit Testing Implementation
+Tests for the write-ahead log and snapshots of Experiment 9 (persistence.py).
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Experiment 9'))
+
+from library import LibraryError  # noqa: E402
+from persistence import PersistentLibrary, WriteAheadLog, _segments  # noqa: E402
+
+
+def state(db):
+    return [(book.isbn, book.title, book.is_available, book.borrower) for book in db], list(db.members)
+
+
+class TestPersistentLibrary(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = self.tmp.name
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def reopen(self, db, **options):
+        expected = state(db)
+        db.close()
+        db = PersistentLibrary(self.dir, **options)
+        self.addCleanup(db.close)
+        self.assertEqual(state(db), expected)
+        return db
+
+    def test_every_operation_survives_a_restart(self):
+        db = PersistentLibrary(self.dir)
+        db.add_book(9780000000001, "Dune")
+        self.assertEqual(db.add_books((9780000000002 + i, f"Title {i}") for i in range(5)), 5)
+        member = db.register_member("Ayesha")
+        db.issue_book(9780000000001, member)
+        db.issue_book(9780000000003, member)
+        db.return_book(9780000000003)
+        db = self.reopen(db)
+        self.assertEqual(len(db), 6)
+        self.assertFalse(db.is_available(9780000000001))
+        self.assertEqual(db.loans(member), 1)
+
+    def test_partial_add_books_is_logged_up_to_the_error(self):
+        db = PersistentLibrary(self.dir)
+        with self.assertRaises(LibraryError):
+            db.add_books([(9780000000001, "A"), (9780000000002, "B"), (9780000000001, "again")])
+        self.assertEqual(len(db), 2)
+        self.reopen(db)
+
+    def test_bulk_load_across_a_snapshot(self):
+        db = PersistentLibrary(self.dir, snapshot_every=3)
+        db.add_books((9780000000000 + i, f"Title {i}") for i in range(10))
+        db.add_book(9781000000000, "After")
+        db = self.reopen(db)
+        self.assertEqual(len(db), 11)
+
+    def test_only_reads_are_forwarded(self):
+        db = PersistentLibrary(self.dir)
+        self.addCleanup(db.close)
+        db.add_book(9780000000001, "Dune")
+        self.assertEqual(db.get_book(9780000000001).title, "Dune")
+        self.assertIn(9780000000001, db)
+        for name in ('checkout_row', 'checkin_row', 'count_loan', 'from_columns'):
+            with self.subTest(name=name), self.assertRaises(AttributeError):
+                getattr(db, name)
+
+    def test_torn_tail_is_truncated(self):
+        db = PersistentLibrary(self.dir)
+        db.add_book(9780000000001, "Dune")
+        db.close()
+        (_, path), = _segments(self.dir)
+        with open(path, 'ab') as f:
+            f.write(b'\x00\x01torn')
+        db = PersistentLibrary(self.dir)
+        db.add_book(9780000000002, "Emma")
+        db = self.reopen(db)
+        self.assertEqual(len(db), 2)
+
+    def test_crash_at_segment_switch(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+        start_thread = threading.Thread
+
+        def held_snapshots(*args, target=None, name=None, **kwargs):
+            if name == 'lms-snapshot':  # crash before the snapshot thread gets to run
+                run = target
+
+                def target():
+                    release.wait(5)
+                    run()
+            return start_thread(*args, target=target, name=name, **kwargs)
+
+        with mock.patch('persistence.threading.Thread', held_snapshots):
+            # No background commits: only the segment switch can write segment 1
+            db = PersistentLibrary(self.dir, synchronous=False, commit_interval=60, snapshot_every=2)
+            db.add_book(9780000000001, "Dune")
+            member = db.register_member("Ayesha")  # second record: switches to segment 2
+            db.synchronous = True
+            db.issue_book(9780000000001, member)   # durable in segment 2
+            crashed = os.path.join(self.dir, 'crashed')
+            os.mkdir(crashed)
+            for _, path in _segments(self.dir):
+                shutil.copy(path, crashed)
+            release.set()
+            db.close()
+        recovered = PersistentLibrary(crashed)
+        self.addCleanup(recovered.close)
+        self.assertEqual(recovered.recovered, 3)
+        self.assertFalse(recovered.is_available(9780000000001))
+        self.assertEqual(recovered.loans(member), 1)
+
+    def test_snapshot_failure_is_reported(self):
+        db = PersistentLibrary(self.dir)
+        db.add_book(9780000000001, "Dune")
+        with mock.patch('persistence.write_snapshot', side_effect=OSError(28, "No space left")):
+            with self.assertRaises(OSError):
+                db.checkpoint()
+        db.checkpoint()  # reported once; the next snapshot succeeds
+        self.reopen(db)
+
+    def test_background_snapshot_failure_is_raised_by_close(self):
+        db = PersistentLibrary(self.dir, snapshot_every=1)
+        with mock.patch('persistence.write_snapshot', side_effect=OSError(28, "No space left")):
+            db.add_book(9780000000001, "Dune")
+            with self.assertRaises(OSError):
+                db.close()
+        db = PersistentLibrary(self.dir)  # the log still has every record
+        self.addCleanup(db.close)
+        self.assertEqual(len(db), 1)
+
+
+class TestWriteAheadLog(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'wal.000001.log')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_close_during_commits_loses_no_acknowledged_record(self):
+        for _ in range(20):
+            wal = WriteAheadLog(self.path, commit_interval=0.0005)
+            errors, appended = [], []
+
+            def writer():
+                for _ in range(50):
+                    try:
+                        sequence = wal.append(b'x')
+                    except ValueError:
+                        return  # closed: nothing was appended
+                    appended.append(sequence)
+                    try:
+                        wal.commit(sequence)
+                    except ValueError as e:
+                        errors.append(e)
+
+            threads = [threading.Thread(target=writer) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            wal.close()
+            for thread in threads:
+                thread.join()
+            self.assertEqual(errors, [])
+            self.assertEqual(os.path.getsize(self.path), len(appended))
+            os.remove(self.path)
+
+    def test_write_errors_reach_the_committers(self):
+        wal = WriteAheadLog(self.path)
+        with mock.patch('persistence.os.fsync', side_effect=OSError(5, "I/O error")):
+            sequence = wal.append(b'x')
+            done = threading.Event()
+            raised = []
+
+            def commit():
+                try:
+                    wal.commit(sequence)
+                except OSError as e:
+                    raised.append(e)
+                done.set()
+
+            threading.Thread(target=commit, daemon=True).start()
+            self.assertTrue(done.wait(5), "commit() blocked after the commit thread failed")
+        self.assertEqual(len(raised), 1)
+        with self.assertRaises(OSError):
+            wal.append(b'y')
+        wal.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+"""
+Experiment 5: Unit Testing Implementation
+Tests for the downsampled, non-blocking plot_results of Experiment 7 (marven.py).
+"""
+
+import importlib.util
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Experiment 7'))
+
+HAVE_MATPLOTLIB = importlib.util.find_spec('numpy') and importlib.util.find_spec('matplotlib')
+
+
+@unittest.skipUnless(HAVE_MATPLOTLIB, "needs numpy and matplotlib")
+class TestDownsampling(unittest.TestCase):
+
+    def setUp(self):
+        import numpy as np
+        import marven
+        self.np, self.marven = np, marven
+        rng = np.random.default_rng(3)
+        self.x = np.arange(10_000, dtype=np.float64)
+        self.y = np.cumsum(rng.normal(size=10_000))
+        self.y[1234], self.y[8765] = 1e6, -1e6  # single-sample spikes
+
+    def test_minmax_keeps_every_bin_extreme(self):
+        xs, ys = self.marven.downsample_minmax(self.x, self.y, 500)
+        self.assertLessEqual(len(ys), 500)
+        self.assertEqual((ys.max(), ys.min()), (1e6, -1e6))
+        bins = self.np.unique(self.np.linspace(0, len(self.y), 250, endpoint=False).astype(int))
+        for lo, hi, (low, high) in zip(bins, list(bins[1:]) + [len(self.y)], ys.reshape(-1, 2)):
+            self.assertEqual((low, high), (self.y[lo:hi].min(), self.y[lo:hi].max()))
+        self.assertTrue((self.np.diff(xs) >= 0).all())
+
+    def test_lttb_keeps_endpoints_and_spikes(self):
+        xs, ys = self.marven.downsample_lttb(self.x, self.y, 300)
+        self.assertEqual(len(xs), 300)
+        self.assertEqual((xs[0], xs[-1]), (0, 9999))
+        self.assertTrue((self.np.diff(xs) > 0).all())
+        self.assertIn(1e6, ys)
+        self.assertIn(-1e6, ys)
+        short = self.marven.downsample_lttb(self.x[:50], self.y[:50], 300)
+        self.assertEqual(len(short[0]), 50)
+
+
+@unittest.skipUnless(HAVE_MATPLOTLIB, "needs numpy and matplotlib")
+class TestPlotResults(unittest.TestCase):
+
+    def setUp(self):
+        import numpy as np
+        import marven
+        self.np, self.marven = np, marven
+        with mock.patch('builtins.print'):
+            self.calc = marven.Calculator()
+        self.calc.divide_batch(np.arange(50_000.0), np.where(np.arange(50_000) % 7, 3.0, 0.0))
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def plotted(self, **options):
+        """(x, y) passed to Axes.plot when saving to a file."""
+        from matplotlib.axes import Axes
+        path = os.path.join(self.tmp.name, 'results.png')
+        with mock.patch.object(Axes, 'plot', autospec=True) as plot, \
+                mock.patch.object(self.marven, 'plt') as plt:
+            self.assertEqual(self.calc.plot_results(path, **options), path)
+        plt.show.assert_not_called()
+        plt.subplots.assert_not_called()
+        self.assertTrue(os.path.getsize(path))
+        _, x, y = plot.call_args[0]
+        return x, y
+
+    def test_saves_without_pyplot_and_drops_failed_divisions(self):
+        x, y = self.plotted(max_points=10 ** 6)
+        self.assertEqual(len(y), 50_000 - len(range(0, 50_000, 7)))
+        self.assertTrue(self.np.isfinite(y).all())
+
+    def test_large_histories_are_downsampled(self):
+        for method in ('minmax', 'lttb'):
+            with self.subTest(method=method):
+                x, y = self.plotted(max_points=1000, method=method)
+                self.assertLessEqual(len(y), 1000)
+                self.assertEqual(y.max(), (50_000 - 1) / 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
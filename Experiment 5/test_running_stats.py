@@ -0,0 +1,86 @@
+"""
+Experiment 5: Unit Testing Implementation
+Tests for the mergeable streaming accumulator of Experiment 7 (marven.RunningStats):
+any way of feeding or merging the data must match a single pass.
+"""
+
+import importlib.util
+import math
+import os
+import pickle
+import random
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Experiment 7'))
+
+HAVE_NUMPY = importlib.util.find_spec('numpy')
+
+
+@unittest.skipUnless(HAVE_NUMPY, "needs numpy")
+class TestRunningStats(unittest.TestCase):
+
+    def setUp(self):
+        import numpy as np
+        from marven import RunningStats
+        self.np, self.RunningStats = np, RunningStats
+        rng = random.Random(19)
+        self.values = [rng.gauss(1e6, 3.0) for _ in range(5000)]  # large mean, small spread
+
+    def assertMatches(self, stats, values):
+        self.assertEqual(stats.count, len(values))
+        self.assertAlmostEqual(stats.mean, self.np.mean(values), delta=1e-9 * abs(self.np.mean(values)))
+        self.assertAlmostEqual(stats.std(), self.np.std(values), places=9)
+        self.assertAlmostEqual(stats.std(ddof=1), self.np.std(values, ddof=1), places=9)
+
+    def test_single_pass(self):
+        stats = self.RunningStats()
+        for value in self.values:
+            stats.update(value)
+        self.assertMatches(stats, self.values)
+        self.assertMatches(self.RunningStats(self.values), self.values)
+
+    def test_merge_matches_a_single_pass(self):
+        for parts in (2, 3, 7, 100):
+            with self.subTest(parts=parts):
+                bounds = [len(self.values) * k // parts for k in range(parts + 1)]
+                total = self.RunningStats()
+                for lo, hi in zip(bounds, bounds[1:]):
+                    total.merge(self.RunningStats(self.values[lo:hi]))
+                self.assertMatches(total, self.values)
+
+    def test_merge_mixes_scalar_and_batch_updates(self):
+        left = self.RunningStats()
+        for value in self.values[:10]:
+            left.update(value)
+        right = self.RunningStats(self.np.array(self.values[10:]).reshape(-1, 10))
+        combined = left + right
+        self.assertMatches(combined, self.values)
+        self.assertEqual(left.count, 10)  # + leaves both operands alone
+
+    def test_empty_accumulators(self):
+        empty = self.RunningStats()
+        self.assertTrue(math.isnan(empty.variance()))
+        self.assertTrue(math.isnan(self.RunningStats([5.0]).variance(ddof=1)))
+        stats = self.RunningStats(self.values).merge(empty).merge(self.RunningStats([]))
+        self.assertMatches(stats, self.values)
+        self.assertMatches(empty.merge(self.RunningStats(self.values)), self.values)
+
+    def test_pickles_for_worker_processes(self):
+        stats = self.RunningStats(self.values)
+        restored = pickle.loads(pickle.dumps(stats))
+        self.assertEqual((restored.count, restored.mean, restored.variance()),
+                         (stats.count, stats.mean, stats.variance()))
+
+    def test_calculator_accepts_accumulators(self):
+        from marven import Calculator
+        with mock.patch('builtins.print'):
+            calc = Calculator()
+        stats = calc.running_stats(self.values[:100]).merge(calc.running_stats(self.values[100:]))
+        self.assertEqual(calc.calculate_mean(stats), stats.mean)
+        self.assertAlmostEqual(calc.calculate_std(stats), calc.calculate_std(self.values), places=9)
+
+
+if __name__ == "__main__":
+    unittest.main()
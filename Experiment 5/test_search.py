@@ -0,0 +1,110 @@
+"""
+Experiment 5: Unit Testing Implementation
+Tests for the Search Books index of Experiment 9 (search.py): ranked results
+must equal a brute-force scan of every title.
+"""
+
+import math
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Experiment 9'))
+
+from library import Library  # noqa: E402
+from search import MAX_COMPLETIONS, SearchIndex, random_titles, tokenize  # noqa: E402
+
+
+def brute_force(index, query, limit, available_only=False):
+    """[(score, row)] by scoring every title the way search_rows documents it."""
+    tokens = tokenize(query)
+    prefix = None if query[-1:].isspace() else tokens.pop()
+    library, scored = index.library, []
+    for row in range(len(library)):
+        words = tokenize(library.title_at(row))
+        if any(t not in words for t in tokens):
+            continue
+        if available_only and not library.available_at(row):
+            continue
+        idf = 0.0
+        if prefix is not None:
+            matched = [index._idf(w) for w in set(words) if w.startswith(prefix)]
+            if not matched:
+                continue
+            idf = max(matched)
+        scored.append(((sum(index._idf(t) for t in tokens) + idf) / math.sqrt(len(words)), row))
+    scored.sort(key=lambda item: (-item[0], item[1]))
+    return scored[:limit]
+
+
+class TestSearchIndex(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.library = Library()
+        cls.library.add_books(random_titles(5000, vocabulary=600, seed=3))
+        member = cls.library.register_member("Ayesha")
+        for row in range(0, 5000, 3):
+            cls.library.issue_book(cls.library.book_at(row).isbn, member)
+        cls.index = SearchIndex(cls.library)
+
+    def check(self, query, limit=10, available_only=False):
+        found = self.index.search_rows(query, limit, available_only)
+        expected = brute_force(self.index, query, limit, available_only)
+        self.assertEqual([row for _, row in found], [row for _, row in expected], query)
+        for (score, _), (reference, _) in zip(found, expected):
+            self.assertAlmostEqual(score, reference)
+
+    def test_matches_brute_force(self):
+        for query in ["history", "history ", "python machine", "ancient hist", "compu", "k", "lo ra",
+                      "war peace ", "modern m", "zzz", "history zzz", "a"]:
+            for available_only in (False, True):
+                with self.subTest(query=query, available_only=available_only):
+                    self.check(query, 7, available_only)
+
+    def test_rare_completion_beyond_the_autocomplete_cap(self):
+        library = Library()
+        frequent = [f"ma{i:03d}" for i in range(100)]
+        rows = [(9780000000000 + i, f"Python {word}") for i, word in enumerate(frequent * 5)]
+        library.add_books(rows + [(9781000000000, "Python Mazurka"), (9781000000001, "Mazurka")])
+        index = SearchIndex(library)
+        self.assertNotIn('mazurka', index.autocomplete('python ma', MAX_COMPLETIONS))
+        titles = [book.title for book in index.search('python ma', limit=3)]
+        self.assertEqual(titles[0], "Python Mazurka")
+        self.assertEqual([book.title for book in index.search('ma', limit=2)], ["Mazurka", "Python Mazurka"])
+        self.index, self.library = index, library
+        for query in ("python ma", "ma", "python m", "p"):
+            with self.subTest(query=query):
+                self.check(query, 5)
+
+    def test_new_titles_are_found_incrementally(self):
+        library = Library()
+        library.add_books(random_titles(200, vocabulary=50, seed=1))
+        index = SearchIndex(library)
+        self.assertEqual(index.search_rows("quantum"), [])
+        library.add_book("9781111111111", "Quantum Gardening")
+        self.assertEqual([b.title for b in index.search("quantum gard")], ["Quantum Gardening"])
+        self.assertEqual(index.autocomplete("quan"), ["quantum"])
+
+
+class TestRandomQueries(unittest.TestCase):
+
+    def test_random_queries_match_brute_force(self):
+        library = Library()
+        library.add_books(random_titles(3000, vocabulary=300, seed=5))
+        index = SearchIndex(library)
+        index.refresh()
+        words = sorted(index.postings)
+        rng = random.Random(7)
+        for _ in range(60):
+            query = ' '.join(rng.sample(words, rng.randint(0, 2)))
+            last = rng.choice(words)
+            query = (query + ' ' + last[:rng.randint(1, len(last))]).strip()
+            found = index.search_rows(query, 5)
+            expected = brute_force(index, query, 5)
+            self.assertEqual([row for _, row in found], [row for _, row in expected], query)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+"""
+Experiment 5: Unit Testing Implementation
+Tests for the headless, parallel diagram rendering of Experiment 9 (fail.py).
+"""
+
+import importlib.util
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Experiment 9'))
+
+import fail  # noqa: E402
+
+HAVE_MATPLOTLIB = importlib.util.find_spec('matplotlib')
+
+
+class TestHeadlessRendering(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.dirs = [os.path.join(self.tmp.name, name) for name in ('ci', 'docs')]
+
+    def test_every_diagram_into_every_directory(self):
+        written = fail.render_headless(self.dirs, fmt='svg', processes=2)
+        expected = [os.path.join(folder, f"{name}.svg") for folder in self.dirs
+                    for name in ('1_class_diagram', '2_use_case_diagram', '3_sequence_diagram')]
+        self.assertEqual(written, expected)
+        for path in written:
+            with open(path, encoding='utf-8') as f:
+                self.assertTrue(f.read().startswith('<svg'), path)
+
+    def test_selected_diagrams_and_single_directory(self):
+        written = fail.render_headless(self.dirs[0], diagrams=('sequence',), fmt='svg', processes=1)
+        self.assertEqual(written, [os.path.join(self.dirs[0], '3_sequence_diagram.svg')])
+        self.assertEqual(os.listdir(self.dirs[0]), ['3_sequence_diagram.svg'])
+
+    @unittest.skipUnless(HAVE_MATPLOTLIB, "needs matplotlib")
+    def test_raster_and_pdf_output(self):
+        for fmt, magic in (('png', b'\x89PNG'), ('pdf', b'%PDF')):
+            with self.subTest(fmt=fmt):
+                path, = fail.render_headless(self.dirs[0], diagrams=('class',), fmt=fmt, dpi=40, processes=1)
+                with open(path, 'rb') as f:
+                    self.assertEqual(f.read(4), magic)
+
+    def test_show_is_opt_in(self):
+        with mock.patch.object(fail.uml_spec, 'show') as show, mock.patch('builtins.print'):
+            fail.create_use_case_diagram(self.tmp.name, fmt='svg', show=False)
+            show.assert_not_called()
+            fail.create_use_case_diagram(self.tmp.name, fmt='svg')
+            show.assert_called_once_with(fail.LMS_DIAGRAMS['2_use_case_diagram'])
+
+
+if __name__ == "__main__":
+    unittest.main()
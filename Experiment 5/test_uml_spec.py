@@ -0,0 +1,88 @@
+"""
+Experiment 5: Unit Testing Implementation
+Tests for the declarative UML specs of Experiment 9 (uml_spec.py): layout,
+SVG output and the spec-hash cache of render_all.
+"""
+
+import copy
+import os
+import sys
+import tempfile
+import unittest
+from xml.etree import ElementTree
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Experiment 9'))
+
+from uml_spec import LMS_DIAGRAMS, LMS_OVERVIEW_DIAGRAMS, layout, render_all, to_svg  # noqa: E402
+
+
+class TestSpecs(unittest.TestCase):
+
+    def test_every_spec_renders_valid_svg(self):
+        for name, spec in {**LMS_DIAGRAMS, **LMS_OVERVIEW_DIAGRAMS}.items():
+            with self.subTest(name=name):
+                root = ElementTree.fromstring(to_svg(spec))
+                texts = [node.text for node in root.iter('{http://www.w3.org/2000/svg}text')]
+                self.assertEqual(texts[0], spec['title'])
+
+    def test_text_is_escaped(self):
+        spec = copy.deepcopy(LMS_DIAGRAMS['3_sequence_diagram'])
+        spec['messages'][0]['label'] = '1: Request(<ISBN> & "title")'
+        root = ElementTree.fromstring(to_svg(spec))
+        self.assertIn('1: Request(<ISBN> & "title")', [node.text for node in root.iter()])
+
+    def test_layout_fits_every_primitive(self):
+        for name, spec in LMS_DIAGRAMS.items():
+            width, height, prims = layout(spec)
+            for kind, *args, _ in prims:
+                if kind in ('rect', 'line'):
+                    x1, y1, a, b = args
+                    x2, y2 = (x1 + a, y1 + b) if kind == 'rect' else (a, b)
+                    with self.subTest(name=name, primitive=kind):
+                        self.assertTrue(0 <= min(x1, x2) and max(x1, x2) <= width)
+                        self.assertTrue(0 <= min(y1, y2) and max(y1, y2) <= height)
+
+    def test_unknown_type(self):
+        with self.assertRaises(ValueError):
+            layout({'type': 'state'})
+
+
+class TestRenderAll(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.specs = copy.deepcopy(LMS_DIAGRAMS)
+
+    def render(self, **options):
+        return render_all(self.specs, self.tmp.name, **options)
+
+    def test_unchanged_specs_are_skipped(self):
+        names = list(self.specs)
+        self.assertEqual(self.render(), (names, []))
+        self.assertTrue(os.path.exists(os.path.join(self.tmp.name, '.uml_cache.json')))
+        self.assertEqual(self.render(), ([], names))
+
+    def test_only_changed_or_missing_diagrams_are_rendered(self):
+        self.render()
+        self.specs['2_use_case_diagram']['use_cases'].append('Pay Fine')
+        os.remove(os.path.join(self.tmp.name, '3_sequence_diagram.svg'))
+        self.assertEqual(self.render(), (['2_use_case_diagram', '3_sequence_diagram'], ['1_class_diagram']))
+        with open(os.path.join(self.tmp.name, '2_use_case_diagram.svg'), encoding='utf-8') as f:
+            self.assertIn('Pay Fine', f.read())
+        self.assertEqual(self.render()[0], [])
+
+    def test_format_and_dpi_are_part_of_the_hash(self):
+        self.render()
+        self.assertEqual(self.render(dpi=300)[0], list(self.specs))
+        self.assertEqual(len(self.render(fmt='svg', dpi=300)[1]), 3)
+
+    def test_damaged_cache_renders_everything(self):
+        self.render()
+        with open(os.path.join(self.tmp.name, '.uml_cache.json'), 'w') as f:
+            f.write('{not json')
+        self.assertEqual(self.render(), (list(self.specs), []))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,9 +5,11 @@ Objective: Identify and resolve multiple bug types (Syntax, Runtime, Logic)
 """
 
 import logging
-
-# Configure logging to track debugging steps (Professional alternative to print)
-logging.basicConfig(level=logging.DEBUG, format='%(levelname)s: %(message)s')
+import math
+import os
+import tempfile
+from array import array
+from itertools import islice
 
 class DataProcessor:
     def __init__(self, data):
@@ -21,7 +23,7 @@ class DataProcessor:
         """
         results = []
         
-        logging.debug(f"Starting calculation with data: {self.data}")
+        logging.debug("Starting calculation with data: %s", self.data)
 
         # --- BUG 1: RUNTIME ERROR (Empty list check) ---
         if not self.data:
@@ -43,9 +45,144 @@ class DataProcessor:
             percentage = (value / total_sum) * 100
             results.append(round(percentage, 2))
             
-        logging.info(f"Calculations successful. Results: {results}")
+        logging.info("Calculations successful. Results: %s", results)
         return results
 
+    # --- STREAMING MODE (out-of-core datasets) ---
+    # self.data may be an iterable, a file path or a sliceable array such as
+    # numpy.memmap. Memory use is bounded by chunk_size, not by the dataset.
+
+    def _source_chunks(self, chunk_size, file_format):
+        """Yield the input as chunks of at most chunk_size numbers."""
+        data = self.data
+        if isinstance(data, (str, os.PathLike)):
+            if file_format == 'f64':
+                yield from _read_binary_chunks(data, chunk_size)
+            else:
+                yield from _read_text_chunks(data, chunk_size)
+        elif hasattr(data, '__len__') and hasattr(data, '__getitem__'):
+            for start in range(0, len(data), chunk_size):
+                yield data[start:start + chunk_size]
+        else:
+            iterator = iter(data)
+            while True:
+                chunk = array('d', islice(iterator, chunk_size))
+                if not chunk:
+                    return
+                yield chunk
+
+    def iter_results(self, chunk_size=65536, file_format='text'):
+        """
+        Two-pass streaming version of calculate_results.
+        Pass 1 computes the total chunk by chunk; pass 2 yields percentage chunks.
+        One-shot iterators are spilled to a temporary binary file during pass 1.
+        """
+        spill = None
+        if not isinstance(self.data, (str, os.PathLike)) and not hasattr(self.data, '__getitem__'):
+            spill = tempfile.NamedTemporaryFile(suffix='.f64', delete=False)
+
+        try:
+            total_sum = 0.0
+            count = 0
+            for chunk in self._source_chunks(chunk_size, file_format):
+                total_sum += math.fsum(chunk)
+                count += len(chunk)
+                if spill is not None:
+                    chunk.tofile(spill)
+            logging.debug("Streaming pass 1 complete: %d values, total %s", count, total_sum)
+
+            # Same guard as calculate_results, plus an all-zero total
+            if count == 0:
+                logging.error("Empty dataset provided! Nothing to stream.")
+                return
+            if total_sum == 0:
+                logging.error("Dataset sums to zero! Percentages are undefined.")
+                return
+
+            if spill is not None:
+                spill.close()
+                chunks = _read_binary_chunks(spill.name, chunk_size)
+            else:
+                chunks = self._source_chunks(chunk_size, file_format)
+
+            scale = 100 / total_sum
+            for chunk in chunks:
+                if hasattr(chunk, 'round'):  # numpy arrays / memmaps
+                    yield (chunk * scale).round(2)
+                else:
+                    yield array('d', (round(value * scale, 2) for value in chunk))
+        finally:
+            if spill is not None:
+                spill.close()
+                os.remove(spill.name)
+
+    def calculate_results_streaming(self, out=None, chunk_size=65536, file_format='text'):
+        """
+        Stream percentages into `out`: a file path (raw float64), a preallocated
+        writable array, or None for a new array('d'). Returns `out` (or the new
+        array) and logs only a summary, never the data itself.
+        """
+        written = 0
+        handle = None
+        if out is None:
+            out = array('d')
+        elif isinstance(out, (str, os.PathLike)):
+            handle = open(out, 'wb')
+
+        try:
+            for chunk in self.iter_results(chunk_size, file_format):
+                if handle is not None:
+                    chunk.tofile(handle)
+                elif isinstance(out, array):
+                    if len(out) == written:
+                        out.extend(chunk)
+                    else:
+                        out[written:written + len(chunk)] = array('d', chunk)
+                else:
+                    out[written:written + len(chunk)] = chunk
+                written += len(chunk)
+        finally:
+            if handle is not None:
+                handle.close()
+
+        logging.info("Streaming calculation finished. %d results written.", written)
+        return out
+
+
+def _read_binary_chunks(path, chunk_size):
+    """Yield chunks of native float64 values from a raw binary file."""
+    with open(path, 'rb') as f:
+        while True:
+            raw = f.read(chunk_size * 8)
+            if not raw:
+                return
+            chunk = array('d')
+            chunk.frombytes(raw[:len(raw) - len(raw) % 8])
+            yield chunk
+
+
+def _read_text_chunks(path, chunk_size, block_size=1 << 20):
+    """Yield chunks of numbers from a whitespace-separated text file."""
+    chunk = array('d')
+    carry = ''
+    with open(path) as f:
+        while True:
+            block = f.read(block_size)
+            if not block:
+                break
+            tokens = (carry + block).split()
+            # The last token may continue in the next block
+            carry = tokens.pop() if tokens and not block[-1].isspace() else ''
+            for token in tokens:
+                chunk.append(float(token))
+                if len(chunk) == chunk_size:
+                    yield chunk
+                    chunk = array('d')
+    if carry:
+        chunk.append(float(carry))
+    if chunk:
+        yield chunk
+
 def debug_test_environment():
     """
     Simulating a debugging environment with different test cases.
@@ -67,5 +204,13 @@ def debug_test_environment():
     processor3 = DataProcessor([100])
     print(f"Outcome: {processor3.calculate_results()}") # Should be [100.0]
 
+    # CASE 4: Streaming Mode (Large Data)
+    print("\n[Case 4: Streaming Mode with a Generator]")
+    processor4 = DataProcessor(value for value in [10, 20, 30, 40])
+    print(f"Outcome: {list(processor4.calculate_results_streaming(chunk_size=2))}")
+
 if __name__ == "__main__":
+    # Configure logging to track debugging steps (Professional alternative to print).
+    # Only when run as a script, so importing DataProcessor leaves logging alone.
+    logging.basicConfig(level=logging.DEBUG, format='%(levelname)s: %(message)s')
     debug_test_environment()
\ No newline at end of file
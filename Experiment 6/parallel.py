@@ -0,0 +1,200 @@
+"""
+University of South Asia
+Experiment 6: Parallel Data Processing
+Objective: Run DataProcessor over many datasets (or one huge dataset) on all
+CPU cores without pickling large numeric inputs.
+"""
+
+import logging
+import math
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from debug import DataProcessor
+
+try:
+    import numpy as np
+except ImportError:  # the array('d') copies below still work, just slower
+    np = None
+
+ITEM_SIZE = array('d').itemsize
+
+
+def _quiet_worker():
+    """
+    Pool initializer: per-dataset debug logging would dominate worker time.
+    DataProcessor passes its data as lazy %-style arguments, so with the level
+    raised no result list is ever formatted in a worker.
+    """
+    logging.getLogger().setLevel(logging.WARNING)
+
+
+def _attach(name):
+    """Attach to a block created by the parent without taking ownership of it."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13: workers share the parent's resource tracker, so the
+        # duplicate registration is dropped when the parent unlinks the block
+        return shared_memory.SharedMemory(name=name)
+
+
+def _copy_into(buf, values):
+    """Write values as float64 at the start of a shared buffer in one bulk copy."""
+    if np is not None:
+        target = np.frombuffer(buf, dtype=np.float64, count=len(values))
+        np.copyto(target, values, casting='unsafe')  # buffers (array, ndarray) copy without a per-item loop
+        del target  # release the export so the block can be closed
+        return
+    view = buf.cast('d')
+    view[:len(values)] = values if getattr(values, 'typecode', None) == 'd' else array('d', values)
+    view.release()
+
+
+def _to_shared(values):
+    """Copy numeric values into a new shared memory block of float64."""
+    shm = shared_memory.SharedMemory(create=True, size=max(len(values), 1) * ITEM_SIZE)
+    _copy_into(shm.buf, values)
+    return shm
+
+
+# --- Worker tasks (module level so they can be pickled) ---
+
+def _process_inline(data):
+    return DataProcessor(data).calculate_results()
+
+
+def _process_shared(task):
+    """Run calculate_results on a shared input and write results to a shared output."""
+    in_name, out_name, length = task
+    src, dst = _attach(in_name), _attach(out_name)
+    values = src.buf.cast('d')[:length]
+    try:
+        results = DataProcessor(values).calculate_results()
+        if results == 0:  # empty/invalid dataset keeps calculate_results' return value
+            return 0
+        _copy_into(dst.buf, results)
+        return None
+    finally:
+        values.release()
+        src.close()
+        dst.close()
+
+
+def _shard_sum(task):
+    name, start, stop = task
+    shm = _attach(name)
+    view = shm.buf.cast('d')
+    try:
+        return math.fsum(view[start:stop])
+    finally:
+        view.release()
+        shm.close()
+
+
+def _shard_percentages(task):
+    in_name, out_name, start, stop, total_sum = task
+    src, dst = _attach(in_name), _attach(out_name)
+    values, out = src.buf.cast('d'), dst.buf.cast('d')
+    try:
+        scale = 100 / total_sum
+        out[start:stop] = array('d', (round(v * scale, 2) for v in values[start:stop]))
+    finally:
+        values.release()
+        out.release()
+        src.close()
+        dst.close()
+
+
+# --- Public API ---
+
+def run_batch(datasets, processes=None, chunksize=16, shm_threshold=100_000, quiet=True):
+    """
+    Run DataProcessor(dataset).calculate_results() for every dataset in a process pool.
+    Results are returned in input order. Datasets with at least shm_threshold values
+    travel through shared memory instead of being pickled.
+    """
+    datasets = list(datasets)
+    results = [None] * len(datasets)
+    small, large = [], []
+    for i, data in enumerate(datasets):
+        (large if len(data) >= shm_threshold else small).append(i)
+
+    shared = []  # (dataset index, input block, output block, length)
+    try:
+        for i in large:
+            length = len(datasets[i])
+            dst = shared_memory.SharedMemory(create=True, size=max(length, 1) * ITEM_SIZE)
+            shared.append((i, _to_shared(datasets[i]), dst, length))
+
+        with ProcessPoolExecutor(max_workers=processes,
+                                 initializer=_quiet_worker if quiet else None) as pool:
+            small_results = pool.map(_process_inline, [datasets[i] for i in small], chunksize=chunksize)
+            large_results = pool.map(_process_shared, [(src.name, dst.name, length)
+                                                       for _, src, dst, length in shared])
+            for i, result in zip(small, small_results):
+                results[i] = result
+            for (i, _, dst, length), result in zip(shared, large_results):
+                if result is None:
+                    view = dst.buf.cast('d')
+                    result = view[:length].tolist()
+                    view.release()
+                results[i] = result
+    finally:
+        for _, src, dst, _ in shared:
+            for shm in (src, dst):
+                shm.close()
+                shm.unlink()
+    return results
+
+
+def calculate_results_sharded(data, processes=None, shards=None):
+    """
+    Percentage calculation for one huge dataset split across worker processes.
+    Each shard returns a partial sum; the combined total drives the second pass.
+    Returns an array('d') of rounded percentages (0 for empty or zero-sum input,
+    matching calculate_results' guard).
+    """
+    length = len(data)
+    if length == 0:
+        logging.error("Empty list provided! Returning 0 to avoid crash.")
+        return 0
+
+    processes = processes or os.cpu_count() or 1
+    shards = shards or processes
+    bounds = [(length * k // shards, length * (k + 1) // shards) for k in range(shards)]
+
+    src = _to_shared(data)
+    dst = shared_memory.SharedMemory(create=True, size=length * ITEM_SIZE)
+    try:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            partials = pool.map(_shard_sum, [(src.name, lo, hi) for lo, hi in bounds])
+            total_sum = math.fsum(partials)
+            if total_sum == 0:
+                logging.error("Dataset sums to zero! Percentages are undefined.")
+                return 0
+            list(pool.map(_shard_percentages,
+                          [(src.name, dst.name, lo, hi, total_sum) for lo, hi in bounds]))
+        view = dst.buf.cast('d')
+        results = array('d', view)
+        view.release()
+    finally:
+        for shm in (src, dst):
+            shm.close()
+            shm.unlink()
+
+    logging.info("Sharded calculation successful. %d results over %d shards.", length, shards)
+    return results
+
+
+if __name__ == "__main__":
+    print("--- PARALLEL SESSION START ---")
+    batch = [[10, 20, 30, 40], [], [100], list(range(1, 200_001))]
+    outcomes = run_batch(batch, shm_threshold=100_000)
+    for data, outcome in zip(batch, outcomes):
+        print(f"{len(data)} values -> {outcome if len(data) < 10 else outcome[:3]}")
+
+    sharded = calculate_results_sharded(list(range(1, 1_000_001)), shards=8)
+    print(f"Sharded: {len(sharded)} results, first {sharded[:3].tolist()}")
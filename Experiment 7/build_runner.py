@@ -0,0 +1,266 @@
+"""
+Experiment 7: Cached, Parallel Build Runner
+Objective: Run build phases as a dependency graph of tasks that are skipped
+when nothing they depend on has changed.
+
+Each Task declares its input files, output files, the tasks it depends on and
+any parameters (e.g. generated file content). A task's key is the sha256 of
+its parameters and input file contents; when the key matches the last
+successful run and every output still exists, the task is skipped. Tasks whose
+dependencies are done run in parallel on a thread pool. Keys and a
+(size, mtime) -> sha256 cache of input files live in a JSON state file, so a
+no-op rebuild only stats the inputs. State outside the files (such as which
+package versions are installed) is checked by a task's probe on every run.
+
+The lab's own build steps (requirements.txt -> install, setup.py) are
+defined once at the bottom and shared by marven.py and Experiment 9's man.py.
+"""
+
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+STATE_VERSION = 2
+
+
+def write_if_changed(path, content):
+    """Write text to path only if it differs from what is there. Returns True if written."""
+    try:
+        with open(path) as f:
+            if f.read() == content:
+                return False
+    except OSError:
+        pass
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        f.write(content)
+    os.replace(tmp, path)
+    return True
+
+
+class Task:
+    """
+    One build step: action() runs when its inputs or params changed since the
+    last run, or when probe() (a cheap, JSON-serializable check of state the
+    files do not show) returns something other than it did after that run.
+    """
+
+    def __init__(self, name, action, inputs=(), outputs=(), deps=(), params=None, main_thread=False,
+                 probe=None):
+        self.name = name
+        self.action = action
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.deps = list(deps)
+        self.params = params
+        self.main_thread = main_thread  # e.g. GUI plotting, which must not run on a worker thread
+        self.probe = probe
+
+    def __repr__(self):
+        return f"Task({self.name!r}, deps={self.deps})"
+
+
+class BuildRunner:
+    """Runs a graph of Tasks with input hashing, skipping and parallel execution."""
+
+    def __init__(self, tasks, state_file='.build_state.json', workers=4):
+        self.tasks = {task.name: task for task in tasks}
+        self.state_file = state_file
+        self.workers = workers
+        for task in tasks:
+            unknown = [dep for dep in task.deps if dep not in self.tasks]
+            if unknown:
+                raise ValueError(f"task {task.name!r} depends on unknown {unknown}")
+        self.order = self._topological_order()
+        self.state = self._load_state()
+
+    def _topological_order(self):
+        order, visiting, done = [], set(), set()
+
+        def visit(name):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"dependency cycle through {name!r}")
+            visiting.add(name)
+            for dep in self.tasks[name].deps:
+                visit(dep)
+            visiting.discard(name)
+            done.add(name)
+            order.append(name)
+
+        for name in self.tasks:
+            visit(name)
+        return order
+
+    def _load_state(self):
+        try:
+            with open(self.state_file) as f:
+                state = json.load(f)
+            if state.get('version') == STATE_VERSION:
+                return state
+        except (OSError, ValueError):
+            pass
+        return {'version': STATE_VERSION, 'keys': {}, 'probes': {}, 'files': {}}
+
+    def _save_state(self):
+        tmp = self.state_file + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(self.state, f, indent=2, sort_keys=True)
+        os.replace(tmp, self.state_file)
+
+    def file_hash(self, path):
+        """sha256 of a file, re-read only when its size or mtime changed."""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        cached = self.state['files'].get(path)
+        if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            return cached[2]
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        self.state['files'][path] = [stat.st_size, stat.st_mtime_ns, digest.hexdigest()]
+        return digest.hexdigest()
+
+    def task_key(self, task):
+        digest = hashlib.sha256(task.name.encode())
+        digest.update(json.dumps(task.params, sort_keys=True, default=str).encode())
+        for path in sorted(task.inputs):
+            digest.update(f"{path}:{self.file_hash(path)}\n".encode())
+        return digest.hexdigest()
+
+    def is_current(self, task, key):
+        return (self.state['keys'].get(task.name) == key
+                and (task.probe is None or self.state['probes'].get(task.name) == task.probe())
+                and all(os.path.exists(path) for path in task.outputs))
+
+    def _record(self, task, key):
+        """Remember a successful run; the probe is re-read since the action may have changed it."""
+        self.state['keys'][task.name] = key
+        if task.probe is not None:
+            self.state['probes'][task.name] = task.probe()
+
+    def _selected(self, targets):
+        if not targets:
+            return list(self.order)
+        needed, stack = set(), list(targets)
+        while stack:
+            name = stack.pop()
+            if name not in needed:
+                needed.add(name)
+                stack.extend(self.tasks[name].deps)
+        return [name for name in self.order if name in needed]
+
+    def run(self, targets=None, force=False):
+        """Build `targets` (default: all) and their dependencies. Returns {name: 'ran'|'cached'}."""
+        start = time.perf_counter()
+        pending = self._selected(targets)
+        results = {}
+        running = {}
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                while pending or running:
+                    ready = [name for name in pending if all(dep in results for dep in self.tasks[name].deps)]
+                    inline = []
+                    for name in ready:
+                        pending.remove(name)
+                        task = self.tasks[name]
+                        # Dependencies have finished, so their outputs are final when hashed here
+                        key = self.task_key(task)
+                        if not force and self.is_current(task, key):
+                            results[name] = 'cached'
+                            print(f"✅ {name} - up to date")
+                        elif task.main_thread:
+                            inline.append((task, key))
+                        else:
+                            running[pool.submit(self._execute, task)] = (task, key)
+                    # Main-thread tasks run here while the pool works on the others
+                    for task, key in inline:
+                        self._execute(task)
+                        self._record(task, key)
+                        results[task.name] = 'ran'
+                    if not running:
+                        continue
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    failed = [future for future in done if future.exception() is not None]
+                    if failed:
+                        # Let the tasks already running finish so their successes are kept too
+                        done |= wait(running).done
+                    for future in done:
+                        task, key = running.pop(future)
+                        if future.exception() is None:
+                            self._record(task, key)
+                            results[task.name] = 'ran'
+                    if failed:
+                        failed[0].result()
+        finally:
+            self._save_state()  # also on failure: keep the keys of tasks that did succeed
+        ran = sum(1 for status in results.values() if status == 'ran')
+        print(f"🏁 {len(results)} tasks ({ran} ran, {len(results) - ran} cached) "
+              f"in {time.perf_counter() - start:.3f}s")
+        return results
+
+    def _execute(self, task):
+        start = time.perf_counter()
+        task.action()
+        print(f"🔨 {task.name} - built in {time.perf_counter() - start:.2f}s")
+
+
+# =============================================================================
+# THE LAB'S BUILD STEPS (shared by marven.py and Experiment 9's man.py)
+# =============================================================================
+PACKAGES = ('numpy', 'pandas', 'matplotlib')
+
+REQUIREMENTS = """# requirements.txt
+# Project Dependencies
+
+numpy==1.24.3
+pandas==2.0.2
+matplotlib==3.7.1
+"""
+
+
+def setup_py(name, author, description):
+    """setup.py text for a project that depends on PACKAGES."""
+    return f"""from setuptools import setup
+
+setup(
+    name="{name}",
+    version="1.0.0",
+    author="{author}",
+    description="{description}",
+    install_requires={json.dumps(list(PACKAGES))},
+    python_requires=">=3.8",
+)
+"""
+
+
+def installed_versions(packages=PACKAGES):
+    """{package: installed version or None}, read from package metadata without importing."""
+    from importlib import metadata
+    versions = {}
+    for package in packages:
+        try:
+            versions[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            versions[package] = None
+    return versions
+
+
+def build_tasks(write_requirements, write_setup, install, setup_text, wheelhouse=None):
+    """
+    requirements.txt -> install, plus setup.py. The install task is keyed on
+    requirements.txt and the wheelhouse, and its probe re-checks the installed
+    versions, so removing or changing a package makes it run again.
+    """
+    return [
+        Task('requirements', write_requirements, outputs=['requirements.txt'], params=REQUIREMENTS),
+        Task('setup', write_setup, outputs=['setup.py'], params=setup_text),
+        Task('install', lambda: install(wheelhouse), inputs=['requirements.txt'], deps=['requirements'],
+             params={'wheelhouse': wheelhouse}, probe=installed_versions),
+    ]
@@ -0,0 +1,389 @@
+"""
+Experiment 7: Calculator Service
+Objective: Share one Calculator (and its history) between many worker
+processes over an asyncio TCP or Unix socket.
+
+Wire format: every message is a frame of a 4-byte big-endian length followed
+by the payload.
+  request  = !IBI header (request id, opcode, count) + count (a, b) float64 pairs
+  response = !IBI header (request id, status, count) + count float64 results
+             (history: count entries of 4 float64s: op code, a, b, result;
+              error: a UTF-8 message instead of results)
+Clients may pipeline any number of frames without waiting; responses carry
+the request id and come back in order per connection. A single frame can
+hold a whole batch of operand pairs, evaluated in one vectorized call on the
+Experiment 7 backend. Failed elements (division by zero) come back as NaN.
+A malformed request gets an error response (request id 0, which clients
+never use, if the header itself is unreadable). The shared history keeps
+the newest history_capacity entries. When a connection is lost, every request waiting on
+it fails with ConnectionError and the client pool reconnects on next use.
+"""
+
+import argparse
+import asyncio
+import collections
+import contextlib
+import io
+import itertools
+import struct
+import sys
+from array import array
+
+HEADER = struct.Struct('!IBI')
+LENGTH = struct.Struct('!I')
+MAX_FRAME = 64 * 1024 * 1024
+HISTORY_CAPACITY = 100_000  # entries kept by the shared backend (None: unbounded)
+
+OPCODES = {'add': 1, 'subtract': 2, 'multiply': 3, 'divide': 4}
+OP_HISTORY = 10
+OP_PING = 11
+STATUS_OK = 0
+STATUS_ERROR = 1
+
+
+class ServiceError(Exception):
+    """Raised on the client when the server reports an error for a request."""
+
+
+# =============================================================================
+# BACKENDS
+# =============================================================================
+class MarvenBackend:
+    """Experiment 7 Calculator: vectorized batches and columnar history."""
+
+    def __init__(self, history_capacity=HISTORY_CAPACITY):
+        from marven import Calculator, np
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.calc = Calculator(history_capacity=history_capacity)
+        self.np = np
+        self._batch = {'add': self.calc.add_batch, 'subtract': self.calc.subtract_batch,
+                       'multiply': self.calc.multiply_batch, 'divide': self.calc.divide_batch}
+
+    def evaluate(self, op, a, b):
+        return self._batch[op](a, b).astype('<f8', copy=False).tobytes()
+
+    def history(self, limit):
+        # Only the newest `limit` entries are sliced out before stacking
+        ops, a, b, result = self.calc.history.arrays(last=limit)
+        np = self.np
+        codes = np.array([OPCODES[name] for name in self.calc.history.OPERATIONS], dtype=np.float64)[ops]
+        rows = np.column_stack([codes, a, b, result])
+        return len(rows), rows.astype('<f8').tobytes()
+
+
+class CleanBackend:
+    """Experiment 4 Calculator: scalar calls; ValueError results become NaN."""
+
+    def __init__(self, history_capacity=HISTORY_CAPACITY):
+        from lazy_imports import load_experiment_module
+        # clean.py imports its sibling calc_metrics; register that first so
+        # neither module needs Experiment 4 on sys.path
+        load_experiment_module('Experiment 4', 'calc_metrics')
+        self.calc = load_experiment_module('Experiment 4', 'clean', 'exp4_clean').Calculator()
+        # (op code, a, b, result); clean.Calculator keeps no history itself
+        self.entries = collections.deque(maxlen=history_capacity)
+
+    def evaluate(self, op, a, b):
+        method, code = getattr(self.calc, op), OPCODES[op]
+        out = array('d')
+        for x, y in zip(a, b):
+            try:
+                result = method(x, y)
+            except (ValueError, ArithmeticError):
+                result = float('nan')
+            out.append(result)
+            self.entries.append((code, x, y, result))
+        if sys.byteorder != 'little':
+            out.byteswap()
+        return out.tobytes()
+
+    def history(self, limit):
+        rows = list(itertools.islice(reversed(self.entries), limit))[::-1]  # newest `limit`, oldest first
+        flat = array('d', itertools.chain.from_iterable(rows))
+        if sys.byteorder != 'little':
+            flat.byteswap()
+        return len(rows), flat.tobytes()
+
+
+BACKENDS = {'marven': MarvenBackend, 'clean': CleanBackend}
+
+
+# =============================================================================
+# SERVER
+# =============================================================================
+def _operands(payload, count):
+    values = array('d')
+    values.frombytes(payload[:count * 16])
+    if sys.byteorder != 'little':
+        values.byteswap()
+    return values[0::2], values[1::2]
+
+
+async def _read_frame(reader):
+    (length,) = LENGTH.unpack(await reader.readexactly(LENGTH.size))
+    if length > MAX_FRAME:
+        raise ValueError(f"frame of {length} bytes exceeds limit")
+    return await reader.readexactly(length)
+
+
+def _frame(request_id, status, count, body):
+    return LENGTH.pack(HEADER.size + len(body)) + HEADER.pack(request_id, status, count) + body
+
+
+class CalculatorServer:
+    """Serves one shared backend; each connection is processed in request order."""
+
+    def __init__(self, backend='marven', history_capacity=HISTORY_CAPACITY):
+        self.backend = BACKENDS[backend](history_capacity)
+        self.names = {code: op for op, code in OPCODES.items()}
+        self.requests = 0
+
+    def handle(self, frame):
+        self.requests += 1
+        if len(frame) < HEADER.size:
+            # No readable request id: answer with id 0, which clients never use
+            return _frame(0, STATUS_ERROR, 0, f"ValueError: frame of {len(frame)} bytes is shorter "
+                                              f"than the {HEADER.size}-byte header".encode())
+        request_id, opcode, count = HEADER.unpack_from(frame)
+        payload = memoryview(frame)[HEADER.size:]
+        try:
+            if opcode in self.names:
+                if len(payload) != count * 16:
+                    raise ValueError("payload size does not match operand count")
+                a, b = _operands(payload, count)
+                return _frame(request_id, STATUS_OK, count, self.backend.evaluate(self.names[opcode], a, b))
+            if opcode == OP_HISTORY:
+                rows, body = self.backend.history(count)
+                return _frame(request_id, STATUS_OK, rows, body)
+            if opcode == OP_PING:
+                return _frame(request_id, STATUS_OK, 0, b'')
+            raise ValueError(f"unknown opcode {opcode}")
+        except Exception as e:
+            message = f"{type(e).__name__}: {e}".encode()
+            return _frame(request_id, STATUS_ERROR, 0, message)
+
+    async def serve_connection(self, reader, writer):
+        try:
+            while True:
+                frame = await _read_frame(reader)
+                writer.write(self.handle(frame))
+                # Let pipelined frames accumulate, only wait when the buffer is large
+                if writer.transport.get_write_buffer_size() > 1 << 20:
+                    await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host='127.0.0.1', port=0, path=None):
+        """Start listening on a TCP host/port or a Unix socket path."""
+        if path:
+            return await asyncio.start_unix_server(self.serve_connection, path=path)
+        return await asyncio.start_server(self.serve_connection, host, port)
+
+
+# =============================================================================
+# CLIENT
+# =============================================================================
+class _Connection:
+    def __init__(self, reader, writer):
+        self.reader, self.writer = reader, writer
+        self.pending = {}
+        self.error = None  # why the connection died; set once _receive exits
+        self.task = asyncio.ensure_future(self._receive())
+
+    @property
+    def alive(self):
+        return self.error is None and not self.writer.is_closing()
+
+    async def _receive(self):
+        try:
+            while True:
+                frame = await _read_frame(self.reader)
+                if len(frame) < HEADER.size:
+                    raise ValueError(f"frame of {len(frame)} bytes is shorter than the header")
+                request_id, status, count = HEADER.unpack_from(frame)
+                future = self.pending.pop(request_id, None)
+                if future is not None and not future.done():
+                    future.set_result((status, count, frame[HEADER.size:]))
+        except asyncio.CancelledError:
+            self._fail("connection closed")
+            raise
+        except Exception as e:  # lost connection, oversized or malformed frame
+            self._fail(f"connection lost: {type(e).__name__}: {e}")
+
+    def _fail(self, message):
+        """Fail every waiting request; later sends fail immediately."""
+        self.error = message
+        self.writer.close()
+        for future in self.pending.values():
+            if not future.done():
+                future.set_exception(ConnectionError(message))
+        self.pending.clear()
+
+    def send(self, request_id, opcode, count, body):
+        future = asyncio.get_running_loop().create_future()
+        if not self.alive:
+            future.set_exception(ConnectionError(self.error or "connection closed"))
+            return future
+        self.pending[request_id] = future
+        self.writer.write(LENGTH.pack(HEADER.size + len(body)) + HEADER.pack(request_id, opcode, count) + body)
+        return future
+
+    async def close(self):
+        self.writer.close()
+        self.task.cancel()
+        with contextlib.suppress(asyncio.CancelledError, ConnectionError):
+            await self.task
+
+
+class CalculatorClient:
+    """
+    Pooled, pipelining client. Requests are spread round-robin over pool_size
+    connections; a dead connection is replaced by a new one on its next turn.
+    """
+
+    def __init__(self, host='127.0.0.1', port=None, path=None, pool_size=4):
+        self.host, self.port, self.path = host, port, path
+        self.pool_size = pool_size
+        self._pool = []
+        self._next = itertools.cycle(range(pool_size))
+        self._ids = itertools.count()
+
+    async def _open(self):
+        if self.path:
+            reader, writer = await asyncio.open_unix_connection(self.path)
+        else:
+            reader, writer = await asyncio.open_connection(self.host, self.port)
+        return _Connection(reader, writer)
+
+    async def connect(self):
+        for _ in range(self.pool_size):
+            self._pool.append(await self._open())
+        return self
+
+    async def _connection(self):
+        """Next pooled connection, reconnecting it first if it has died."""
+        index = next(self._next)
+        conn = self._pool[index]
+        if conn.alive:
+            return conn
+        fresh = await self._open()
+        if self._pool[index] is not conn:
+            # Another request replaced it while we were connecting
+            await fresh.close()
+            return self._pool[index]
+        self._pool[index] = fresh
+        await conn.close()
+        return fresh
+
+    async def close(self):
+        for conn in self._pool:
+            await conn.close()
+        self._pool.clear()
+
+    async def __aenter__(self):
+        return await self.connect()
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def _request(self, opcode, count, body=b''):
+        conn = await self._connection()
+        request_id = next(self._ids) % 0xFFFFFFFF + 1  # 1 .. 2**32 - 1: id 0 is reserved for the server
+        status, n, payload = await conn.send(request_id, opcode, count, body)
+        if status != STATUS_OK:
+            raise ServiceError(payload.decode(errors='replace'))
+        values = array('d')
+        values.frombytes(payload)
+        if sys.byteorder != 'little':
+            values.byteswap()
+        return n, values
+
+    async def batch(self, op, a, b):
+        """Evaluate many (a, b) pairs in one frame; returns an array('d') of results."""
+        a = a if hasattr(a, '__len__') else list(a)
+        b = b if hasattr(b, '__len__') else list(b)
+        if len(a) != len(b):
+            raise ValueError(f"batch operands differ in length: {len(a)} and {len(b)}")
+        pairs = array('d', itertools.chain.from_iterable(zip(a, b)))
+        if sys.byteorder != 'little':
+            pairs.byteswap()
+        _, values = await self._request(OPCODES[op], len(pairs) // 2, pairs.tobytes())
+        return values
+
+    async def calculate(self, op, a, b):
+        return (await self.batch(op, [a], [b]))[0]
+
+    async def add(self, a, b):
+        return await self.calculate('add', a, b)
+
+    async def subtract(self, a, b):
+        return await self.calculate('subtract', a, b)
+
+    async def multiply(self, a, b):
+        return await self.calculate('multiply', a, b)
+
+    async def divide(self, a, b):
+        return await self.calculate('divide', a, b)
+
+    async def history(self, limit=100):
+        """Return the last `limit` history entries as (op, a, b, result) tuples."""
+        n, values = await self._request(OP_HISTORY, limit)
+        names = {code: op for op, code in OPCODES.items()}
+        return [(names.get(int(values[i]), '?'), values[i + 1], values[i + 2], values[i + 3])
+                for i in range(0, 4 * n, 4)]
+
+    async def ping(self):
+        await self._request(OP_PING, 0)
+
+
+# =============================================================================
+# LOCALHOST DEMO
+# =============================================================================
+async def _demo(backend, history_capacity=HISTORY_CAPACITY):
+    server = CalculatorServer(backend, history_capacity)
+    listener = await server.start('127.0.0.1', 0)
+    port = listener.sockets[0].getsockname()[1]
+    print(f"🌐 {backend} calculator service on 127.0.0.1:{port}")
+
+    async with CalculatorClient(port=port, pool_size=4) as client:
+        print(f"➕ 10 + 5 = {await client.add(10, 5)}")
+        print(f"➗ 1 / 0 = {await client.divide(1, 0)}")
+        # Pipelined: 200 batch frames in flight at once, 1,000 pairs each
+        a, b = list(range(1000)), [2.0] * 1000
+        results = await asyncio.gather(*(client.batch('multiply', a, b) for _ in range(200)))
+        print(f"✖️  {sum(len(r) for r in results):,} multiplications in {len(results)} frames")
+        print(f"📅 Last history entries: {await client.history(3)}")
+
+    listener.close()
+    await listener.wait_closed()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="asyncio Calculator service")
+    parser.add_argument('--backend', choices=sorted(BACKENDS), default='marven')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', help="serve on a Unix socket path instead of TCP")
+    parser.add_argument('--history-capacity', type=int, default=HISTORY_CAPACITY,
+                        help="history entries kept (0: unbounded)")
+    parser.add_argument('--demo', action='store_true', help="run a localhost client/server demo and exit")
+    args = parser.parse_args(argv)
+
+    if args.demo:
+        asyncio.run(_demo(args.backend, args.history_capacity or None))
+        return
+
+    async def serve():
+        server = CalculatorServer(args.backend, args.history_capacity or None)
+        listener = await server.start(args.host, args.port, args.unix)
+        print(f"🌐 Serving {args.backend} calculator on {args.unix or f'{args.host}:{args.port}'}")
+        async with listener:
+            await listener.serve_forever()
+
+    asyncio.run(serve())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Experiment 7: Build Tools & Dependency Management
+Shared import helpers for the lab scripts (marven.py, Experiment 9's man.py).
+
+LazyModule defers importing a heavy library until it is first used,
+is_installed() checks a dependency without importing it, and
+load_experiment_module() imports a module from another Experiment folder by
+path without changing sys.path.
+"""
+
+import importlib
+import importlib.util
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+
+class LazyModule:
+    """Stand-in for a module that is imported on first attribute access."""
+
+    import_times = {}  # module name -> seconds spent importing it
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            start = time.perf_counter()
+            self._module = importlib.import_module(self._name)
+            LazyModule.import_times[self._name] = time.perf_counter() - start
+        return getattr(self._module, attr)
+
+
+def is_installed(package):
+    """Check a dependency through its package metadata instead of importing it."""
+    from importlib import metadata  # ~30 ms, so only paid when a check is made
+    try:
+        metadata.version(package)
+        return True
+    except metadata.PackageNotFoundError:
+        return False
+
+
+def print_import_report():
+    """Show which heavy modules were loaded during this run and what they cost."""
+    print("\n⏱️  Import-time report (lazy modules):")
+    if not LazyModule.import_times:
+        print("   (no heavy modules were imported)")
+    for name, seconds in sorted(LazyModule.import_times.items(), key=lambda item: -item[1]):
+        print(f"   {name:<20} {seconds * 1000:8.1f} ms")
+    script = os.path.basename(sys.argv[0]) or 'script.py'
+    print(f"   Tip: python -X importtime {script} gives a full per-module breakdown")
+
+
+def load_experiment_module(experiment, name, alias=None):
+    """
+    Import `name`.py from the folder `experiment` (e.g. 'Experiment 4') once.
+    The module is registered in sys.modules as `alias` (default: name), so
+    later plain imports of that name get the same module.
+    """
+    alias = alias or name
+    path = os.path.abspath(os.path.join(ROOT, experiment, name + '.py'))
+    module = sys.modules.get(alias)
+    if module is not None and os.path.abspath(getattr(module, '__file__', '') or '') == path:
+        return module
+    spec = importlib.util.spec_from_file_location(alias, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[alias] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[alias]
+        raise
+    return module
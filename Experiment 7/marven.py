@@ -1,184 +1,552 @@
+"""
+Experiment 7: Build Tools & Dependency Management
+Objective: Automate project configuration and dependency installation, then
+use the installed libraries (NumPy, pandas, matplotlib) in a Calculator.
+
+The heavy libraries are imported lazily: basic arithmetic and the build
+steps never pay their import cost. Run with --import-report to see how long
+each lazily loaded module took.
+"""
+
 import subprocess
 import sys
 import os
 
-print("=" * 70)
-print("🧪 EXPERIMENT 7: BUILD TOOLS - COMPLETE DEMONSTRATION")
-print("=" * 70)
+from lazy_imports import LazyModule, is_installed, load_experiment_module, print_import_report
 
-# ==============================================================
-# STEP 1: CREATE requirements.txt
-# ==============================================================
-print("\n" + "=" * 70)
-print("📝 STEP 1: Creating requirements.txt")
-print("=" * 70)
+# Optional instrumentation is shared with Experiment 4 (calc_metrics.MetricsMixin)
+calc_metrics = load_experiment_module('Experiment 4', 'calc_metrics')
 
-requirements_content = """# requirements.txt
-# Project Dependencies
+np = LazyModule('numpy')
+pd = LazyModule('pandas')
+plt = LazyModule('matplotlib.pyplot')
 
-numpy==1.24.3
-pandas==2.0.2
-matplotlib==3.7.1
-"""
 
-with open('requirements.txt', 'w') as f:
-    f.write(requirements_content)
+# ==============================================================
+# STEP 1: CREATE requirements.txt
+# ==============================================================
+# The pinned requirements, setup.py template and task graph are shared with
+# Experiment 9's man.py and live in build_runner.py
+def create_requirements():
+    print("\n" + "=" * 70)
+    print("📝 STEP 1: Creating requirements.txt")
+    print("=" * 70)
+
+    from build_runner import REQUIREMENTS, write_if_changed
+    if write_if_changed('requirements.txt', REQUIREMENTS):
+        print("✅ requirements.txt created")
+    else:
+        print("✅ requirements.txt unchanged (not rewritten)")
+    print("\n📄 Content:")
+    print(REQUIREMENTS)
 
-print("✅ requirements.txt created")
-print("\n📄 Content:")
-print(requirements_content)
 
 # ==============================================================
 # STEP 2: CREATE setup.py
 # ==============================================================
-print("\n" + "=" * 70)
-print("⚙️ STEP 2: Creating setup.py")
-print("=" * 70)
-
-setup_content = """from setuptools import setup
-
-setup(
-    name="calculator-project",
-    version="1.0.0",
-    author="Your Name",
-    description="Calculator with build automation",
-    install_requires=["numpy", "pandas", "matplotlib"],
-    python_requires=">=3.8",
-)
-"""
+PROJECT = {'name': "calculator-project", 'author': "Your Name",
+           'description': "Calculator with build automation"}
+
 
-with open('setup.py', 'w') as f:
-    f.write(setup_content)
+def create_setup():
+    print("\n" + "=" * 70)
+    print("⚙️ STEP 2: Creating setup.py")
+    print("=" * 70)
+
+    from build_runner import setup_py, write_if_changed
+    if write_if_changed('setup.py', setup_py(**PROJECT)):
+        print("✅ setup.py created")
+    else:
+        print("✅ setup.py unchanged (not rewritten)")
+    print("\n📋 Configuration:")
+    print("   Package: calculator-project v1.0.0")
+    print("   Dependencies: numpy, pandas, matplotlib")
+    print("   Python: >=3.8")
 
-print("✅ setup.py created")
-print("\n📋 Configuration:")
-print("   Package: calculator-project v1.0.0")
-print("   Dependencies: numpy, pandas, matplotlib")
-print("   Python: >=3.8")
 
 # ==============================================================
 # STEP 3: INSTALL DEPENDENCIES
 # ==============================================================
-print("\n" + "=" * 70)
-print("📦 STEP 3: Installing Dependencies")
-print("=" * 70)
-
-packages = ['numpy', 'pandas', 'matplotlib']
-for package in packages:
-    try:
-        __import__(package)
-        print(f"✅ {package} - Already installed")
-    except ImportError:
-        print(f"⏳ Installing {package}...")
-        subprocess.check_call([sys.executable, "-m", "pip", "install", package, "--quiet"])
-        print(f"✅ {package} - Installed successfully")
+def install_dependencies(wheelhouse=None):
+    print("\n" + "=" * 70)
+    print("📦 STEP 3: Installing Dependencies")
+    print("=" * 70)
+
+    # Offline mode: one hash-locked batch install from a local wheelhouse
+    if wheelhouse:
+        from offline_install import install_requirements
+        install_requirements('requirements.txt', wheelhouse)
+        return
+
+    from build_runner import PACKAGES
+    for package in PACKAGES:
+        if is_installed(package):
+            print(f"✅ {package} - Already installed")
+        else:
+            print(f"⏳ Installing {package}...")
+            subprocess.check_call([sys.executable, "-m", "pip", "install", package, "--quiet"])
+            print(f"✅ {package} - Installed successfully")
+
 
 # ==============================================================
 # STEP 4: CALCULATOR APPLICATION
 # ==============================================================
-print("\n" + "=" * 70)
-print("🔢 STEP 4: Calculator Application")
-print("=" * 70)
-
-import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
-
-class Calculator:
+def downsample_minmax(x, y, max_points):
+    """Keep the min and max of each of max_points // 2 equal-width bins (one per pixel column)."""
+    bins = max(max_points // 2, 1)
+    starts = np.linspace(0, len(y), bins, endpoint=False).astype(np.intp)
+    starts = np.unique(starts)
+    lows = np.minimum.reduceat(y, starts)
+    highs = np.maximum.reduceat(y, starts)
+    xs = np.repeat(x[starts], 2)
+    ys = np.column_stack([lows, highs]).ravel()
+    return xs, ys
+
+
+def downsample_lttb(x, y, max_points):
+    """Largest-Triangle-Three-Buckets: keep max_points points that preserve the visual shape."""
+    n = len(y)
+    if max_points >= n or max_points < 3:
+        return x, y
+    edges = np.linspace(1, n - 1, max_points - 1).astype(np.intp)
+    keep = np.empty(max_points, dtype=np.intp)
+    keep[0], keep[-1] = 0, n - 1
+    previous = 0
+    for i in range(max_points - 2):
+        lo, hi = edges[i], max(edges[i + 1], edges[i] + 1)
+        # Average of the next bucket is the third triangle vertex
+        nlo, nhi = hi, max(edges[i + 2] if i + 2 < len(edges) else n, hi + 1)
+        avg_x, avg_y = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+        px, py = x[previous], y[previous]
+        areas = np.abs((px - avg_x) * (y[lo:hi] - py) - (px - x[lo:hi]) * (avg_y - py))
+        previous = lo + int(np.argmax(areas))
+        keep[i + 1] = previous
+    return x[keep], y[keep]
+
+
+class HistoryStore:
+    """Columnar calculation history: op-code + operand + float64 result arrays.
+
+    With a capacity the store is a ring buffer that evicts the oldest entries;
+    without one it grows by doubling. Scalar appends are buffered in a small
+    list and written in bulk, so basic arithmetic does not import NumPy.
+    """
+
+    OPERATIONS = ('add', 'subtract', 'multiply', 'divide')
+
+    def __init__(self, capacity=None, initial_size=1024, buffer_size=1024):
+        if capacity is not None and capacity <= 0:
+            raise ValueError("capacity must be a positive integer")
+        self.capacity = capacity
+        self.buffer_size = buffer_size
+        self._size = capacity if capacity is not None else initial_size
+        self._codes = {op: i for i, op in enumerate(self.OPERATIONS)}
+        self._op = self._a = self._b = self._result = None  # allocated on first flush
+        self._pending = []  # buffered scalar appends: (code, a, b, result)
+        self._start = 0     # index of the oldest entry (ring buffer only)
+        self._len = 0
+
+    def __len__(self):
+        n = self._len + len(self._pending)
+        return n if self.capacity is None else min(n, self.capacity)
+
+    def _columns(self):
+        if self._op is None:
+            self._op = np.empty(self._size, dtype=np.int8)
+            self._a = np.empty(self._size, dtype=np.float64)
+            self._b = np.empty(self._size, dtype=np.float64)
+            self._result = np.empty(self._size, dtype=np.float64)
+        return (self._op, self._a, self._b, self._result)
+
+    def _flush(self):
+        """Move buffered scalar appends into the column arrays in one write."""
+        if not self._pending:
+            return
+        rows = np.array(self._pending, dtype=np.float64)
+        self._pending = []
+        self._write(rows[:, 0].astype(np.int8), rows[:, 1], rows[:, 2], rows[:, 3])
+
+    def _grow(self, needed):
+        size = len(self._columns()[0])
+        while size < needed:
+            size *= 2
+        self._op, self._a, self._b, self._result = (
+            np.resize(col, size) for col in self._columns())
+
+    def append(self, operation, a, b, result):
+        """Record one scalar operation."""
+        self._pending.append((self._codes[operation], a, b, result))
+        if len(self._pending) >= self.buffer_size:
+            self._flush()
+
+    def extend(self, operation, a, b, result):
+        """Record a batch of results for one operation in a single vectorized write."""
+        self._flush()
+        result = np.asarray(result, dtype=np.float64).ravel()
+        a = np.broadcast_to(np.asarray(a, dtype=np.float64), result.shape).ravel()
+        b = np.broadcast_to(np.asarray(b, dtype=np.float64), result.shape).ravel()
+        self._write(self._codes[operation], a, b, result)
+
+    def _write(self, op, a, b, result):
+        n = result.size
+        values = (op, a, b, result)
+        self._columns()
+
+        if self.capacity is None:
+            if self._len + n > len(self._op):
+                self._grow(self._len + n)
+            for col, val in zip(self._columns(), values):
+                col[self._len:self._len + n] = val
+            self._len += n
+            return
+
+        cap = self.capacity
+        if n >= cap:
+            # Only the newest `cap` entries survive
+            for col, val in zip(self._columns(), values):
+                col[:] = val if np.ndim(val) == 0 else val[n - cap:]
+            self._start, self._len = 0, cap
+            return
+        pos = (self._start + self._len) % cap
+        first = min(n, cap - pos)
+        for col, val in zip(self._columns(), values):
+            if np.ndim(val) == 0:
+                col[pos:pos + first] = val
+                col[:n - first] = val
+            else:
+                col[pos:pos + first] = val[:first]
+                col[:n - first] = val[first:]
+        overflow = max(0, self._len + n - cap)
+        self._start = (self._start + overflow) % cap
+        self._len = min(cap, self._len + n)
+
+    def _ordered(self, last=None):
+        """Columns oldest-first (only the newest `last` entries if given): views
+        for an unbounded store, copies of a ring buffer."""
+        self._flush()
+        self._columns()
+        n = self._len if last is None else max(0, min(last, self._len))
+        if self.capacity is None:
+            return tuple(col[self._len - n:self._len] for col in self._columns())
+        # The selected entries run from `first` to the end, then wrap to the front
+        first = (self._start + self._len - n) % self.capacity
+        end = min(first + n, self.capacity)
+        wrapped = n - (end - first)
+        return tuple(np.concatenate((col[first:end], col[:wrapped])) for col in self._columns())
+
+    def arrays(self, last=None):
+        """
+        Return (op_codes, a, b, result) in chronological order, or only the
+        newest `last` entries (nothing older is copied).
+        A bounded store returns copies (later writes reuse its slots); an
+        unbounded one returns read-only views, which later appends never touch.
+        """
+        columns = self._ordered(last)
+        if self.capacity is None:
+            for col in columns:
+                col.flags.writeable = False
+        return columns
+
+    def to_dataframe(self):
+        """
+        Wrap the history in a DataFrame that later operations never change.
+        An unbounded store shares its columns without copying (appends only
+        write past the end); a ring buffer reuses slots, so it gets a copy.
+        """
+        op, a, b, result = self._ordered()
+        return pd.DataFrame({
+            'operation': pd.Categorical.from_codes(op, categories=self.OPERATIONS),
+            'a': a,
+            'b': b,
+            'result': result,
+        }, copy=False)
+
+    def clear(self):
+        # Fresh columns: views handed out by arrays() keep their data
+        self._op = self._a = self._b = self._result = None
+        self._pending = []
+        self._start = 0
+        self._len = 0
+
+
+class RunningStats:
+    """
+    Streaming count/mean/variance (Welford). O(1) per value or per batch and
+    mergeable: accumulators filled on separate threads or processes combine
+    exactly with merge() (Chan et al.), without re-reading the data.
+    """
+
+    __slots__ = ('count', 'mean', '_m2')
+
+    def __init__(self, values=None):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0  # sum of squared deviations from the mean
+        if values is not None:
+            self.update_batch(values)
+
+    def update(self, x):
+        """Add one value (pure Python, no NumPy import)."""
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (x - self.mean)
+        return self
+
+    def update_batch(self, values):
+        """Add a whole batch with one vectorized pass, then merge it in."""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        if values.size:
+            mean = float(values.mean())
+            self._combine(values.size, mean, float(np.square(values - mean).sum()))
+        return self
+
+    def merge(self, other):
+        """Fold another accumulator into this one (in place)."""
+        if other.count:
+            self._combine(other.count, other.mean, other._m2)
+        return self
+
+    def _combine(self, count, mean, m2):
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self._m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+
+    def __add__(self, other):
+        return self.copy().merge(other)
+
+    def copy(self):
+        clone = RunningStats()
+        clone.count, clone.mean, clone._m2 = self.count, self.mean, self._m2
+        return clone
+
+    def __getstate__(self):
+        return self.count, self.mean, self._m2
+
+    def __setstate__(self, state):
+        self.count, self.mean, self._m2 = state
+
+    def variance(self, ddof=0):
+        """Population variance by default, like np.var."""
+        return self._m2 / (self.count - ddof) if self.count > ddof else float('nan')
+
+    def std(self, ddof=0):
+        return self.variance(ddof) ** 0.5
+
+    def __repr__(self):
+        return f"RunningStats(count={self.count}, mean={self.mean:.6g}, std={self.std():.6g})"
+
+
+class Calculator(calc_metrics.MetricsMixin):
     """Professional Calculator with Dependencies"""
     
-    def __init__(self):
+    def __init__(self, history_capacity=None):
         self.version = "1.0.0"
-        self.history = []
+        self.history = HistoryStore(capacity=history_capacity)
         print(f"Calculator v{self.version} initialized")
 
     def add(self, a, b):
         result = a + b
-        self.history.append({'operation': 'add', 'result': result})
+        self.history.append('add', a, b, result)
         return result
 
     def subtract(self, a, b):
         result = a - b
-        self.history.append({'operation': 'subtract', 'result': result})
+        self.history.append('subtract', a, b, result)
         return result
 
     def multiply(self, a, b):
         result = a * b
-        self.history.append({'operation': 'multiply', 'result': result})
+        self.history.append('multiply', a, b, result)
         return result
 
     def divide(self, a, b):
         if b == 0: return "Error"
         result = a / b
-        self.history.append({'operation': 'divide', 'result': result})
+        self.history.append('divide', a, b, result)
+        return result
+
+    # --- Batch (vectorized) operations ---
+    def _batch(self, operation, ufunc, a, b):
+        a = np.asarray(a, dtype=np.float64)
+        b = np.asarray(b, dtype=np.float64)
+        result = ufunc(a, b)
+        self.history.extend(operation, a, b, result)
+        return result
+
+    def add_batch(self, a, b):
+        """Element-wise a + b over arrays/sequences, recorded in one history write."""
+        return self._batch('add', np.add, a, b)
+
+    def subtract_batch(self, a, b):
+        """Element-wise a - b over arrays/sequences, recorded in one history write."""
+        return self._batch('subtract', np.subtract, a, b)
+
+    def multiply_batch(self, a, b):
+        """Element-wise a * b over arrays/sequences, recorded in one history write."""
+        return self._batch('multiply', np.multiply, a, b)
+
+    def divide_batch(self, a, b, masked=False):
+        """Element-wise a / b. Zero divisors give NaN, or a masked entry if masked=True."""
+        a = np.asarray(a, dtype=np.float64)
+        b = np.asarray(b, dtype=np.float64)
+        zero = b == 0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            result = np.divide(a, b)
+        result = np.where(zero, np.nan, result)
+        self.history.extend('divide', a, b, result)
+        if masked:
+            result = np.ma.masked_array(result, mask=np.broadcast_to(zero, result.shape))
         return result
 
+    # --- Optional instrumentation (enable_metrics/disable_metrics from MetricsMixin) ---
+    METRIC_OPERATIONS = tuple(name for op in HistoryStore.OPERATIONS for name in (op, op + '_batch'))
+
+    def metric_error_counters(self):
+        # divide() returns an error string and divide_batch() NaNs instead of raising
+        return {'divide': lambda result: isinstance(result, str),
+                'divide_batch': lambda result: int(np.count_nonzero(np.isnan(result)))}
+
     def calculate_mean(self, data):
+        """Mean of a sequence/array, or the live mean of a RunningStats accumulator."""
+        if isinstance(data, RunningStats):
+            return data.mean
         return np.mean(data)
 
     def calculate_std(self, data):
+        """Population std of a sequence/array, or of a RunningStats accumulator."""
+        if isinstance(data, RunningStats):
+            return data.std()
         return np.std(data)
 
+    def running_stats(self, values=None):
+        """New mergeable accumulator, optionally seeded with a first batch."""
+        return RunningStats(values)
+
     def get_history_df(self):
-        return pd.DataFrame(self.history)
-
-    def plot_results(self):
-        """Using Matplotlib dependency"""
-        df = self.get_history_df()
-        plt.figure(figsize=(10, 4))
-        plt.plot(df.index, df['result'], marker='o', linewidth=2)
-        plt.xlabel('Operation')
-        plt.ylabel('Result')
-        plt.title('Calculator Results')
-        plt.grid(True, alpha=0.3)
-        plt.tight_layout()
+        return self.history.to_dataframe()
+
+    def plot_results(self, path=None, max_points=2000, method='minmax'):
+        """
+        Plot the result history with matplotlib.
+        Histories longer than max_points are downsampled ('minmax' per pixel
+        column or 'lttb'). With a path the figure is written to that file on a
+        non-interactive canvas instead of blocking in plt.show().
+        """
+        op, a, b, result = self.history.arrays()
+        x = np.arange(len(result))
+        finite = np.isfinite(result)
+        if not finite.all():  # failed divisions are NaN
+            x, result = x[finite], result[finite]
+        if len(result) > max_points:
+            downsample = downsample_lttb if method == 'lttb' else downsample_minmax
+            x, result = downsample(x, result, max_points)
+        style = {'marker': 'o'} if len(result) <= 200 else {}
+
+        if path:
+            from matplotlib.figure import Figure
+            fig = Figure(figsize=(10, 4))
+            ax = fig.add_subplot()
+        else:
+            fig, ax = plt.subplots(figsize=(10, 4))
+        ax.plot(x, result, linewidth=2 if style else 1, **style)
+        ax.set_xlabel('Operation')
+        ax.set_ylabel('Result')
+        ax.set_title('Calculator Results')
+        ax.grid(True, alpha=0.3)
+        fig.tight_layout()
+        if path:
+            fig.savefig(path)
+            return path
         plt.show()
 
+
 # ==============================================================
 # STEP 5: TEST CALCULATOR
 # ==============================================================
-print("\n" + "=" * 70)
-print("🧪 STEP 5: Testing Calculator")
-print("=" * 70)
+def run_calculator_demo():
+    print("\n" + "=" * 70)
+    print("🧪 STEP 5: Testing Calculator")
+    print("=" * 70)
 
-calc = Calculator()
+    calc = Calculator()
 
-print("\n📊 Basic Operations:")
-print(f"➕ 10 + 5 = {calc.add(10, 5)}")
-print(f"➖ 20 - 8 = {calc.subtract(20, 8)}")
-print(f"✖️ 6 * 7 = {calc.multiply(6, 7)}")
-print(f"➗ 100 / 4 = {calc.divide(100, 4)}")
+    print("\n📊 Basic Operations:")
+    print(f"➕ 10 + 5 = {calc.add(10, 5)}")
+    print(f"➖ 20 - 8 = {calc.subtract(20, 8)}")
+    print(f"✖️ 6 * 7 = {calc.multiply(6, 7)}")
+    print(f"➗ 100 / 4 = {calc.divide(100, 4)}")
 
-print("\n📈 Advanced Operations (Using NumPy):")
-numbers = [10, 20, 30, 40, 50]
-print(f"Numbers: {numbers}")
-print(f"Mean: {calc.calculate_mean(numbers):.2f}")
-print(f"Std Dev: {calc.calculate_std(numbers):.2f}")
+    print("\n📦 Batch Operations (Vectorized with NumPy):")
+    print(f"➕ [1, 2, 3] + [4, 5, 6] = {calc.add_batch([1, 2, 3], [4, 5, 6])}")
+    print(f"➗ [10, 20, 30] / [2, 0, 5] = {calc.divide_batch([10, 20, 30], [2, 0, 5])}")
 
-print("\n📅 History (Using Pandas):")
-print(calc.get_history_df())
+    print("\n📈 Advanced Operations (Using NumPy):")
+    numbers = [10, 20, 30, 40, 50]
+    print(f"Numbers: {numbers}")
+    print(f"Mean: {calc.calculate_mean(numbers):.2f}")
+    print(f"Std Dev: {calc.calculate_std(numbers):.2f}")
+    stream = calc.running_stats(numbers[:2]).merge(calc.running_stats(numbers[2:]))
+    stream.update(60)
+    print(f"Streaming (two merged shards + 60): {stream}")
+
+    print("\n📅 History (Using Pandas):")
+    print(calc.get_history_df())
+
+    print("\n📈 Visualization (Using matplotlib):")
+    calc.plot_results()
 
-print("\n📈 Visualization (Using matplotlib):")
-calc.plot_results()
 
 # ==============================================================
 # STEP 6: BUILD COMMANDS INFO
 # ==============================================================
-print("\n" + "=" * 70)
-print("🛠️ STEP 6: Build Commands")
-print("=" * 70)
-
-print("\n📁 Files Created:")
-for file in ['requirements.txt', 'setup.py']:
-    if os.path.exists(file):
-        print(f"   ✅ {file}")
-
-print("\n🔨 Common Build Commands:")
-print("   1. pip install -r requirements.txt  -> Install dependencies")
-print("   2. pip install -e .                 -> Install in dev mode")
-print("   3. python setup.py sdist            -> Create distribution")
-print("   4. pip install .                    -> Install package")
-
-print("\n" + "=" * 70)
-print("✅ EXPERIMENT COMPLETE - SUMMARY")
-print("=" * 70)
\ No newline at end of file
+def show_build_commands():
+    print("\n" + "=" * 70)
+    print("🛠️ STEP 6: Build Commands")
+    print("=" * 70)
+
+    print("\n📁 Files Created:")
+    for file in ['requirements.txt', 'setup.py']:
+        if os.path.exists(file):
+            print(f"   ✅ {file}")
+
+    print("\n🔨 Common Build Commands:")
+    print("   1. pip install -r requirements.txt  -> Install dependencies")
+    print("   2. pip install -e .                 -> Install in dev mode")
+    print("   3. python setup.py sdist            -> Create distribution")
+    print("   4. pip install .                    -> Install package")
+
+
+def run_build_steps(wheelhouse=None, force=False):
+    """Steps 1-3 as cached build tasks: unchanged inputs skip the step entirely."""
+    from build_runner import BuildRunner, build_tasks, setup_py
+    tasks = build_tasks(create_requirements, create_setup, install_dependencies, setup_py(**PROJECT), wheelhouse)
+    return BuildRunner(tasks).run(force=force)
+
+
+def main():
+    print("=" * 70)
+    print("🧪 EXPERIMENT 7: BUILD TOOLS - COMPLETE DEMONSTRATION")
+    print("=" * 70)
+
+    run_build_steps(os.environ.get('WHEELHOUSE'), force='--force' in sys.argv)
+
+    print("\n" + "=" * 70)
+    print("🔢 STEP 4: Calculator Application")
+    print("=" * 70)
+
+    run_calculator_demo()
+    show_build_commands()
+
+    print("\n" + "=" * 70)
+    print("✅ EXPERIMENT COMPLETE - SUMMARY")
+    print("=" * 70)
+
+    if '--import-report' in sys.argv:
+        print_import_report()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+Experiment 7: Offline, Hash-Locked Dependency Installation
+Objective: Install everything in requirements.txt from a local wheelhouse in
+one pip call and record a lockfile, so repeated setups on machines without
+network access are skipped when nothing changed.
+
+The lockfile (JSON) stores the sha256 of requirements.txt, a stamp of the
+wheelhouse listing and interpreter, and the name, version and sha256 of every
+installed wheel. Before installing, every wheel with a known digest (from the
+lock or from --hash options in requirements.txt) is verified, so a replaced
+or corrupted wheel is rejected instead of installed.
+"""
+
+import hashlib
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+from importlib import metadata
+
+LOCK_VERSION = 1
+
+
+def normalize(name):
+    """PEP 503 name normalization (e.g. 'Python_Dateutil' -> 'python-dateutil')."""
+    return re.sub(r'[-_.]+', '-', name).lower()
+
+
+def _requirement_lines(path):
+    """Requirement lines with comments removed and backslash continuations joined."""
+    with open(path) as f:
+        text = f.read().replace('\\\n', ' ')
+    for line in text.splitlines():
+        line = line.split('#', 1)[0].strip()
+        if line and not line.startswith('-'):
+            yield line
+
+
+def parse_requirements(path):
+    """Return [(normalized name, pinned version or None)] from a requirements file."""
+    requirements = []
+    for line in _requirement_lines(path):
+        match = re.match(r'^([A-Za-z0-9][A-Za-z0-9._-]*)\s*(?:==\s*([^\s;,]+))?', line)
+        if match:
+            requirements.append((normalize(match.group(1)), match.group(2)))
+    return requirements
+
+
+def expected_hashes(requirements_path, lockfile):
+    """(name, version) -> allowed sha256 digests: --hash options, else the previous lock."""
+    expected = {}
+    for line in _requirement_lines(requirements_path):
+        match = re.match(r'^([A-Za-z0-9][A-Za-z0-9._-]*)\s*==\s*([^\s;,]+)', line)
+        if match:
+            for digest in re.findall(r'--hash[=\s]sha256:([0-9a-fA-F]{64})', line):
+                expected.setdefault((normalize(match.group(1)), match.group(2)), set()).add(digest.lower())
+    try:
+        with open(lockfile) as f:
+            packages = json.load(f).get('packages', [])
+    except (OSError, ValueError):
+        packages = []
+    for entry in packages:
+        expected.setdefault((entry['name'], entry['version']), {entry['sha256']})
+    return expected
+
+
+def verify_wheels(wheels, expected):
+    """Check the sha256 of every wheel with a known digest. Returns the list of mismatches."""
+    mismatches = []
+    for key, digests in expected.items():
+        path = wheels.get(key)
+        if path is not None and file_sha256(path) not in digests:
+            mismatches.append(f"{os.path.basename(path)} (sha256 does not match)")
+    return mismatches
+
+
+def scan_wheelhouse(wheelhouse):
+    """Map (name, version) -> wheel path for every wheel in the directory."""
+    wheels = {}
+    for filename in sorted(os.listdir(wheelhouse)):
+        if filename.endswith('.whl'):
+            name, version = filename.split('-')[:2]
+            wheels[(normalize(name), version)] = os.path.join(wheelhouse, filename)
+    return wheels
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def environment_stamp(requirements_path, wheelhouse):
+    """Cheap fingerprint of the inputs: requirements content, wheel listing, interpreter."""
+    digest = hashlib.sha256()
+    with open(requirements_path, 'rb') as f:
+        digest.update(f.read())
+    for filename in sorted(os.listdir(wheelhouse)):
+        stat = os.stat(os.path.join(wheelhouse, filename))
+        digest.update(f"{filename}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+    digest.update(f"{sys.version}|{platform.platform()}".encode())
+    return digest.hexdigest()
+
+
+def lock_is_current(lockfile, stamp):
+    """True when the lock matches `stamp` and every locked package is installed at its version."""
+    try:
+        with open(lockfile) as f:
+            lock = json.load(f)
+    except (OSError, ValueError):
+        return False
+    if lock.get('version') != LOCK_VERSION or lock.get('stamp') != stamp:
+        return False
+    for entry in lock.get('packages', []):
+        try:
+            if metadata.version(entry['name']) != entry['version']:
+                return False
+        except metadata.PackageNotFoundError:
+            return False
+    return True
+
+
+def resolve(requirements, wheels):
+    """Check every requirement against the wheelhouse at once. Returns the list of problems."""
+    available = {}
+    for name, version in wheels:
+        available.setdefault(name, []).append(version)
+    missing = []
+    for name, version in requirements:
+        if name not in available:
+            missing.append(f"{name} (no wheel)")
+        elif version is not None and version not in available[name]:
+            missing.append(f"{name}=={version} (wheelhouse has {', '.join(available[name])})")
+    return missing
+
+
+def install_requirements(requirements_path='requirements.txt', wheelhouse='wheelhouse',
+                         lockfile='requirements.lock', force=False):
+    """
+    Install requirements_path from `wheelhouse` without network access.
+    Returns False when the lock was current and the step was skipped, True after installing.
+    """
+    stamp = environment_stamp(requirements_path, wheelhouse)
+    if not force and lock_is_current(lockfile, stamp):
+        print(f"✅ Lock {lockfile} is current - skipping installation")
+        return False
+
+    requirements = parse_requirements(requirements_path)
+    wheels = scan_wheelhouse(wheelhouse)
+    missing = resolve(requirements, wheels)
+    if missing:
+        raise RuntimeError("Wheelhouse cannot satisfy: " + "; ".join(missing))
+    expected = expected_hashes(requirements_path, lockfile)
+    mismatches = verify_wheels(wheels, expected)
+    if mismatches:
+        raise RuntimeError("Refusing to install modified wheels: " + "; ".join(mismatches)
+                           + f" (fix the --hash pins, or delete {lockfile} to accept rebuilt wheels)")
+
+    print(f"⏳ Installing {len(requirements)} requirements from {wheelhouse} (offline, one batch)...")
+    command = [sys.executable, "-m", "pip", "install", "--quiet",
+               "--no-index", "--find-links", wheelhouse, "-r", requirements_path]
+    if any('--hash' in line for line in _requirement_lines(requirements_path)):
+        command.append('--require-hashes')  # pip then checks every package it installs
+    subprocess.check_call(command)
+
+    # Lock every wheelhouse package that ended up installed (direct and transitive)
+    packages = []
+    for (name, version), path in wheels.items():
+        try:
+            installed = metadata.version(name)
+        except metadata.PackageNotFoundError:
+            continue
+        if installed == version:
+            packages.append({'name': name, 'version': version,
+                             'wheel': os.path.basename(path), 'sha256': file_sha256(path)})
+
+    with open(requirements_path, 'rb') as f:
+        requirements_hash = hashlib.sha256(f.read()).hexdigest()
+    lock = {'version': LOCK_VERSION, 'stamp': stamp,
+            'requirements_sha256': requirements_hash, 'packages': packages}
+    tmp = lockfile + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(lock, f, indent=2)
+    os.replace(tmp, lockfile)
+    print(f"✅ Installed and locked {len(packages)} packages in {lockfile}")
+    return True
+
+
+if __name__ == "__main__":
+    install_requirements(*sys.argv[1:4])
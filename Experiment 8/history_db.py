@@ -0,0 +1,289 @@
+"""
+Experiment 8: Persistent Calculation History
+Objective: Store calculations as fixed-width binary records in an append-only,
+memory-mapped file so time-range and per-operator queries do not have to
+re-parse a free-text log such as calc_history.txt.
+"""
+
+import argparse
+import mmap
+import os
+import re
+import struct
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+
+MAGIC = b'CALCHIST'
+VERSION = 1
+HEADER = struct.Struct('<8sII')          # magic, version, record size
+RECORD = struct.Struct('<dBxxxxxxxddd')  # timestamp, op (ord), pad, a, b, result
+INDEX_HEADER = struct.Struct('<8sQII')   # magic, records indexed, block size, op count
+INDEX_MAGIC = b'CALCIDX1'
+
+# Matches lines such as "2026-01-28 17:24:59.630650: 1.0 - 2.0 = -1.0"
+TEXT_LINE = re.compile(r'^(?P<ts>.+?): (?P<a>\S+) (?P<op>[-+*/%^]) (?P<b>\S+) = (?P<result>\S+)$')
+
+
+class HistoryDB:
+    """Append-only calculation history with a sparse time index and per-operator index.
+
+    Records live in `path`; the indexes are kept in memory, saved to
+    `path + '.idx'` on flush/close and caught up incrementally on open.
+    """
+
+    def __init__(self, path, block_size=256):
+        self.path = path
+        self.index_path = path + '.idx'
+        self.block_size = block_size
+
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            with open(path, 'wb') as f:
+                f.write(HEADER.pack(MAGIC, VERSION, RECORD.size))
+        with open(path, 'rb') as f:
+            header = f.read(HEADER.size)
+        if len(header) < HEADER.size:
+            raise ValueError(f"{path} is too short to be a calculation history file")
+        magic, version, record_size = HEADER.unpack(header)
+        if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+            raise ValueError(f"{path} is not a version {VERSION} calculation history file")
+
+        self._count = (os.path.getsize(path) - HEADER.size) // RECORD.size
+        end = HEADER.size + self._count * RECORD.size
+        if os.path.getsize(path) > end:
+            # Torn tail from an interrupted append: drop it so new records stay aligned
+            os.truncate(path, end)
+        self._writer = open(path, 'ab')
+        self._mm = None
+        self._mapped = 0
+
+        # Sparse time index: (min, max) timestamp of every complete block
+        self._block_min = array('d')
+        self._block_max = array('d')
+        self._blocks_sorted = True  # both arrays non-decreasing, so they can be bisected
+        # Per-operator index: op char -> record numbers
+        self._by_op = {}
+        self._indexed = 0
+        self._load_index()
+        self._catch_up()
+
+    # --- Context manager support ---
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self._count
+
+    # --- Writing ---
+    def append(self, op, a, b, result, timestamp=None):
+        """Append one calculation; the timestamp defaults to now."""
+        if timestamp is None:
+            timestamp = datetime.now().timestamp()
+        elif isinstance(timestamp, datetime):
+            timestamp = timestamp.timestamp()
+        self._writer.write(RECORD.pack(timestamp, ord(op), a, b, result))
+        self._index_record(self._count, timestamp, op)
+        self._count += 1
+
+    def flush(self):
+        """Flush pending records and persist the indexes."""
+        self._writer.flush()
+        self._save_index()
+
+    def close(self):
+        if self._writer.closed:
+            return
+        self.flush()
+        self._writer.close()
+        # Live iterators hold their own reference; the map is unmapped when the last one finishes
+        self._mm = None
+
+    # --- Reading ---
+    def _map(self):
+        """Return an mmap covering every record written so far.
+
+        An older map is not closed here: query()/__iter__ generators still
+        reading it keep it alive, and it is released once they finish.
+        """
+        if self._mapped < self._count:
+            self._writer.flush()
+            with open(self.path, 'rb') as f:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._mapped = self._count
+        return self._mm
+
+    def _read(self, n, mm):
+        ts, op, a, b, result = RECORD.unpack_from(mm, HEADER.size + n * RECORD.size)
+        return (datetime.fromtimestamp(ts), chr(op), a, b, result)
+
+    def __getitem__(self, n):
+        if n < 0:
+            n += self._count
+        if not 0 <= n < self._count:
+            raise IndexError("history record out of range")
+        return self._read(n, self._map())
+
+    def __iter__(self):
+        mm = self._map() if self._count else None
+        for n in range(self._count):
+            yield self._read(n, mm)
+
+    def _candidates_in_range(self, start, end, count):
+        """Record numbers below `count` in blocks whose time span overlaps [start, end]."""
+        bs = self.block_size
+        # Appends made while this generator is live may complete more blocks; ignore them
+        blocks = len(self._block_min)
+        if self._blocks_sorted:
+            # Skip blocks ending before start and starting after end
+            first = bisect_left(self._block_max, start, 0, blocks)
+            last = bisect_right(self._block_min, end, 0, blocks)
+            yield from range(first * bs, max(first, last) * bs)
+        else:
+            # Imported out-of-order timestamps: check every block's span
+            for block in range(blocks):
+                if self._block_max[block] >= start and self._block_min[block] <= end:
+                    yield from range(block * bs, (block + 1) * bs)
+        # The trailing partial block is not indexed yet; scan it directly
+        yield from range(blocks * bs, count)
+
+    def query(self, start=None, end=None, op=None):
+        """Yield (timestamp, op, a, b, result) tuples matching a time range and/or operator.
+
+        Only records in matching index blocks (or in the operator's index) are read.
+        """
+        if not self._count:
+            return
+        lo = start.timestamp() if isinstance(start, datetime) else (start if start is not None else float('-inf'))
+        hi = end.timestamp() if isinstance(end, datetime) else (end if end is not None else float('inf'))
+        mm = self._map()
+        count = self._count  # records covered by mm; later appends are not visible
+
+        if op is not None:
+            candidates = self._by_op.get(op, ())
+        else:
+            candidates = self._candidates_in_range(lo, hi, count)
+
+        for n in candidates:
+            if n >= count:  # candidates ascend; the operator index grows with appends
+                break
+            ts, code, a, b, result = RECORD.unpack_from(mm, HEADER.size + n * RECORD.size)
+            if lo <= ts <= hi and (op is None or code == ord(op)):
+                yield (datetime.fromtimestamp(ts), chr(code), a, b, result)
+
+    # --- Index maintenance ---
+    def _index_record(self, n, timestamp, op):
+        self._by_op.setdefault(op, array('Q')).append(n)
+        block = n // self.block_size
+        if n % self.block_size == 0:
+            self._pending_min = self._pending_max = timestamp
+        else:
+            self._pending_min = min(self._pending_min, timestamp)
+            self._pending_max = max(self._pending_max, timestamp)
+        if n % self.block_size == self.block_size - 1 and block == len(self._block_min):
+            if block and (self._pending_min < self._block_min[-1] or self._pending_max < self._block_max[-1]):
+                self._blocks_sorted = False
+            self._block_min.append(self._pending_min)
+            self._block_max.append(self._pending_max)
+        self._indexed = n + 1
+
+    def _catch_up(self):
+        """Index records written since the sidecar index was last saved."""
+        if self._indexed >= self._count:
+            return
+        mm = self._map()
+        # Restart from the beginning of the first incomplete block
+        first = len(self._block_min) * self.block_size
+        for ops in self._by_op.values():
+            while ops and ops[-1] >= first:
+                ops.pop()
+        for n in range(first, self._count):
+            ts, code, _, _, _ = RECORD.unpack_from(mm, HEADER.size + n * RECORD.size)
+            self._index_record(n, ts, chr(code))
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, 'rb') as f:
+                magic, indexed, block_size, op_count = INDEX_HEADER.unpack(f.read(INDEX_HEADER.size))
+                if magic != INDEX_MAGIC or block_size != self.block_size or indexed > self._count:
+                    return
+                blocks = indexed // block_size
+                self._block_min.fromfile(f, blocks)
+                self._block_max.fromfile(f, blocks)
+                for _ in range(op_count):
+                    code, length = struct.unpack('<BQ', f.read(9))
+                    ops = array('Q')
+                    ops.fromfile(f, length)
+                    self._by_op[chr(code)] = ops
+        except (OSError, EOFError, struct.error):
+            # Missing or damaged sidecar: rebuild from the records
+            self._block_min, self._block_max, self._by_op = array('d'), array('d'), {}
+            return
+        self._indexed = blocks * block_size
+        self._blocks_sorted = all(a <= b for column in (self._block_min, self._block_max)
+                                  for a, b in zip(column, column[1:]))
+        # Keep only entries for complete blocks; _catch_up re-indexes the rest
+        for ops in self._by_op.values():
+            while ops and ops[-1] >= self._indexed:
+                ops.pop()
+
+    def _save_index(self):
+        tmp = self.index_path + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(INDEX_HEADER.pack(INDEX_MAGIC, self._indexed, self.block_size, len(self._by_op)))
+            self._block_min.tofile(f)
+            self._block_max.tofile(f)
+            for op, ops in self._by_op.items():
+                f.write(struct.pack('<BQ', ord(op), len(ops)))
+                ops.tofile(f)
+        os.replace(tmp, self.index_path)
+
+
+def import_text_history(text_path, db):
+    """Import a calc_history.txt style file into `db`. Returns (imported, skipped)."""
+    imported = skipped = 0
+    with open(text_path, encoding='utf-8') as f:
+        for line in f:
+            match = TEXT_LINE.match(line.strip())
+            if not match:
+                skipped += 1 if line.strip() else 0
+                continue
+            try:
+                db.append(match['op'], float(match['a']), float(match['b']),
+                          float(match['result']), datetime.fromisoformat(match['ts']))
+            except ValueError:
+                skipped += 1
+                continue
+            imported += 1
+    db.flush()
+    return imported, skipped
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Binary calculation history tools")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    convert = commands.add_parser('import', help="convert a calc_history.txt file")
+    convert.add_argument('text_file')
+    convert.add_argument('db_file')
+
+    query = commands.add_parser('query', help="list matching calculations")
+    query.add_argument('db_file')
+    query.add_argument('--op', help="operator such as + - * /")
+    query.add_argument('--since', type=datetime.fromisoformat)
+    query.add_argument('--until', type=datetime.fromisoformat)
+
+    args = parser.parse_args(argv)
+    with HistoryDB(args.db_file) as db:
+        if args.command == 'import':
+            imported, skipped = import_text_history(args.text_file, db)
+            print(f"✅ Imported {imported} records ({skipped} skipped) into {args.db_file}")
+        else:
+            for ts, op, a, b, result in db.query(args.since, args.until, args.op):
+                print(f"{ts}: {a} {op} {b} = {result}")
+
+
+if __name__ == "__main__":
+    main()
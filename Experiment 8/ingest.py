@@ -0,0 +1,145 @@
+"""
+Experiment 8: Bulk Scenario Ingestion
+Objective: Validate and evaluate millions of calculator scenarios from JSONL
+or CSV files in vectorized batches.
+
+Each batch is classified column-wise into the same categories the
+try/except loop in log.py uses (ValueError, ZeroDivisionError, KeyError),
+without raising an exception per row; only failing rows get their message
+built one by one, worded exactly as the loop reports it. Results and
+categorized errors are appended to CSV files in bulk.
+"""
+
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+
+# Operators supported "in this build" (same set as run_detailed_experiment)
+OPERATORS = {'+': np.add, '/': np.divide}
+FIELDS = ['num1', 'num2', 'op']
+# Lower-cased, stripped spellings float() accepts and pd.to_numeric does not
+SPECIAL = r"[+-]?(?:nan|inf|infinity)"
+DIGITS = r"[0-9](?:_?[0-9])*"
+UNDERSCORED = rf"[+-]?(?:{DIGITS}(?:\.(?:{DIGITS})?)?|\.{DIGITS})(?:e[+-]?{DIGITS})?"
+
+
+def read_scenarios(path, batch_size=100_000):
+    """
+    Yield DataFrame batches of raw scenarios from a .jsonl/.json or .csv file.
+    Every batch has the first batch's columns (FIELDS always included): a JSONL
+    batch missing a field gets NaN there, and fields first seen later are dropped.
+    """
+    if path.endswith(('.jsonl', '.json')):
+        reader = pd.read_json(path, lines=True, dtype=False, convert_dates=False, chunksize=batch_size)
+    else:
+        reader = pd.read_csv(path, dtype=str, keep_default_na=False, na_values=[''], chunksize=batch_size)
+    columns = None
+    with reader:
+        for batch in reader:
+            if columns is None:
+                columns = list(batch.columns) + [f for f in FIELDS if f not in batch]
+            yield batch.reindex(columns=columns)
+
+
+def to_float(column):
+    """
+    float() over a column: (float64 values, {row position: ValueError message}).
+    pd.to_numeric does the bulk of the work; the spellings only float()
+    accepts (nan/inf/infinity in any case and sign, underscores between
+    digits) are recognised with vectorized string matching. Digits outside
+    0-9 are reported as invalid.
+    """
+    values = pd.to_numeric(column, errors='coerce').to_numpy(dtype=np.float64, copy=True)
+    retry = np.flatnonzero(np.isnan(values) & column.notna().to_numpy())
+    if not len(retry):
+        return values, {}
+    text = column.iloc[retry].astype(str).str.strip().str.lower()
+    special = text.str.fullmatch(SPECIAL).to_numpy(dtype=bool)
+    infinite = text.str.contains('inf', regex=False).to_numpy(dtype=bool)
+    negative = text.str.startswith('-').to_numpy(dtype=bool)
+    underscored = text.str.fullmatch(UNDERSCORED).to_numpy(dtype=bool)
+    digits = pd.to_numeric(text.str.replace('_', '', regex=False).where(underscored), errors='coerce')
+    values[retry] = np.where(special & infinite, np.where(negative, -np.inf, np.inf),
+                             digits.to_numpy(dtype=np.float64))
+    invalid = retry[~special & np.isnan(values[retry])]
+    messages = {i: f"could not convert string to float: {column.iat[i]!r}" for i in invalid}
+    return values, messages
+
+
+def evaluate_batch(batch, operators=OPERATORS):
+    """
+    Classify and evaluate one batch of scenarios.
+    Returns (results, errors) DataFrames; errors carry 'category' and 'message'.
+    """
+    absent = batch[FIELDS].isna().to_numpy()
+    a, a_errors = to_float(batch['num1'])
+    b, b_errors = to_float(batch['num2'])
+    op = batch['op'].astype(str).to_numpy()
+
+    # The loop's steps in order: item['num1'], float(num1), item['num2'],
+    # float(num2), item['op']. A row reports the first step that fails.
+    bad_a = np.zeros(len(batch), dtype=bool)
+    bad_a[list(a_errors)] = True
+    bad_b = np.zeros(len(batch), dtype=bool)
+    bad_b[list(b_errors)] = True
+    failed_at = np.select([absent[:, 0], bad_a, absent[:, 1], bad_b, absent[:, 2]], range(5), default=5)
+    missing = np.isin(failed_at, (0, 2, 4))
+    not_numeric = np.isin(failed_at, (1, 3))
+    checked = failed_at == 5
+    unsupported = checked & ~np.isin(op, list(operators))
+    zero_division = checked & (op == '/') & (b == 0)
+    valid = checked & ~unsupported & ~zero_division
+
+    result = np.full(len(batch), np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for symbol, ufunc in operators.items():
+            rows = valid & (op == symbol)
+            result[rows] = ufunc(a[rows], b[rows])
+
+    results = batch.loc[valid].assign(num1=a[valid], num2=b[valid], result=result[valid])
+
+    category = np.select(
+        [missing, not_numeric, zero_division, unsupported],
+        ['KeyError', 'ValueError', 'ZeroDivisionError', 'KeyError'],
+        default='')
+    # Messages as str(e) of the exception the loop would have raised
+    message = []
+    for i in np.flatnonzero(~valid):
+        if missing[i]:
+            message.append(str(KeyError(FIELDS[failed_at[i] // 2])))
+        elif not_numeric[i]:
+            message.append(a_errors[i] if failed_at[i] == 1 else b_errors[i])
+        elif zero_division[i]:
+            message.append("Math error: Division by zero is not allowed.")
+        else:
+            message.append(str(KeyError(f"The operator '{op[i]}' is not supported in this build.")))
+    errors = batch.loc[~valid].assign(category=category[~valid], message=message)
+    return results, errors
+
+
+def ingest_file(path, results_path, errors_path, batch_size=100_000, logger=None):
+    """
+    Stream a scenario file through evaluate_batch, appending results and errors
+    to CSV files. Returns a dict of counts per outcome.
+    """
+    logger = logger or logging.getLogger('RobustApp')
+    counts = {'ok': 0, 'ValueError': 0, 'ZeroDivisionError': 0, 'KeyError': 0}
+    for target in (results_path, errors_path):
+        if os.path.exists(target):
+            os.remove(target)
+
+    for number, batch in enumerate(read_scenarios(path, batch_size)):
+        results, errors = evaluate_batch(batch)
+        results.to_csv(results_path, mode='a', header=number == 0, index=False)
+        errors.to_csv(errors_path, mode='a', header=number == 0, index=False)
+
+        counts['ok'] += len(results)
+        for category, n in errors['category'].value_counts().items():
+            counts[category] += int(n)
+        # One log record per batch instead of one per failing row
+        logger.info(f"Batch {number}: {len(results)} ok, {len(errors)} errors")
+
+    logger.info(f"Ingestion of {path} complete: {counts}")
+    return counts
@@ -1,33 +1,55 @@
+import importlib.util
 import logging
+import os
 import sys
 import datetime
 
-def run_detailed_experiment():
+from history_db import HistoryDB
+from log_pipeline import setup_logging
+
+EXPERIMENT_7 = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Experiment 7')
+
+# The lazy-import helpers are shared with Experiment 7; load them by path
+lazy_imports = sys.modules.get('lazy_imports')
+if lazy_imports is None:
+    _spec = importlib.util.spec_from_file_location('lazy_imports', os.path.join(EXPERIMENT_7, 'lazy_imports.py'))
+    lazy_imports = sys.modules['lazy_imports'] = importlib.util.module_from_spec(_spec)
+    _spec.loader.exec_module(lazy_imports)
+expression = lazy_imports.load_experiment_module('Experiment 4', 'expression')
+
+# Operators supported "in this build", compiled once by Experiment 4's expression
+# engine: choosing one is a dict lookup instead of if/elif string comparisons
+OPERATIONS = {'+': expression.compile_expression("a + b"), '/': expression.compile_expression("a / b")}
+
+def run_detailed_experiment(scenario_file=None, json_logs=False):
     # --- STEP 1: SETTING UP LOGGING HANDLERS ---
     print("="*70)
     print("🛠️  PHASE 1: SYSTEM INITIALIZATION")
     print("="*70)
     
     # 8.3.3 Best Practice: Log errors with timestamp and details
-    logger = logging.getLogger('RobustApp')
-    logger.setLevel(logging.INFO)
+    # Dual output (File + Console) through a queue and a background writer;
+    # setup_logging is idempotent, so repeated runs do not duplicate handlers.
+    pipeline = setup_logging('RobustApp', log_file='experiment8_detailed.log', json_lines=json_logs)
+    logger = pipeline.logger
 
-    # Creating handlers for dual-output (File + Console)
-    c_handler = logging.StreamHandler(sys.stdout)
-    f_handler = logging.FileHandler('experiment8_detailed.log', mode='w')
-    
-    # Setting the format for systematic debugging
-    log_format = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-    c_handler.setFormatter(log_format)
-    f_handler.setFormatter(log_format)
-
-    # Adding handlers to the logger
-    logger.addHandler(c_handler)
-    logger.addHandler(f_handler)
-    
-    print("✅ Step 1: Logging handlers created and attached.")
+    print("✅ Step 1: Logging pipeline created and attached.")
     print("✅ Step 2: error_log.txt initialized for persistent storage.\n")
 
+    # Bulk mode: validate a JSONL/CSV scenario file in vectorized batches
+    if scenario_file:
+        from ingest import ingest_file
+        print("="*70)
+        print(f"📦 PHASE 2: BULK INGESTION OF {scenario_file}")
+        print("="*70)
+        counts = ingest_file(scenario_file, 'experiment8_results.csv', 'experiment8_rejected.csv', logger=logger)
+        pipeline.flush()
+        print(f"✅ Outcome counts: {counts}")
+        return counts
+
+    # Successful calculations go to the indexed binary history (replaces calc_history.txt)
+    history = HistoryDB('calc_history.db')
+
     # --- STEP 2: ROBUST EXECUTION ENGINE ---
     print("="*70)
     print("🧪 PHASE 2: EXECUTING EXCEPTION-HANDLING LOGIC")
@@ -51,16 +73,14 @@ def run_detailed_experiment():
             b = float(item['num2'])
             op = item['op']
 
-            if op == '+':
-                result = a + b
-            elif op == '/':
-                # 8.2.1 ZeroDivisionError: Division by zero
-                if b == 0:
-                    raise ZeroDivisionError("Math error: Division by zero is not allowed.")
-                result = a / b
-            else:
+            if op not in OPERATIONS:
                 # 8.2.1 KeyError: Dictionary key or operator not found
                 raise KeyError(f"The operator '{op}' is not supported in this build.")
+            try:
+                result = OPERATIONS[op](a, b)
+            except ZeroDivisionError:
+                # 8.2.1 ZeroDivisionError: Division by zero
+                raise ZeroDivisionError("Math error: Division by zero is not allowed.") from None
 
         # 8.3.2 Except: Handle specific exceptions systematically
         except ValueError as e:
@@ -80,14 +100,18 @@ def run_detailed_experiment():
         else:
             print(f"✅ Output: {result}")
             logger.info(f"Successful Operation: {item['num1']} {item['op']} {item['num2']} = {result}")
+            history.append(op, a, b, result)
 
         # 8.3.2 Finally: Always executes for cleanup
         finally:
             print(f"🔄 Cleanup: Task '{item['desc']}' attempt finished.")
 
+    history.close()
+    pipeline.flush()
+
     print("\n" + "="*70)
     print("✅ EXPERIMENT 8 COMPLETE: ALL LOGS SAVED")
     print("=" * 70)
 
 if __name__ == "__main__":
-    run_detailed_experiment()
\ No newline at end of file
+    run_detailed_experiment(sys.argv[1] if len(sys.argv) > 1 else None)
\ No newline at end of file
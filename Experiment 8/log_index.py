@@ -0,0 +1,339 @@
+"""
+Experiment 8: Indexed Log Queries
+Objective: Answer "all ERRORs between T1 and T2" without scanning whole log files.
+
+Log files use the '%(asctime)s - %(levelname)s - %(message)s' format. The
+indexer reads a file through mmap and writes a sidecar '<log>.idx' with one
+entry per run of lines in the same time bucket: (bucket start, byte range,
+bit mask of levels present). Queries only read the byte ranges whose bucket
+overlaps the time window and whose mask contains a requested level.
+
+Size-based rotation renames the live log (writers using log_pipeline reopen
+the path on their next write) and gzips it together with its index. Every
+indexed range becomes its own gzip member and the archive's index records
+the members' compressed offsets, so archived queries also decompress only
+the matching ranges.
+
+The index also records the log's identity (inode and a checksum of the
+first and last indexed bytes). A log rewritten in place, e.g. by
+log_pipeline's default file_mode='w', no longer matches and is reindexed
+from the start.
+"""
+
+import argparse
+import gzip
+import mmap
+import os
+import struct
+import zlib
+from datetime import datetime
+
+LEVELS = {b'DEBUG': 1, b'INFO': 2, b'WARNING': 4, b'ERROR': 8, b'CRITICAL': 16}
+INDEX_MAGIC = b'LOGIDX02'
+ARCHIVE_MAGIC = b'LOGIDXZ2'               # offsets are gzip members of the archive
+INDEX_HEADER = struct.Struct('<8sQIQQI')  # magic, bytes indexed, bucket seconds, entry count, inode, fingerprint
+LEGACY_HEADER = struct.Struct('<8sQIQ')   # version 1 (no file identity); magic -> compressed
+LEGACY_MAGICS = {b'LOGIDX01': False, b'LOGIDXZ1': True}
+ENTRY = struct.Struct('<qQQI')            # bucket start (epoch s), start offset, end offset, level mask
+TIMESTAMP_LEN = 23                        # "2026-01-28 17:34:57,800"
+FINGERPRINT_BYTES = 4096                  # checksummed at each end of the indexed bytes
+
+
+def _fingerprint(mm, indexed):
+    """crc32 of the first and last FINGERPRINT_BYTES of the indexed bytes."""
+    head = mm[:min(indexed, FINGERPRINT_BYTES)]
+    tail = mm[max(0, indexed - FINGERPRINT_BYTES):indexed]
+    return zlib.crc32(tail, zlib.crc32(head))
+
+
+class LogIndex:
+    """Sidecar index of byte ranges per (time bucket, level mask) for one log file."""
+
+    def __init__(self, bucket_seconds=60, compressed=False):
+        self.bucket_seconds = bucket_seconds
+        self.compressed = compressed  # offsets refer to gzip members of an archive
+        self.indexed = 0      # bytes of the log covered by the index
+        self.entries = []     # [bucket, start, end, mask]
+        self.inode = 0        # identity of the indexed file (live logs only)
+        self.fingerprint = 0
+        self._minutes = {}    # "YYYY-MM-DD HH:MM" -> epoch seconds
+
+    # --- Parsing helpers ---
+    def _parse_line(self, line):
+        """Return (epoch seconds, level bit) for a record line, or None for a continuation."""
+        if len(line) < TIMESTAMP_LEN + 4 or line[TIMESTAMP_LEN:TIMESTAMP_LEN + 3] != b' - ':
+            return None
+        minute = line[:16]
+        base = self._minutes.get(minute)
+        if base is None:
+            try:
+                base = datetime.strptime(minute.decode('ascii'), '%Y-%m-%d %H:%M').timestamp()
+            except (UnicodeDecodeError, ValueError):
+                return None
+            self._minutes[minute] = base
+        try:
+            seconds = int(line[17:19]) + int(line[20:23]) / 1000
+        except ValueError:
+            return None
+        level_end = line.find(b' - ', TIMESTAMP_LEN + 3)
+        level = LEVELS.get(line[TIMESTAMP_LEN + 3:level_end], 0)
+        return base + seconds, level
+
+    # --- Building ---
+    def update(self, mm, size):
+        """Index bytes [self.indexed, size) of the mapped log, extending the last entry."""
+        pos = self.indexed
+        if pos >= size:
+            return
+        current = self.entries[-1] if self.entries and self.entries[-1][2] == pos else None
+        while pos < size:
+            end = mm.find(b'\n', pos, size)
+            end = size if end == -1 else end + 1
+            if end == size and mm[end - 1:end] != b'\n':
+                break  # partial last line: index it once it is complete
+            parsed = self._parse_line(mm[pos:pos + 64])
+            if parsed is None:
+                if current is not None:  # continuation line (e.g. a traceback)
+                    current[2] = end
+            else:
+                ts, level = parsed
+                bucket = int(ts // self.bucket_seconds * self.bucket_seconds)
+                if current is not None and current[0] == bucket:
+                    current[2] = end
+                    current[3] |= level
+                else:
+                    current = [bucket, pos, end, level]
+                    self.entries.append(current)
+            pos = end
+        self.indexed = pos
+
+    # --- Persistence ---
+    def save(self, path):
+        tmp = path + '.tmp'
+        with open(tmp, 'wb') as f:
+            magic = ARCHIVE_MAGIC if self.compressed else INDEX_MAGIC
+            f.write(INDEX_HEADER.pack(magic, self.indexed, self.bucket_seconds, len(self.entries),
+                                      self.inode, self.fingerprint))
+            f.write(b''.join(ENTRY.pack(*entry) for entry in self.entries))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            magic = f.read(len(INDEX_MAGIC))
+            f.seek(0)
+            if magic in LEGACY_MAGICS:
+                _, indexed, bucket_seconds, count = LEGACY_HEADER.unpack(f.read(LEGACY_HEADER.size))
+                inode = fingerprint = 0  # never matches a live log: reindexed on the next build
+                compressed = LEGACY_MAGICS[magic]
+            elif magic in (INDEX_MAGIC, ARCHIVE_MAGIC):
+                _, indexed, bucket_seconds, count, inode, fingerprint = INDEX_HEADER.unpack(
+                    f.read(INDEX_HEADER.size))
+                compressed = magic == ARCHIVE_MAGIC
+            else:
+                raise ValueError(f"{path} is not a log index")
+            data = f.read(count * ENTRY.size)
+        index = cls(bucket_seconds, compressed=compressed)
+        index.indexed = indexed
+        index.inode, index.fingerprint = inode, fingerprint
+        index.entries = [list(entry) for entry in ENTRY.iter_unpack(data)]
+        return index
+
+    def ranges(self, start=None, end=None, levels=None):
+        """Yield (start, end) byte ranges that may hold matching records."""
+        mask = sum(LEVELS[level.upper().encode()] for level in levels) if levels else ~0
+        lo = float('-inf') if start is None else start - self.bucket_seconds
+        hi = float('inf') if end is None else end
+        for bucket, first, last, levels_present in self.entries:
+            if lo < bucket <= hi and levels_present & mask:
+                yield first, last
+
+
+def build_index(log_path, bucket_seconds=60, size=None):
+    """Create or incrementally refresh the sidecar index of `log_path` (up to `size` bytes)."""
+    index_path = log_path + '.idx'
+    try:
+        index = LogIndex.load(index_path)
+    except (OSError, ValueError, struct.error):
+        index = LogIndex(bucket_seconds)
+
+    with open(log_path, 'rb') as f:
+        stat = os.fstat(f.fileno())
+        if size is None:
+            size = stat.st_size
+        if not size:
+            return LogIndex(bucket_seconds)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if (index.indexed > size or index.bucket_seconds != bucket_seconds or index.inode != stat.st_ino
+                    or index.fingerprint != _fingerprint(mm, index.indexed)):
+                index = LogIndex(bucket_seconds)  # file was truncated, replaced or rewritten: rebuild
+            if index.indexed < size or index.inode != stat.st_ino:
+                index.update(mm, size)
+                index.inode, index.fingerprint = stat.st_ino, _fingerprint(mm, index.indexed)
+                index.save(index_path)
+    return index
+
+
+def _matching_lines(chunk, start, end, levels, parser):
+    """Filter one byte range record by record (a record keeps its continuation lines)."""
+    wanted = {level.upper().encode() for level in levels} if levels else None
+    keep = False
+    for line in chunk.splitlines(keepends=True):
+        parsed = parser(line[:64])
+        if parsed is not None:
+            ts, _ = parsed
+            level = line[TIMESTAMP_LEN + 3:line.find(b' - ', TIMESTAMP_LEN + 3)]
+            keep = ((start is None or ts >= start) and (end is None or ts <= end)
+                    and (wanted is None or level in wanted))
+        if keep:
+            yield line.decode('utf-8', errors='replace').rstrip('\n')
+
+
+def query(log_path, start=None, end=None, levels=None, bucket_seconds=60):
+    """
+    Yield log lines between `start` and `end` (datetimes or epoch seconds) whose
+    level is in `levels`, reading only indexed ranges. Compressed archives created
+    by rotate() are searched too, oldest first.
+    """
+    start = start.timestamp() if isinstance(start, datetime) else start
+    end = end.timestamp() if isinstance(end, datetime) else end
+
+    for archive in reversed(_archives(log_path)):
+        index = LogIndex.load(archive[:-len('.gz')] + '.idx')
+        ranges = list(index.ranges(start, end, levels))
+        if not ranges:
+            continue
+        if not index.compressed:
+            # Archive from before per-range members: gzip has to seek by decompressing
+            with gzip.open(archive, 'rb') as f:
+                for first, last in ranges:
+                    f.seek(first)
+                    yield from _matching_lines(f.read(last - first), start, end, levels, index._parse_line)
+            continue
+        with open(archive, 'rb') as f:
+            for first, last in ranges:
+                f.seek(first)
+                chunk = gzip.decompress(f.read(last - first))
+                yield from _matching_lines(chunk, start, end, levels, index._parse_line)
+
+    if not os.path.exists(log_path) or os.path.getsize(log_path) == 0:
+        return
+    index = build_index(log_path, bucket_seconds)
+    with open(log_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for first, last in index.ranges(start, end, levels):
+            yield from _matching_lines(mm[first:last], start, end, levels, index._parse_line)
+
+
+def _archives(log_path):
+    """Existing rotated archives, newest first: log.1.gz, log.2.gz, ..."""
+    found = []
+    n = 1
+    while os.path.exists(f"{log_path}.{n}.gz"):
+        found.append(f"{log_path}.{n}.gz")
+        n += 1
+    return found
+
+
+def _compress(raw_path, index, archive_path, size):
+    """Gzip the first `size` bytes of raw_path, one index range per member; returns the archive's index."""
+    archived = LogIndex(index.bucket_seconds, compressed=True)
+    with open(raw_path, 'rb') as src, open(archive_path, 'wb') as dst:
+        mm = mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+        try:
+            pos = 0
+            for bucket, first, last, mask in index.entries:
+                if first > pos:  # lines before the first record: archived, not indexed
+                    dst.write(gzip.compress(mm[pos:first], compresslevel=6, mtime=0))
+                offset = dst.tell()
+                dst.write(gzip.compress(mm[first:last], compresslevel=6, mtime=0))
+                archived.entries.append([bucket, offset, dst.tell(), mask])
+                pos = last
+            if pos < size:  # unterminated last line
+                dst.write(gzip.compress(mm[pos:size], compresslevel=6, mtime=0))
+        finally:
+            if size:
+                mm.close()
+    archived.indexed = size
+    return archived
+
+
+def rotate(log_path, max_bytes, backup_count=5, bucket_seconds=60, pipeline=None):
+    """
+    If `log_path` exceeds max_bytes, move it to log.1.gz (shifting older archives,
+    keeping backup_count) together with its index. Returns True when a rotation
+    happened.
+
+    The live log is renamed, never truncated: writers from log_pipeline notice
+    the rename and reopen the path on their next batch. Pass the writer's
+    pipeline when it runs in this process to rename between two of its batches;
+    a batch another process was already writing lands in the renamed file and
+    is archived with it.
+    """
+    if not os.path.exists(log_path) or os.path.getsize(log_path) < max_bytes:
+        return False
+
+    raw = log_path + '.rotating'
+    if pipeline is not None:
+        with pipeline.listener.write_lock:
+            os.replace(log_path, raw)
+    else:
+        os.replace(log_path, raw)
+    if os.path.exists(log_path + '.idx'):
+        os.replace(log_path + '.idx', raw + '.idx')  # keep the incremental index
+
+    for n in range(backup_count, 0, -1):
+        older, newer = f"{log_path}.{n}", f"{log_path}.{n + 1}"
+        for suffix in ('.gz', '.idx'):
+            if not os.path.exists(older + suffix):
+                continue
+            if n == backup_count:
+                os.remove(older + suffix)
+            else:
+                os.replace(older + suffix, newer + suffix)
+
+    archive = f"{log_path}.1.gz"
+    size = None
+    while size != os.path.getsize(raw):  # again if a writer had not seen the rename yet
+        size = os.path.getsize(raw)
+        index = build_index(raw, bucket_seconds, size)
+        archived = _compress(raw, index, archive + '.tmp', size)
+    archived.save(f"{log_path}.1.idx")
+    os.replace(archive + '.tmp', archive)
+    os.remove(raw)
+    os.remove(raw + '.idx')
+    return True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Index, rotate and query Experiment 8 log files")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    index_cmd = commands.add_parser('index', help="build or refresh the sidecar index")
+    index_cmd.add_argument('log_file')
+
+    rotate_cmd = commands.add_parser('rotate', help="gzip the log once it exceeds a size")
+    rotate_cmd.add_argument('log_file')
+    rotate_cmd.add_argument('--max-bytes', type=int, default=10 * 1024 * 1024)
+    rotate_cmd.add_argument('--backups', type=int, default=5)
+
+    query_cmd = commands.add_parser('query', help="print matching log lines")
+    query_cmd.add_argument('log_file')
+    query_cmd.add_argument('--level', action='append', type=str.upper, choices=[l.decode() for l in LEVELS],
+                           help="level to include (repeatable)")
+    query_cmd.add_argument('--since', type=datetime.fromisoformat)
+    query_cmd.add_argument('--until', type=datetime.fromisoformat)
+
+    args = parser.parse_args(argv)
+    if args.command == 'index':
+        index = build_index(args.log_file)
+        print(f"✅ Indexed {index.indexed} bytes into {len(index.entries)} ranges")
+    elif args.command == 'rotate':
+        rotated = rotate(args.log_file, args.max_bytes, args.backups)
+        print("✅ Rotated" if rotated else "ℹ️  Below size limit, nothing to rotate")
+    else:
+        for line in query(args.log_file, args.since, args.until, args.level):
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
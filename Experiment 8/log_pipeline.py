@@ -0,0 +1,249 @@
+"""
+Experiment 8: Non-blocking Logging Pipeline
+Objective: Move log formatting and I/O off the calling thread.
+
+The logger gets a single QueueHandler; a background listener thread drains
+the queue, formats records in batches and writes each batch to its targets
+with one write call. setup_logging() is idempotent, so calling it once per
+run no longer stacks duplicate handlers.
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+
+DEFAULT_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+# Pipelines already attached, keyed by logger name
+_pipelines = {}
+_lock = threading.Lock()
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Formats each record as one JSON object per line."""
+
+    def format(self, record):
+        entry = {
+            'time': self.formatTime(record, self.datefmt),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry)
+
+
+class ReopeningFile:
+    """
+    Text log file that follows its path: once the file has been renamed or
+    removed (e.g. by log_index.rotate), the next write reopens the path.
+    """
+
+    def __init__(self, path, mode='a', encoding='utf-8'):
+        self.path = path
+        self.encoding = encoding
+        self._open(mode)
+
+    def _open(self, mode):
+        self._file = open(self.path, mode, encoding=self.encoding)
+        self._inode = os.fstat(self._file.fileno()).st_ino
+
+    def write(self, data):
+        try:
+            moved = os.stat(self.path).st_ino != self._inode
+        except FileNotFoundError:
+            moved = True
+        if moved:
+            self._file.close()
+            self._open('a')
+        return self._file.write(data)
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class CountingQueueHandler(logging.Handler):
+    """
+    Hands records to a bounded queue without formatting them.
+    When the queue is full it waits up to `block_timeout` seconds
+    (0 = drop immediately) and counts dropped records.
+    """
+
+    def __init__(self, record_queue, block_timeout=0.0):
+        super().__init__()
+        self.queue = record_queue
+        self.block_timeout = block_timeout
+        self.enqueued = 0
+        self.dropped = 0
+
+    def emit(self, record):
+        # Snapshot the message so later changes to args cannot alter it
+        try:
+            record.msg = record.getMessage()
+        except Exception:
+            self.handleError(record)  # e.g. bad format args: report, never raise into the caller
+            return
+        record.args = None
+        try:
+            if self.block_timeout:
+                self.queue.put(record, timeout=self.block_timeout)
+            else:
+                self.queue.put_nowait(record)
+            self.enqueued += 1
+        except queue.Full:
+            self.dropped += 1
+
+
+class BatchingListener(threading.Thread):
+    """Background thread that formats and writes queued records in batches."""
+
+    _STOP = object()
+
+    def __init__(self, record_queue, targets, batch_size=256, flush_interval=0.1):
+        super().__init__(name='log-pipeline', daemon=True)
+        self.queue = record_queue
+        self.targets = targets  # list of (stream, formatter, level)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.written = 0
+        self.batches = 0
+        self.errors = 0
+        self.write_lock = threading.Lock()  # held while a batch is written (see log_index.rotate)
+
+    def run(self):
+        while True:
+            record = self.queue.get()
+            batch = [record]
+            # Gather whatever else is already waiting, up to batch_size
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get(timeout=self.flush_interval))
+                except queue.Empty:
+                    break
+            stop = any(item is self._STOP for item in batch)
+            try:
+                with self.write_lock:
+                    self._write([item for item in batch if item is not self._STOP])
+            finally:
+                # Always acknowledge, or flush() would wait forever
+                for _ in batch:
+                    self.queue.task_done()
+            if stop:
+                return
+
+    def _write(self, records):
+        if not records:
+            return
+        for stream, formatter, level in self.targets:
+            lines = []
+            for record in records:
+                if record.levelno < level:
+                    continue
+                try:
+                    lines.append(formatter.format(record))
+                except Exception:
+                    self.errors += 1  # a bad record is skipped, the thread keeps running
+            if not lines:
+                continue
+            try:
+                stream.write('\n'.join(lines) + '\n')
+                stream.flush()
+            except Exception:
+                self.errors += 1
+        self.written += len(records)
+        self.batches += 1
+
+    def stop(self):
+        self.queue.put(self._STOP)
+        self.join()
+
+
+class LoggingPipeline:
+    """A queue handler plus its listener, attached to one logger."""
+
+    def __init__(self, logger, handler, listener, files, settings):
+        self.logger = logger
+        self.handler = handler
+        self.listener = listener
+        self._files = files
+        self.settings = settings  # setup_logging() arguments it was built with
+
+    def flush(self):
+        """Block until every queued record has been written."""
+        self.listener.queue.join()
+
+    def stats(self):
+        """Backpressure and throughput counters."""
+        return {
+            'enqueued': self.handler.enqueued,
+            'dropped': self.handler.dropped,
+            'written': self.listener.written,
+            'batches': self.listener.batches,
+            'write_errors': self.listener.errors,
+            'queue_size': self.listener.queue.qsize(),
+        }
+
+    def shutdown(self):
+        with _lock:
+            if _pipelines.get(self.logger.name) is not self:
+                return
+            del _pipelines[self.logger.name]
+        self.logger.removeHandler(self.handler)
+        self.listener.stop()
+        for f in self._files:
+            f.close()
+
+
+def setup_logging(name='RobustApp', log_file='experiment8_detailed.log', console=True,
+                  level=logging.INFO, json_lines=False, file_mode='w',
+                  queue_size=10_000, block_timeout=0.0, batch_size=256):
+    """
+    Attach a non-blocking pipeline to logger `name` and return it.
+    Safe to call repeatedly: a later call with the same settings returns the
+    existing pipeline; different settings raise ValueError (shut the old
+    pipeline down first to reconfigure).
+    """
+    settings = {'log_file': log_file, 'console': console, 'level': level, 'json_lines': json_lines,
+                'file_mode': file_mode, 'queue_size': queue_size, 'block_timeout': block_timeout,
+                'batch_size': batch_size}
+    with _lock:
+        if name in _pipelines:
+            pipeline = _pipelines[name]
+            if pipeline.settings != settings:
+                changed = ', '.join(k for k in settings if settings[k] != pipeline.settings[k])
+                raise ValueError(f"logger {name!r} already has a logging pipeline with different "
+                                 f"settings ({changed}); call shutdown() on it first")
+            return pipeline
+
+        formatter = JsonLinesFormatter() if json_lines else logging.Formatter(DEFAULT_FORMAT)
+        targets, files = [], []
+        if console:
+            targets.append((sys.stdout, formatter, level))
+        if log_file:
+            f = ReopeningFile(log_file, file_mode)
+            files.append(f)
+            targets.append((f, formatter, level))
+
+        record_queue = queue.Queue(maxsize=queue_size)
+        handler = CountingQueueHandler(record_queue, block_timeout)
+        listener = BatchingListener(record_queue, targets, batch_size)
+        listener.start()
+
+        logger = logging.getLogger(name)
+        logger.setLevel(level)
+        logger.addHandler(handler)
+        logger.propagate = False
+
+        pipeline = LoggingPipeline(logger, handler, listener, files, settings)
+        _pipelines[name] = pipeline
+
+    atexit.register(pipeline.shutdown)
+    return pipeline
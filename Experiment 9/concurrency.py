@@ -0,0 +1,269 @@
+"""
+Experiment 9: Library Management System - Concurrent Issue/Return
+Objective: Let many librarians issue and return books at once without the
+check-then-issue race of the sequence diagram (Member -> Librarian ->
+Database), while unrelated books never wait for each other.
+
+ShardedLibrary is the thread-safe API. A book's availability bit and
+borrower slot are guarded by one of `shards` locks, chosen by the row's
+bitmap byte (the 8 books sharing a byte share a lock), so the availability
+check and the issue happen atomically for that book only. Appending new
+books or members takes a catalog lock; the shared counters are updated
+under a short counter lock.
+
+AsyncLibrary is an asyncio front-end over any thread-safe backend
+(ShardedLibrary, or persistence.PersistentLibrary for durable operations).
+Requests for the same ISBN queue on a per-book asyncio.Lock; requests for
+different books run concurrently on the executor.
+
+Run this file for a load test: throughput per worker count, plus a check
+that no book is ever held by two members at once. Both backends take an
+`observer` that is told of every successful issue and return while the
+book's lock is still held, so an independent check sees them in their
+true order. Under CPython's GIL the in-memory operations (a few
+microseconds) do not speed up with more threads; throughput scales where operations wait on I/O, as with the
+durable backend, whose callers share each group-commit fsync.
+"""
+
+import argparse
+import asyncio
+import random
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from library import Library, LibraryError, normalize_isbn
+
+
+class ShardedLibrary:
+    """Thread-safe Library with per-book (bitmap-byte sharded) locking."""
+
+    def __init__(self, library=None, shards=256, observer=None):
+        self.library = library if library is not None else Library()
+        self._shards = [threading.Lock() for _ in range(shards)]
+        self._catalog = threading.Lock()  # appends to the columns / member list
+        self._counts = threading.Lock()   # available_count and loans
+        self.observer = observer          # .issued(row, member_id) / .returned(row), under the book's lock
+
+    def _lock_for(self, row):
+        return self._shards[(row >> 3) % len(self._shards)]
+
+    def add_book(self, isbn, title):
+        with self._catalog:
+            # The new row may share its bitmap byte with rows being issued right
+            # now, and adding it counts it in available_count like count_loan
+            with self._lock_for(len(self.library)), self._counts:
+                return self.library.add_book(isbn, title)
+
+    def register_member(self, name):
+        with self._catalog:
+            return self.library.register_member(name)
+
+    def issue_book(self, isbn, member_id):
+        library = self.library
+        row = library.row_of(isbn)
+        library.check_member(member_id)
+        with self._lock_for(row):
+            library.checkout_row(row, member_id)  # check and issue, atomically for this book
+            if self.observer is not None:
+                self.observer.issued(row, member_id)
+        with self._counts:
+            library.count_loan(member_id, 1)
+        return row
+
+    def return_book(self, isbn):
+        library = self.library
+        row = library.row_of(isbn)
+        with self._lock_for(row):
+            member_id = library.checkin_row(row)
+            if self.observer is not None:
+                self.observer.returned(row)
+        with self._counts:
+            library.count_loan(member_id, -1)
+        return member_id
+
+    def is_available(self, isbn):
+        return self.library.is_available(isbn)
+
+    def get_book(self, isbn):
+        row = self.library.row_of(isbn)
+        with self._lock_for(row):
+            return self.library.book_at(row)
+
+    def __len__(self):
+        return len(self.library)
+
+
+class AsyncLibrary:
+    """asyncio front-end: one request at a time per book, different books in parallel."""
+
+    def __init__(self, backend, executor=None):
+        self.backend = backend
+        self.executor = executor
+        self._books = {}  # ISBN-13 -> [asyncio.Lock, requests using it]
+
+    async def _per_book(self, isbn, function, *args):
+        key = normalize_isbn(isbn)
+        entry = self._books.get(key)
+        if entry is None:
+            entry = self._books[key] = [asyncio.Lock(), 0]
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(self.executor, function, *args)
+        finally:
+            entry[1] -= 1
+            if not entry[1]:
+                del self._books[key]  # keep the lock table as small as the set of busy books
+
+    async def issue_book(self, isbn, member_id):
+        return await self._per_book(isbn, self.backend.issue_book, isbn, member_id)
+
+    async def return_book(self, isbn):
+        return await self._per_book(isbn, self.backend.return_book, isbn)
+
+    async def add_book(self, isbn, title):
+        return await self._per_book(isbn, self.backend.add_book, isbn, title)
+
+    async def register_member(self, name):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self.backend.register_member, name)
+
+    async def get_book(self, isbn):
+        return await self._per_book(isbn, self.backend.get_book, isbn)
+
+
+# =============================================================================
+# LOAD TEST
+# =============================================================================
+class HolderCheck:
+    """
+    Independent bookkeeping that flags a book held by two members at once.
+    Used as a backend observer: it hears of an issue or return only once the
+    backend call succeeded, while that book's lock is still held.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.holders = {}  # row -> member id, or None once returned
+        self.double_issues = 0
+
+    def issued(self, row, member_id):
+        with self._lock:
+            if self.holders.get(row) is not None:
+                self.double_issues += 1
+            self.holders[row] = member_id
+
+    def returned(self, row):
+        with self._lock:
+            self.holders[row] = None
+
+
+def make_backend(kind, books, directory=None):
+    """A thread-safe backend ('memory' or 'durable') preloaded with `books` titles."""
+    if kind == 'durable':
+        from persistence import PersistentLibrary
+        backend = PersistentLibrary(directory, synchronous=False)
+    else:
+        backend = ShardedLibrary()
+    for i in range(books):
+        backend.add_book(9780000000000 + i, f"Title {i}")
+    if kind == 'durable':
+        backend.synchronous = True  # only the measured operations wait for fsync
+    return backend
+
+
+def thread_load(backend, workers, operations, books, hot, seed=24):
+    """Each worker repeatedly tries to issue a random book (mostly from a hot set) and returns it."""
+    check = backend.observer = HolderCheck()
+    members = [backend.register_member(f"Librarian {w}") for w in range(workers)]
+    counts = [[0, 0] for _ in range(workers)]  # [issued, conflicts]
+
+    def worker(w):
+        rng = random.Random(seed + w)
+        for _ in range(operations):
+            i = rng.randrange(hot) if rng.random() < 0.5 else rng.randrange(books)
+            isbn = f"{9780000000000 + i}"
+            try:
+                backend.issue_book(isbn, members[w])
+            except LibraryError:
+                counts[w][1] += 1  # someone else has it: the expected outcome of a conflict
+                continue
+            counts[w][0] += 1
+            backend.return_book(isbn)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(worker, range(workers)))
+    elapsed = time.perf_counter() - start
+    issued = sum(c[0] for c in counts)
+    return issued, sum(c[1] for c in counts), elapsed, check.double_issues
+
+
+async def async_load(backend, workers, operations, books, hot, seed=24):
+    """The same workload as coroutines through AsyncLibrary."""
+    check = backend.observer = HolderCheck()
+    executor = ThreadPoolExecutor(max_workers=workers)
+    front = AsyncLibrary(backend, executor)
+    members = [await front.register_member(f"Desk {w}") for w in range(workers)]
+    counts = [0, 0]
+
+    async def worker(w):
+        rng = random.Random(seed + w)
+        for _ in range(operations):
+            i = rng.randrange(hot) if rng.random() < 0.5 else rng.randrange(books)
+            isbn = f"{9780000000000 + i}"
+            try:
+                await front.issue_book(isbn, members[w])
+            except LibraryError:
+                counts[1] += 1
+                continue
+            counts[0] += 1
+            await front.return_book(isbn)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(w) for w in range(workers)))
+    elapsed = time.perf_counter() - start
+    executor.shutdown()
+    return counts[0], counts[1], elapsed, check.double_issues
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrent issue/return load test")
+    parser.add_argument('--backend', choices=['memory', 'durable'], default='durable')
+    parser.add_argument('--books', type=int, default=10_000)
+    parser.add_argument('--hot', type=int, default=20, help="popular books most requests compete for")
+    parser.add_argument('--operations', type=int, default=500, help="issue attempts per worker")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8, 16])
+    args = parser.parse_args(argv)
+
+    print(f"🏛️  Backend: {args.backend} ({args.books:,} books, {args.hot} hot)")
+    failures = 0
+    for mode in ('threads', 'asyncio'):
+        print(f"\n{'🧵' if mode == 'threads' else '⚡'} {mode}")
+        for workers in args.workers:
+            directory = tempfile.mkdtemp(prefix='lms-load-') if args.backend == 'durable' else None
+            backend = make_backend(args.backend, args.books, directory)
+            if mode == 'threads':
+                issued, conflicts, elapsed, doubles = thread_load(
+                    backend, workers, args.operations, args.books, args.hot)
+            else:
+                issued, conflicts, elapsed, doubles = asyncio.run(async_load(
+                    backend, workers, args.operations, args.books, args.hot))
+            leaked = len(backend.library) - backend.library.available_count
+            failures += doubles + leaked
+            print(f"   {workers:3d} workers: {2 * issued / elapsed:10,.0f} ops/s  "
+                  f"({issued:,} issue+return, {conflicts:,} conflicts)  "
+                  f"{'✅' if not doubles and not leaked else '❌'} {doubles} double issues, "
+                  f"{leaked} books left issued")
+            if directory:
+                backend.close()
+                shutil.rmtree(directory)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
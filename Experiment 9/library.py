@@ -0,0 +1,310 @@
+"""
+Experiment 9: Library Management System - Catalog Engine
+Objective: Implement the Library and Book classes from the LMS class diagram
+so issuing and returning a book stay O(1) at ten million titles.
+
+Layout: every book is a row number. ISBNs are normalized to ISBN-13 and kept
+as integers in a hash index (ISBN -> row) and an array('Q') column; titles
+are UTF-8 bytes in one bytearray with an offsets column; availability is a
+bitmap (one bit per row) and the borrower of each issued book is an
+array('q') column. Book objects are small __slots__ snapshots built on
+demand, not the storage itself.
+"""
+
+import argparse
+import random
+import time
+from array import array
+
+NO_MEMBER = -1
+
+
+class LibraryError(Exception):
+    """Raised when an operation conflicts with the catalog state (e.g. book already issued)."""
+
+
+def normalize_isbn(isbn):
+    """
+    Return the ISBN-13 of an ISBN-10 or ISBN-13 (hyphens/spaces allowed) as an int.
+    Ints are taken as ISBN-13 keys and must have at most 13 digits; an
+    ISBN-10 must have a valid check digit.
+    """
+    if type(isbn) is int:
+        if 0 <= isbn < 10 ** 13:
+            return isbn
+        raise ValueError(f"invalid ISBN: {isbn!r}")
+    if not isinstance(isbn, str):
+        raise ValueError(f"invalid ISBN: {isbn!r}")
+    if len(isbn) == 13 and isbn.isdigit():  # fast path: already a bare ISBN-13
+        return int(isbn)
+    digits = isbn.replace('-', '').replace(' ', '').upper()
+    if (len(digits) == 10 and digits[:9].isdigit() and (digits[9].isdigit() or digits[9] == 'X')
+            and sum((10 - i) * (10 if d == 'X' else int(d)) for i, d in enumerate(digits)) % 11 == 0):
+        core = '978' + digits[:9]
+        check = (10 - sum(int(d) * (3 if i % 2 else 1) for i, d in enumerate(core)) % 10) % 10
+        return int(core + str(check))
+    if len(digits) == 13 and digits.isdigit():
+        return int(digits)
+    raise ValueError(f"invalid ISBN: {isbn!r}")
+
+
+def encode_title(title):
+    if not isinstance(title, str):
+        raise TypeError(f"title must be a str, not {type(title).__name__}")
+    return title.encode()
+
+
+def format_isbn(key):
+    return f"{key:013d}"
+
+
+class Book:
+    """Read-only snapshot of one catalog row (class diagram: isbn, title, is_available)."""
+
+    __slots__ = ('isbn', 'title', 'is_available', 'borrower')
+
+    def __init__(self, isbn, title, is_available, borrower=None):
+        self.isbn = isbn
+        self.title = title
+        self.is_available = is_available
+        self.borrower = borrower
+
+    def get_info(self):
+        status = "Available" if self.is_available else f"Issued to member {self.borrower}"
+        return f"{self.title} (ISBN {self.isbn}) - {status}"
+
+    def __repr__(self):
+        return f"Book({self.isbn!r}, {self.title!r}, is_available={self.is_available})"
+
+
+class Library:
+    """Indexed in-memory catalog: add_book, register_member, issue_book, return_book."""
+
+    def __init__(self):
+        self._index = {}                 # ISBN-13 int -> row
+        self._isbns = array('Q')
+        self._title_data = bytearray()
+        self._title_offsets = array('Q', [0])
+        self._available = bytearray()    # bit row % 8 of byte row // 8
+        self._borrower = array('q')
+        self.available_count = 0
+        self.members = []                # member id -> name
+        self._loans = array('l')         # member id -> books currently issued
+
+    def __len__(self):
+        return len(self._isbns)
+
+    def __contains__(self, isbn):
+        try:
+            return normalize_isbn(isbn) in self._index
+        except ValueError:
+            return False
+
+    # --- Catalog ---
+    def add_book(self, isbn, title):
+        """Add one title (available). Returns its row number."""
+        key = normalize_isbn(isbn)
+        if key in self._index:
+            raise LibraryError(f"ISBN {format_isbn(key)} is already in the catalog")
+        encoded = encode_title(title)  # validate everything before touching a column
+        row = len(self._isbns)
+        self._index[key] = row
+        self._isbns.append(key)
+        self._title_data += encoded
+        self._title_offsets.append(len(self._title_data))
+        if row % 8 == 0:
+            self._available.append(0)
+        self._available[row >> 3] |= 1 << (row & 7)
+        self._borrower.append(NO_MEMBER)
+        self.available_count += 1
+        return row
+
+    def add_books(self, books):
+        """Bulk-load (isbn, title) pairs; much faster than add_book() in a loop."""
+        index, isbns, offsets = self._index, self._isbns, self._title_offsets
+        data = self._title_data
+        start = len(isbns)
+        try:
+            for isbn, title in books:
+                key = normalize_isbn(isbn)
+                if key in index:
+                    raise LibraryError(f"ISBN {format_isbn(key)} is already in the catalog")
+                encoded = encode_title(title)
+                index[key] = len(isbns)
+                isbns.append(key)
+                data += encoded
+                offsets.append(len(data))
+        finally:
+            # Rows loaded before an error stay consistent
+            self._mark_new_rows(start, len(isbns))
+        return len(isbns) - start
+
+    def _mark_new_rows(self, start, row):
+        added = row - start
+        # New rows are all available: set their bits in whole bytes where possible
+        for r in range(start, min(row, (start + 7) & ~7)):
+            if r % 8 == 0:
+                self._available.append(0)
+            self._available[r >> 3] |= 1 << (r & 7)
+        first_full = (start + 7) & ~7
+        if row > first_full:
+            full, rest = divmod(row - first_full, 8)
+            self._available += b'\xff' * full
+            if rest:
+                self._available.append((1 << rest) - 1)
+        self._borrower.extend(array('q', [NO_MEMBER]) * added)
+        self.available_count += added
+
+    def row_of(self, isbn):
+        try:
+            return self._index[normalize_isbn(isbn)]
+        except KeyError:
+            raise KeyError(f"ISBN {isbn} is not in the catalog") from None
+
+    def title_at(self, row):
+        return self._title_data[self._title_offsets[row]:self._title_offsets[row + 1]].decode()
+
+    def available_at(self, row):
+        return bool(self._available[row >> 3] & (1 << (row & 7)))
+
+    def is_available(self, isbn):
+        return self.available_at(self.row_of(isbn))
+
+    def get_book(self, isbn):
+        return self.book_at(self.row_of(isbn))
+
+    def book_at(self, row):
+        borrower = self._borrower[row]
+        return Book(format_isbn(self._isbns[row]), self.title_at(row), self.available_at(row),
+                    None if borrower == NO_MEMBER else borrower)
+
+    def __getitem__(self, isbn):
+        return self.get_book(isbn)
+
+    def __iter__(self):
+        for row in range(len(self._isbns)):
+            yield self.book_at(row)
+
+    # --- Whole-catalog state (snapshots) ---
+    def columns(self):
+        """Copies of every storage column, e.g. to write a snapshot while operations continue."""
+        return {
+            'isbns': self._isbns[:],
+            'title_data': bytes(self._title_data),
+            'title_offsets': self._title_offsets[:],
+            'available': bytes(self._available),
+            'borrower': self._borrower[:],
+            'members': list(self.members),
+            'loans': self._loans[:],
+        }
+
+    @classmethod
+    def from_columns(cls, isbns, title_data, title_offsets, available, borrower, members, loans):
+        """Rebuild a Library from columns(); only the ISBN hash index is recomputed."""
+        library = cls()
+        library._isbns = isbns
+        library._index = dict(zip(isbns, range(len(isbns))))
+        library._title_data = bytearray(title_data)
+        library._title_offsets = title_offsets
+        library._available = bytearray(available)
+        library._borrower = borrower
+        library.available_count = borrower.count(NO_MEMBER)
+        library.members = members
+        library._loans = loans
+        return library
+
+    # --- Members ---
+    def register_member(self, name):
+        """Register a member and return their member id."""
+        self.members.append(name)
+        self._loans.append(0)
+        return len(self.members) - 1
+
+    def loans(self, member_id):
+        return self._loans[member_id]
+
+    def check_member(self, member_id):
+        if not 0 <= member_id < len(self.members):
+            raise KeyError(f"member {member_id} is not registered")
+
+    # --- Circulation: O(1) hash lookup + bit flip ---
+    # checkout_row/checkin_row touch only the row's bitmap byte and borrower
+    # slot, count_loan only the shared counters; concurrency.py locks them separately.
+    def checkout_row(self, row, member_id):
+        byte, bit = row >> 3, 1 << (row & 7)
+        if not self._available[byte] & bit:
+            raise LibraryError(f"ISBN {format_isbn(self._isbns[row])} is already issued "
+                               f"to member {self._borrower[row]}")
+        self._available[byte] &= ~bit & 0xFF
+        self._borrower[row] = member_id
+
+    def checkin_row(self, row):
+        byte, bit = row >> 3, 1 << (row & 7)
+        if self._available[byte] & bit:
+            raise LibraryError(f"ISBN {format_isbn(self._isbns[row])} is not issued")
+        member_id = self._borrower[row]
+        self._available[byte] |= bit
+        self._borrower[row] = NO_MEMBER
+        return member_id
+
+    def count_loan(self, member_id, delta):
+        self._loans[member_id] += delta
+        self.available_count -= delta
+
+    def issue_book(self, isbn, member_id):
+        """Issue an available book to a registered member."""
+        row = self.row_of(isbn)
+        self.check_member(member_id)
+        self.checkout_row(row, member_id)
+        self.count_loan(member_id, 1)
+        return row
+
+    def return_book(self, isbn):
+        """Return an issued book; returns the member id that had it."""
+        row = self.row_of(isbn)
+        member_id = self.checkin_row(row)
+        self.count_loan(member_id, -1)
+        return member_id
+
+
+# =============================================================================
+# DEMO / SCALE CHECK
+# =============================================================================
+def synthetic_books(count, seed=9):
+    """count distinct (ISBN-13, title) pairs."""
+    base = 9780000000000
+    for i in range(count):
+        yield format_isbn(base + i), f"Title {i} (seed {seed})"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="LMS catalog engine scale check")
+    parser.add_argument('--books', type=int, default=1_000_000)
+    parser.add_argument('--operations', type=int, default=200_000)
+    args = parser.parse_args(argv)
+
+    library = Library()
+    start = time.perf_counter()
+    library.add_books(synthetic_books(args.books))
+    print(f"📚 Loaded {len(library):,} titles in {time.perf_counter() - start:.2f}s")
+
+    member = library.register_member("Ayesha")
+    print(f"👤 Registered member {member}: {library.members[member]}")
+    sample = [format_isbn(9780000000000 + random.randrange(args.books)) for _ in range(args.operations)]
+    start = time.perf_counter()
+    issued = 0
+    for isbn in sample:
+        if library.is_available(isbn):
+            library.issue_book(isbn, member)
+            issued += 1
+    for isbn in set(sample):
+        library.return_book(isbn)
+    elapsed = time.perf_counter() - start
+    print(f"🔁 {issued:,} issues + returns in {elapsed:.2f}s "
+          f"({elapsed / (2 * issued) * 1e6:.2f} µs per operation)")
+    print(f"✅ {library.available_count:,} of {len(library):,} available; "
+          f"{library.get_book(sample[0]).get_info()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,59 +1,86 @@
+import importlib.util
 import subprocess
 import sys
 import os
 import logging
 from datetime import datetime
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
-from matplotlib.patches import FancyBboxPatch, FancyArrowPatch, Ellipse, Rectangle
+
+EXPERIMENT_7 = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Experiment 7')
+
+# The lazy-import helpers are shared with Experiment 7; load them by path
+lazy_imports = sys.modules.get('lazy_imports')
+if lazy_imports is None:
+    _spec = importlib.util.spec_from_file_location('lazy_imports', os.path.join(EXPERIMENT_7, 'lazy_imports.py'))
+    lazy_imports = sys.modules['lazy_imports'] = importlib.util.module_from_spec(_spec)
+    _spec.loader.exec_module(lazy_imports)
+is_installed = lazy_imports.is_installed
+print_import_report = lazy_imports.print_import_report
+
+# The diagrams are uml_spec specs; matplotlib is only loaded when one is drawn
+import uml_spec
 
 # =============================================================================
 # PHASE 1: EXPERIMENT 7 - BUILD TOOLS & DEPENDENCY MANAGEMENT
 # =============================================================================
-def setup_build_environment():
-    print("=" * 70)
-    print("🛠️  PHASE 1: BUILD TOOLS & AUTOMATION")
-    print("=" * 70)
+# The pinned requirements, setup.py template and task graph are Experiment 7's
+PROJECT = {'name': "library-management-system", 'author': "University Student",
+           'description': "LMS with automated build and UML design"}
 
+
+def _build_runner():
+    # The build steps, write-if-changed helper and task runner live with Experiment 7's build tools
+    return lazy_imports.load_experiment_module('Experiment 7', 'build_runner')
+
+
+def write_requirements():
     # 1. Create requirements.txt (Dependency Management)
-    requirements_content = """# Project Dependencies
-numpy==1.24.3
-pandas==2.0.2
-matplotlib==3.7.1
-"""
-    with open('requirements.txt', 'w') as f:
-        f.write(requirements_content)
-    print("✅ requirements.txt created")
+    build_runner = _build_runner()
+    if build_runner.write_if_changed('requirements.txt', build_runner.REQUIREMENTS):
+        print("✅ requirements.txt created")
+    else:
+        print("✅ requirements.txt unchanged")
 
+
+def write_setup():
     # 2. Create setup.py (Project Configuration)
-    setup_content = """from setuptools import setup
-setup(
-    name="library-management-system",
-    version="1.0.0",
-    author="University Student",
-    description="LMS with automated build and UML design",
-    install_requires=["numpy", "pandas", "matplotlib"],
-    python_requires=">=3.8",
-)"""
-    with open('setup.py', 'w') as f:
-        f.write(setup_content)
-    print("✅ setup.py created")
+    build_runner = _build_runner()
+    if build_runner.write_if_changed('setup.py', build_runner.setup_py(**PROJECT)):
+        print("✅ setup.py created")
+    else:
+        print("✅ setup.py unchanged")
+
 
+def install_build_dependencies(wheelhouse=None):
     # 3. Install Dependencies (Environment Consistency)
-    packages = ['numpy', 'pandas', 'matplotlib']
-    for package in packages:
-        try:
-            __import__(package)
+    if wheelhouse:
+        # Offline mode reuses Experiment 7's hash-locked wheelhouse installer
+        offline_install = lazy_imports.load_experiment_module('Experiment 7', 'offline_install')
+        offline_install.install_requirements('requirements.txt', wheelhouse)
+        print("✅ Environment consistent across machines\n")
+        return
+
+    for package in _build_runner().PACKAGES:
+        if is_installed(package):
             print(f"✅ {package} - Already installed")
-        except ImportError:
+        else:
             print(f"⏳ Installing {package}...")
             subprocess.check_call([sys.executable, "-m", "pip", "install", package, "--quiet"])
     print("✅ Environment consistent across machines\n")
 
+
+def setup_build_environment(wheelhouse=None):
+    print("=" * 70)
+    print("🛠️  PHASE 1: BUILD TOOLS & AUTOMATION")
+    print("=" * 70)
+    write_requirements()
+    write_setup()
+    install_build_dependencies(wheelhouse)
+
 # =============================================================================
 # PHASE 2: EXPERIMENT 9 - UML DIAGRAM GENERATOR (LMS)
 # =============================================================================
-def generate_uml_diagrams():
+def generate_uml_diagrams(fmt='png', dpi=None, show=True):
+    """Draw the LMS diagrams as fmt ('png', 'svg', 'pdf'); show=False never blocks."""
     print("=" * 70)
     print("🎨 PHASE 2: UML DIAGRAM DESIGN")
     print("=" * 70)
@@ -62,69 +89,57 @@ def generate_uml_diagrams():
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
 
-    # --- 1. CLASS DIAGRAM ---
-    fig1, ax1 = plt.subplots(figsize=(10, 8))
-    ax1.set_xlim(0, 12)
-    ax1.set_ylim(0, 10)
-    ax1.axis('off')
-
-    # Library Class
-    ax1.add_patch(Rectangle((1, 5.5), 3.5, 3.5, fill=True, color='#fff9c4', ec='black'))
-    plt.text(2.75, 8.6, "Library", weight='bold', ha='center')
-    plt.text(1.2, 7.5, "- books: List\n- members: List", fontsize=9)
-    plt.text(1.2, 6.0, "+ add_book()\n+ issue_book()\n+ return_book()", fontsize=9)
-
-    # Book Class
-    ax1.add_patch(Rectangle((7, 6), 3.5, 3, fill=True, color='#e1f5fe', ec='black'))
-    plt.text(8.75, 8.6, "Book", weight='bold', ha='center')
-    plt.text(7.2, 7.5, "- isbn: String\n- title: String\n- status: bool", fontsize=9)
-    plt.text(7.2, 6.5, "+ get_info()", fontsize=9)
-
-    # Association Relationship
-    ax1.add_patch(FancyArrowPatch((4.5, 7.5), (7, 7.5), arrowstyle='<->', mutation_scale=20))
-    plt.text(5.75, 7.7, "1..* contains", ha='center', fontsize=8)
-
-    plt.title("LMS Class Diagram")
-    plt.savefig(f"{output_dir}/class_diagram.png")
-    print("✅ Class Diagram generated")
-
-    # --- 2. SEQUENCE DIAGRAM (Issue Book) ---
-    fig2, ax2 = plt.subplots(figsize=(10, 8))
-    ax2.set_xlim(0, 10)
-    ax2.set_ylim(0, 10)
-    ax2.axis('off')
-
-    # Lifelines
-    lifelines = [("Member", 2), ("Librarian", 5), ("Database", 8)]
-    for name, x in lifelines:
-        ax2.plot([x, x], [2, 8], 'k--', lw=1)
-        ax2.add_patch(Rectangle((x-0.75, 8), 1.5, 0.8, color='lightgrey', ec='black'))
-        plt.text(x, 8.4, name, ha='center', weight='bold')
-
-    # Interaction Arrows (The Sequence)
-    # 1. Member -> Librarian: Request Book
-    ax2.annotate('', xy=(5, 7.5), xytext=(2, 7.5), arrowprops=dict(arrowstyle='->'))
-    plt.text(3.5, 7.6, "1: Request Book", ha='center', fontsize=8)
-
-    # 2. Librarian -> Database: Check Availability
-    ax2.annotate('', xy=(8, 6.5), xytext=(5, 6.5), arrowprops=dict(arrowstyle='->'))
-    plt.text(6.5, 6.6, "2: Check ISBN", ha='center', fontsize=8)
-
-    # 3. Database -> Librarian: Confirm
-    ax2.annotate('', xy=(5, 5.5), xytext=(8, 5.5), arrowprops=dict(arrowstyle='->', ls='--'))
-    plt.text(6.5, 5.6, "3: Available", ha='center', fontsize=8)
-
-    plt.title("LMS Sequence Diagram: Issue Book")
-    plt.savefig(f"{output_dir}/sequence_diagram.png")
-    print("✅ Sequence Diagram generated")
-    plt.show()
+    for name, label in [('class_diagram', "Class Diagram"), ('sequence_diagram', "Sequence Diagram")]:
+        uml_spec.render(uml_spec.LMS_OVERVIEW_DIAGRAMS[name], f"{output_dir}/{name}.{fmt}", dpi or 150)
+        print(f"✅ {label} generated")
+    if show:
+        for spec in uml_spec.LMS_OVERVIEW_DIAGRAMS.values():
+            uml_spec.show(spec)
+
+# =============================================================================
+# CACHED BUILD PIPELINE
+# =============================================================================
+def build_pipeline(phases=('build', 'uml'), wheelhouse=None, fmt='png', headless=False):
+    """
+    Both phases as one task graph: the build files and the diagrams are
+    independent and run in parallel, installation waits for requirements.txt,
+    and every task is skipped while its inputs are unchanged.
+    """
+    build_runner = _build_runner()
+    Task = build_runner.Task
+    tasks = []
+    if 'build' in phases:
+        tasks += build_runner.build_tasks(write_requirements, write_setup, install_build_dependencies,
+                                          build_runner.setup_py(**PROJECT), wheelhouse)
+    if 'uml' in phases:
+        # The specs and the renderer live in uml_spec.py, so its source is the task's input
+        outputs = [f"uml_diagrams/{name}.{fmt}" for name in uml_spec.LMS_OVERVIEW_DIAGRAMS]
+        tasks.append(Task('uml', lambda: generate_uml_diagrams(fmt=fmt, show=not headless),
+                          inputs=[os.path.abspath(uml_spec.__file__)], outputs=outputs, params={'fmt': fmt},
+                          main_thread=True))
+    return build_runner.BuildRunner(tasks)
+
 
 # =============================================================================
 # MAIN EXECUTION
 # =============================================================================
 if __name__ == "__main__":
-    setup_build_environment()
-    generate_uml_diagrams()
+    # Optional phase selection: "python man.py build" only rewrites the build files
+    phases = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    if not {'build', 'uml'} & set(phases):
+        phases += ['build', 'uml']
+    headless = '--headless' in sys.argv
+    fmt = next((arg for arg in phases if arg in ('png', 'svg', 'pdf')), 'png')
+    if '--no-cache' in sys.argv:
+        # Original strictly sequential run
+        if 'build' in phases:
+            setup_build_environment(os.environ.get('WHEELHOUSE'))
+        if 'uml' in phases:
+            generate_uml_diagrams(fmt=fmt, show=not headless)
+    else:
+        build_pipeline(phases, os.environ.get('WHEELHOUSE'), fmt, headless).run(force='--force' in sys.argv)
     print("\n" + "=" * 70)
     print("✅ ALL EXPERIMENTS SUCCESSFULLY COMPLETED")
-    print("=" * 70)
\ No newline at end of file
+    print("=" * 70)
+    if '--import-report' in sys.argv:
+        print_import_report()
@@ -0,0 +1,478 @@
+"""
+Experiment 9: Library Management System - Durable Catalog
+Objective: Keep the catalog's state across restarts without a database round
+trip per operation: an append-only write-ahead log (WAL) with group commit,
+plus periodic compact snapshots.
+
+Directory layout:
+  snapshot.lms       latest snapshot (binary columns, written atomically)
+  wal.<gen>.log      log segments; a snapshot covers every segment <= its gen
+
+WAL record: !IIB header (crc32 of type + payload, payload length, type) then
+the payload. A torn or corrupt record at the end of the last segment (crash
+mid-write) ends recovery there and is truncated away.
+
+Group commit: operations apply to memory, append their record to an
+in-memory buffer and (with synchronous=True) wait until a background thread
+has written and fsync'ed it. One fsync covers every record buffered in the
+meantime, so concurrent callers share the cost. If a write or fsync fails,
+the commit thread stops and every waiting (and later) commit raises OSError.
+
+Snapshots: the current segment is closed (written and fsync'ed) before the
+next one is opened, so a later segment never holds records whose
+predecessors were lost. The snapshot itself is written in the background; a
+failure is raised by the next checkpoint() or close().
+"""
+
+import argparse
+import os
+import shutil
+import struct
+import tempfile
+import threading
+import time
+import zlib
+from array import array
+
+from library import Library, normalize_isbn
+
+RECORD = struct.Struct('!IIB')
+ISBN = struct.Struct('<Q')
+ISSUE = struct.Struct('<Qq')
+ADD_BOOK, ISSUE_BOOK, RETURN_BOOK, REGISTER_MEMBER = 1, 2, 3, 4
+
+SNAPSHOT_MAGIC = b'LMSSNAP1'
+SNAPSHOT_HEADER = struct.Struct('<8sQQQQQI')  # magic, gen, books, title bytes, members, member bytes, crc32
+SNAPSHOT_NAME = 'snapshot.lms'
+
+
+def _encode(kind, payload):
+    return RECORD.pack(zlib.crc32(bytes([kind]) + payload), len(payload), kind) + payload
+
+
+def _segment_path(directory, gen):
+    return os.path.join(directory, f"wal.{gen:06d}.log")
+
+
+def _segments(directory):
+    """[(gen, path)] of the WAL segments in the directory, oldest first."""
+    found = []
+    for name in os.listdir(directory):
+        if name.startswith('wal.') and name.endswith('.log'):
+            found.append((int(name[4:-4]), os.path.join(directory, name)))
+    return sorted(found)
+
+
+class WriteAheadLog:
+    """Append-only log segment with a background group-commit thread."""
+
+    def __init__(self, path, commit_interval=0.002):
+        self.path = path
+        self.commit_interval = commit_interval
+        self._file = open(path, 'ab')
+        self._buffer = []
+        self._appended = 0      # sequence number of the last appended record
+        self._durable = 0       # ... of the last record known to be on disk
+        self._cond = threading.Condition()
+        self._closed = False
+        self._stopped = False   # the commit thread has exited; nothing more becomes durable
+        self._error = None      # the write/fsync failure that stopped it, if any
+        self.commits = 0        # fsyncs performed
+        self._thread = threading.Thread(target=self._run, name='wal-commit', daemon=True)
+        self._thread.start()
+
+    def _check(self):
+        """Called under the condition: raise if records can no longer become durable."""
+        if self._error is not None:
+            raise OSError(f"write-ahead log {self.path} failed: {self._error}") from self._error
+
+    def append(self, record):
+        """Buffer an encoded record; returns its sequence number for commit()."""
+        with self._cond:
+            self._check()
+            if self._closed:
+                raise ValueError("write-ahead log is closed")
+            self._buffer.append(record)
+            self._appended += 1
+            return self._appended
+
+    def commit(self, sequence):
+        """Block until the record with this sequence number is durable."""
+        with self._cond:
+            self._cond.notify_all()
+            while self._durable < sequence:
+                self._check()
+                if self._stopped:
+                    raise ValueError("write-ahead log closed before commit")
+                self._cond.wait()
+
+    def _run(self):
+        try:
+            while True:
+                with self._cond:
+                    if not self._buffer and not self._closed:
+                        self._cond.wait(self.commit_interval)
+                    batch, self._buffer = self._buffer, []
+                    sequence = self._appended
+                    closed = self._closed
+                if batch:
+                    self._file.write(b''.join(batch))
+                    self._file.flush()
+                    os.fsync(self._file.fileno())
+                    self.commits += 1
+                with self._cond:
+                    self._durable = sequence
+                    self._cond.notify_all()
+                if closed:
+                    return
+        except Exception as e:
+            # Hand the failure to the committers instead of leaving them blocked
+            with self._cond:
+                self._error = e
+        finally:
+            # Waiters give up only now: the last batch has been written (or failed)
+            with self._cond:
+                self._stopped = True
+                self._cond.notify_all()
+
+    def close(self):
+        """Commit everything buffered and stop the commit thread."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+        self._file.close()
+
+
+def replay(path, library):
+    """Apply every intact record of a segment to library. Returns (records, end offset)."""
+    count = offset = 0
+    with open(path, 'rb') as f:
+        data = f.read()
+    while offset + RECORD.size <= len(data):
+        crc, length, kind = RECORD.unpack_from(data, offset)
+        start = offset + RECORD.size
+        payload = data[start:start + length]
+        if len(payload) < length or zlib.crc32(bytes([kind]) + payload) != crc:
+            break  # torn tail
+        if kind == ADD_BOOK:
+            library.add_book(ISBN.unpack_from(payload)[0], payload[ISBN.size:].decode())
+        elif kind == ISSUE_BOOK:
+            library.issue_book(*ISSUE.unpack(payload))
+        elif kind == RETURN_BOOK:
+            library.return_book(ISBN.unpack(payload)[0])
+        elif kind == REGISTER_MEMBER:
+            library.register_member(payload.decode())
+        offset = start + length
+        count += 1
+    return count, offset
+
+
+def write_snapshot(path, library_columns, gen):
+    """Write library.columns() to path atomically (tmp file, fsync, rename)."""
+    c = library_columns
+    names = [name.encode() for name in c['members']]
+    name_offsets = array('Q', [0])
+    for name in names:
+        name_offsets.append(name_offsets[-1] + len(name))
+    parts = [c['isbns'].tobytes(), c['title_offsets'].tobytes(), c['title_data'], c['available'],
+             c['borrower'].tobytes(), c['loans'].tobytes(), name_offsets.tobytes(), b''.join(names)]
+    crc = 0
+    for part in parts:
+        crc = zlib.crc32(part, crc)
+    header = SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, gen, len(c['isbns']), len(c['title_data']),
+                                  len(names), name_offsets[-1], crc)
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(header)
+        for part in parts:
+            f.write(part)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def read_snapshot(path):
+    """Return (gen, Library) from a snapshot file."""
+    with open(path, 'rb') as f:
+        data = memoryview(f.read())
+    magic, gen, books, title_bytes, members, member_bytes, crc = SNAPSHOT_HEADER.unpack_from(data)
+    if magic != SNAPSHOT_MAGIC:
+        raise ValueError(f"{path} is not a library snapshot")
+    if zlib.crc32(data[SNAPSHOT_HEADER.size:]) != crc:
+        raise ValueError(f"{path} is corrupt (checksum mismatch)")
+    offset = SNAPSHOT_HEADER.size
+
+    def take(size):
+        nonlocal offset
+        part = data[offset:offset + size]
+        offset += size
+        return part
+
+    def column(typecode, count):
+        values = array(typecode)
+        values.frombytes(take(count * values.itemsize))
+        return values
+
+    isbns = column('Q', books)
+    title_offsets = column('Q', books + 1)
+    title_data = take(title_bytes)
+    available = take((books + 7) // 8)
+    borrower = column('q', books)
+    loans = column('l', members)
+    name_offsets = column('Q', members + 1)
+    names = bytes(take(member_bytes))
+    member_names = [names[name_offsets[i]:name_offsets[i + 1]].decode() for i in range(members)]
+    return gen, Library.from_columns(isbns, title_data, title_offsets, available, borrower, member_names, loans)
+
+
+class PersistentLibrary:
+    """
+    A Library whose add_book, add_books, register_member, issue_book and
+    return_book are logged. synchronous=True returns only once the records
+    are fsync'ed (group commit); synchronous=False returns at once and the log
+    lags by at most one commit interval. A snapshot is taken every
+    snapshot_every records.
+
+    Only the read methods in READS are forwarded to the catalog; the Library's
+    row-level primitives (checkout_row, checkin_row, count_loan) would bypass
+    the log and are not available here. An observer, like ShardedLibrary's
+    in concurrency.py, hears of each successful issue and return under the lock.
+    """
+
+    READS = frozenset({'row_of', 'title_at', 'available_at', 'is_available', 'get_book', 'book_at',
+                       'loans', 'check_member', 'members', 'available_count'})
+
+    def __init__(self, directory, synchronous=True, commit_interval=0.002, snapshot_every=1_000_000):
+        self.directory = directory
+        self.synchronous = synchronous
+        self.commit_interval = commit_interval
+        self.snapshot_every = snapshot_every
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()  # keeps log order identical to apply order
+        self._snapshotting = None
+        self._snapshot_error = None    # why the last background snapshot failed, until reported
+        self.observer = None           # .issued(row, member_id) / .returned(row), called under the lock
+        self.library, self.gen, self.recovered = self._recover()
+        self.wal = WriteAheadLog(_segment_path(directory, self.gen), commit_interval)
+        self._since_snapshot = self.recovered
+
+    def _recover(self):
+        snapshot = os.path.join(self.directory, SNAPSHOT_NAME)
+        covered, library = read_snapshot(snapshot) if os.path.exists(snapshot) else (0, Library())
+        segments = [(gen, path) for gen, path in _segments(self.directory) if gen > covered]
+        replayed = 0
+        for i, (gen, path) in enumerate(segments):
+            count, end = replay(path, library)
+            replayed += count
+            if end < os.path.getsize(path):
+                if i != len(segments) - 1:
+                    raise ValueError(f"{path} is corrupt before the end of the log")
+                with open(path, 'r+b') as f:
+                    f.truncate(end)  # drop the torn tail so new records follow intact ones
+        gen = segments[-1][0] if segments else covered + 1
+        return library, gen, replayed
+
+    def _log(self, *records):
+        """
+        Called under the lock with the encoded records of one operation, after
+        it was applied. Returns (segment, sequence) to commit after releasing it.
+        """
+        wal, sequence = self.wal, 0
+        for record in records:
+            sequence = wal.append(record)
+        self._since_snapshot += len(records)
+        # Only once every record is in the old segment may a snapshot cover it
+        if self._since_snapshot >= self.snapshot_every and self._snapshotting is None:
+            self._start_snapshot()
+        return wal, sequence
+
+    def _finish(self, logged, result):
+        if self.synchronous:
+            wal, sequence = logged
+            wal.commit(sequence)
+        return result
+
+    # --- Logged operations ---
+    def add_book(self, isbn, title):
+        key = normalize_isbn(isbn)
+        with self._lock:
+            row = self.library.add_book(key, title)
+            logged = self._log(_encode(ADD_BOOK, ISBN.pack(key) + title.encode()))
+        return self._finish(logged, row)
+
+    def add_books(self, books):
+        """Bulk-load (isbn, title) pairs with one ADD_BOOK record each and a single commit."""
+        seen = []  # (key, title) in the order the catalog consumed them
+
+        def pairs():
+            for isbn, title in books:
+                key = normalize_isbn(isbn)
+                seen.append((key, title))
+                yield key, title
+
+        with self._lock:
+            start = len(self.library)
+            try:
+                self.library.add_books(pairs())
+            finally:
+                # Rows loaded before an error stay in the catalog, so they are logged too
+                loaded = seen[:len(self.library) - start]
+                logged = self._log(*(_encode(ADD_BOOK, ISBN.pack(key) + title.encode())
+                                     for key, title in loaded))
+        return self._finish(logged, len(loaded))
+
+    def register_member(self, name):
+        with self._lock:
+            member_id = self.library.register_member(name)
+            logged = self._log(_encode(REGISTER_MEMBER, name.encode()))
+        return self._finish(logged, member_id)
+
+    def issue_book(self, isbn, member_id):
+        key = normalize_isbn(isbn)
+        with self._lock:
+            row = self.library.issue_book(key, member_id)
+            if self.observer is not None:
+                self.observer.issued(row, member_id)
+            logged = self._log(_encode(ISSUE_BOOK, ISSUE.pack(key, member_id)))
+        return self._finish(logged, row)
+
+    def return_book(self, isbn):
+        key = normalize_isbn(isbn)
+        with self._lock:
+            member_id = self.library.return_book(key)
+            if self.observer is not None:
+                self.observer.returned(self.library.row_of(key))
+            logged = self._log(_encode(RETURN_BOOK, ISBN.pack(key)))
+        return self._finish(logged, member_id)
+
+    # --- Reads go straight to the catalog ---
+    def __getattr__(self, name):
+        if name in PersistentLibrary.READS:
+            return getattr(self.library, name)
+        raise AttributeError(f"{type(self).__name__!r} has no attribute {name!r} "
+                             f"(only logged operations and {sorted(self.READS)} are available)")
+
+    def __len__(self):
+        return len(self.library)
+
+    def __contains__(self, isbn):
+        return isbn in self.library
+
+    def __getitem__(self, isbn):
+        return self.library[isbn]
+
+    def __iter__(self):
+        return iter(self.library)
+
+    # --- Snapshots ---
+    def _start_snapshot(self):
+        """
+        Called under the lock: switch to a new segment, copy the columns and
+        write them in the background. Returns the writing thread.
+        """
+        old_wal, covered = self.wal, self.gen
+        # Records of the new segment may depend on any record of this one, so it
+        # must be on disk before the new segment takes (and fsyncs) writes
+        old_wal.close()
+        old_wal._check()
+        self.gen += 1
+        self.wal = WriteAheadLog(_segment_path(self.directory, self.gen), self.commit_interval)
+        columns = self.library.columns()
+        self._since_snapshot = 0
+
+        def write():
+            try:
+                write_snapshot(os.path.join(self.directory, SNAPSHOT_NAME), columns, covered)
+                for gen, path in _segments(self.directory):
+                    if gen <= covered:
+                        os.remove(path)
+            except Exception as e:
+                self._snapshot_error = e  # reported by the next checkpoint() or close()
+            finally:
+                self._snapshotting = None
+
+        thread = self._snapshotting = threading.Thread(target=write, name='lms-snapshot', daemon=True)
+        thread.start()
+        return thread
+
+    def checkpoint(self):
+        """Take a snapshot of the current state and wait for it to be written."""
+        while True:
+            with self._lock:
+                thread = self._snapshotting
+                if thread is None:
+                    thread = self._start_snapshot()
+                    break
+            thread.join()  # an earlier snapshot is still being written
+        thread.join()
+        self._raise_snapshot_error()
+
+    def _raise_snapshot_error(self):
+        error, self._snapshot_error = self._snapshot_error, None
+        if error is not None:
+            raise error
+
+    def close(self):
+        thread = self._snapshotting
+        if thread is not None:
+            thread.join()
+        self.wal.close()
+        self._raise_snapshot_error()
+
+
+# =============================================================================
+# DEMO / DURABILITY CHECK
+# =============================================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="WAL + snapshot persistence for the LMS catalog")
+    parser.add_argument('--books', type=int, default=1_000_000)
+    parser.add_argument('--operations', type=int, default=5_000)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--directory', help="data directory (default: a temporary one)")
+    args = parser.parse_args(argv)
+    directory = args.directory or tempfile.mkdtemp(prefix='lms-')
+
+    db = PersistentLibrary(directory, synchronous=False)
+    start = time.perf_counter()
+    for i in range(args.books):
+        db.add_book(9780000000000 + i, f"Title {i}")
+    member = db.register_member("Ayesha")
+    db.checkpoint()
+    print(f"📚 Loaded and snapshotted {args.books:,} books in {time.perf_counter() - start:.2f}s")
+
+    # Durable (synchronous) issue/return from several threads share each fsync
+    db.synchronous = True
+    per_thread = args.operations // args.threads
+
+    def worker(t):
+        for i in range(per_thread):
+            isbn = 9780000000000 + t * per_thread + i
+            db.issue_book(isbn, member)
+            db.return_book(isbn)
+
+    commits = db.wal.commits
+    start = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(t,)) for t in range(args.threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    db.issue_book(9780000000000, member)
+    print(f"💾 {2 * per_thread * args.threads:,} durable operations in {elapsed:.2f}s "
+          f"({2 * per_thread * args.threads / elapsed:,.0f}/s, {db.wal.commits - commits} fsyncs)")
+    db.close()
+
+    start = time.perf_counter()
+    recovered = PersistentLibrary(directory)
+    print(f"🔄 Recovered {len(recovered.library):,} books (+{recovered.recovered} log records) "
+          f"in {time.perf_counter() - start:.2f}s; "
+          f"{recovered.get_book('9780000000000').get_info()}")
+    recovered.close()
+    if not args.directory:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,317 @@
+"""
+Experiment 9: Library Management System - "Search Books"
+Objective: Answer title searches and autocomplete over millions of catalog
+rows in well under a millisecond, without rescanning titles.
+
+SearchIndex is an inverted index over a library.Library: each title token
+maps to an ascending array('I') of catalog rows. It catches up
+incrementally (only rows added since the last query are tokenized), and
+availability is read from the catalog's bitmap at query time, so issuing or
+returning a book needs no index update at all.
+
+Query semantics: every word must match; the last word also matches as a
+prefix unless the query ends with a space (search-as-you-type). Results
+are ranked by the IDF of the matched words divided by the square root of
+the title length, so shorter, more specific titles come first. A prefix
+matches every indexed term in its range; only autocomplete suggestions
+are capped at the most frequent MAX_COMPLETIONS.
+"""
+
+import argparse
+import heapq
+import math
+import random
+import re
+import time
+from array import array
+from bisect import bisect_left
+from itertools import repeat
+
+TOKEN = re.compile(r"\w+")
+MAX_COMPLETIONS = 64      # autocomplete suggestions; wider prefixes are searched rarest term first
+MAX_PREFIX_SCAN = 20_000  # larger prefix ranges are ranked once per refresh and cached
+MAX_CACHED_PREFIXES = 1024
+
+
+def tokenize(text):
+    return TOKEN.findall(text.lower())
+
+
+def _contains(rows, row):
+    i = bisect_left(rows, row)
+    return i < len(rows) and rows[i] == row
+
+
+class SearchIndex:
+    """Incremental inverted title index with prefix completion over a Library."""
+
+    def __init__(self, library):
+        self.library = library
+        self.postings = {}        # term -> {title length in words: array('I') of rows}
+        self.df = {}              # term -> number of titles containing it
+        self.indexed = 0          # rows [0, indexed) are in the index
+        self._terms = []          # sorted vocabulary (for prefixes)
+        self._new_terms = []      # added since the last sort
+        self._ranked = {}         # short prefix -> its most frequent completions (until refresh)
+        self._expanded = {}       # prefix -> (its terms rarest first, their title lengths) (until refresh)
+
+    def refresh(self):
+        """Index the rows added to the library since the last call. Returns how many."""
+        library, postings, df = self.library, self.postings, self.df
+        start, end = self.indexed, len(library)
+        for row in range(start, end):
+            tokens = tokenize(library.title_at(row))
+            length = len(tokens)
+            for token in set(tokens):
+                buckets = postings.get(token)
+                if buckets is None:
+                    buckets = postings[token] = {}
+                    df[token] = 0
+                    self._new_terms.append(token)
+                rows = buckets.get(length)
+                if rows is None:
+                    rows = buckets[length] = array('I')
+                rows.append(row)
+                df[token] += 1
+        if end > start:
+            self._ranked.clear()  # document frequencies changed
+            self._expanded.clear()
+        self.indexed = end
+        return end - start
+
+    def _vocabulary(self):
+        if self._new_terms:
+            # Two sorted runs: Timsort merges them in linear time
+            self._new_terms.sort()
+            self._terms += self._new_terms
+            self._terms.sort()
+            self._new_terms = []
+        return self._terms
+
+    def _idf(self, term):
+        df = self.df[term]
+        return math.log(1 + (self.indexed - df + 0.5) / (df + 0.5))
+
+    def _prefix_range(self, prefix):
+        """(sorted vocabulary, lo, hi): terms[lo:hi] are the terms starting with prefix."""
+        terms = self._vocabulary()
+        lo = bisect_left(terms, prefix)
+        hi = bisect_left(terms, prefix[:-1] + chr(ord(prefix[-1]) + 1), lo) if prefix else len(terms)
+        return terms, lo, hi
+
+    def completions(self, prefix, limit=MAX_COMPLETIONS):
+        """Indexed terms starting with prefix, most frequent first (autocomplete suggestions)."""
+        terms, lo, hi = self._prefix_range(prefix)
+        if hi - lo <= MAX_PREFIX_SCAN:
+            return heapq.nlargest(limit, terms[lo:hi], key=self.df.__getitem__)
+        # A short prefix spans a huge range: rank all of it (never a truncated
+        # slice), but only once until the next refresh changes the frequencies
+        ranked = self._ranked.get(prefix)
+        if ranked is None or len(ranked) < limit:
+            ranked = self._ranked[prefix] = heapq.nlargest(max(limit, MAX_COMPLETIONS), terms[lo:hi],
+                                                           key=self.df.__getitem__)
+        return ranked[:limit]
+
+    def _expansions(self, prefix):
+        """Every term starting with prefix, rarest (highest idf) first, and the title lengths they occur at."""
+        expanded = self._expanded.get(prefix)
+        if expanded is None:
+            terms, lo, hi = self._prefix_range(prefix)
+            rarest = sorted(terms[lo:hi], key=self.df.__getitem__)
+            lengths = set()
+            for term in rarest:
+                lengths.update(self.postings[term])
+            if len(self._expanded) >= MAX_CACHED_PREFIXES:
+                self._expanded.clear()
+            expanded = self._expanded[prefix] = (rarest, lengths)
+        return expanded
+
+    def autocomplete(self, text, limit=10):
+        """Suggest completions of the last word of text, e.g. 'harry po' -> ['potter', ...]."""
+        self.refresh()
+        tokens = tokenize(text)
+        if not tokens or text[-1:].isspace():
+            return []
+        return self.completions(tokens[-1], limit)
+
+    def _bucket_matches(self, lists, completions, available_only):
+        """Yield (row, idf of the prefix match) for rows in every list and (if any) a completion."""
+        available = self.library.available_at
+        if completions and (not lists or sum(len(rows) for rows, _ in completions) <= len(lists[0])):
+            # Drive from the prefix: merge the completions' rows (best idf first on ties)
+            streams = [zip(rows, repeat(-idf)) for rows, idf in completions]
+            last = None
+            for row, negative_idf in heapq.merge(*streams):
+                if row == last:
+                    continue
+                last = row
+                if lists and not all(_contains(rows, row) for rows in lists):
+                    continue
+                if available_only and not available(row):
+                    continue
+                yield row, -negative_idf
+            return
+
+        # Drive from the exact words: intersect in C when there are several
+        candidates = sorted(set(lists[0]).intersection(*lists[1:])) if len(lists) > 1 else lists[0]
+        completions = sorted(completions, key=lambda item: -item[1])  # first hit = best idf
+        for row in candidates:
+            if available_only and not available(row):
+                continue
+            if not completions:
+                yield row, 0.0
+                continue
+            for rows, idf in completions:
+                if _contains(rows, row):
+                    yield row, idf
+                    break
+
+    def _rarest_into(self, top, limit, base, lists, terms, length, available_only):
+        """
+        Search one bucket for a prefix with too many terms to merge: push the
+        rows in every list (if any) and under a prefix term into the top heap,
+        rarest term first, stopping once no later term can enter it.
+        """
+        available = self.library.available_at
+        norm = math.sqrt(length)
+        seen = set()  # rows already pushed with a rarer (better) term
+        for term in terms:
+            rows = self.postings[term].get(length)
+            if rows is None:
+                continue
+            score = (base + self._idf(term)) / norm
+            if len(top) >= limit and top[0][0] > score:
+                break  # later terms are no rarer
+            for row in rows:
+                item = (score, -row)
+                if len(top) >= limit and not item > top[0]:
+                    break  # rows ascend: the rest of this term cannot win either
+                if row in seen or (available_only and not available(row)):
+                    continue
+                if lists and not all(_contains(other, row) for other in lists):
+                    continue
+                seen.add(row)
+                if len(top) < limit:
+                    heapq.heappush(top, item)
+                else:
+                    heapq.heapreplace(top, item)
+
+    def search_rows(self, query, limit=10, available_only=False):
+        """
+        Ranked [(score, row)] for query.
+        Postings are bucketed by title length and a title's score only falls
+        with its length, so buckets are visited shortest first and the search
+        stops once no later bucket can beat the current top `limit`.
+        """
+        self.refresh()
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        prefix = None if query[-1:].isspace() else tokens.pop()
+        if any(t not in self.postings for t in tokens):
+            return []
+        expansions, prefix_lengths = self._expansions(prefix) if prefix is not None else ([], ())
+        if prefix is not None and not expansions:
+            return []
+
+        base = sum(self._idf(t) for t in tokens)
+        best_prefix = self._idf(expansions[0]) if expansions else 0.0
+        few = len(expansions) <= MAX_COMPLETIONS  # few enough to test each term's postings
+        prefix_idf = {term: self._idf(term) for term in expansions} if few else None
+        exact = [self.postings[t] for t in tokens]
+        if exact:
+            lengths = self.postings[min(tokens, key=self.df.__getitem__)].keys()
+        else:
+            lengths = prefix_lengths
+
+        top = []  # min-heap of (score, -row): the weakest result is top[0]
+        for length in sorted(lengths):
+            bound = (base + best_prefix) / math.sqrt(length)
+            if len(top) >= limit and top[0][0] >= bound:
+                break
+            lists = [buckets.get(length) for buckets in exact]
+            if not all(lists):
+                continue
+            lists.sort(key=len)
+            if not few:
+                self._rarest_into(top, limit, base, lists, expansions, length, available_only)
+                continue
+            bucket_completions = [(self.postings[t][length], prefix_idf[t])
+                                  for t in expansions if length in self.postings[t]]
+            if prefix is not None and not bucket_completions:
+                continue
+            for row, idf in self._bucket_matches(lists, bucket_completions, available_only):
+                item = ((base + idf) / math.sqrt(length), -row)
+                if len(top) < limit:
+                    heapq.heappush(top, item)
+                elif item > top[0]:
+                    heapq.heapreplace(top, item)
+                elif top[0][0] >= bound:
+                    break  # rows only increase within a bucket: nothing left here can win
+        return [(score, -negative_row) for score, negative_row in sorted(top, reverse=True)]
+
+    def search(self, query, limit=10, available_only=False):
+        """Ranked Book snapshots matching query ("Search Books" use case)."""
+        return [self.library.book_at(row) for _, row in self.search_rows(query, limit, available_only)]
+
+
+# =============================================================================
+# DEMO / LATENCY CHECK
+# =============================================================================
+SYLLABLES = "ka lo mi ra te su no vi da pe ri zo an el or us in ha ne to".split()
+COMMON = ("history art science python data garden ocean river mountain city night war peace love "
+          "music design computer network theory modern ancient world guide introduction advanced "
+          "secret lost journey empire stars machine learning systems library children winter").split()
+
+
+def random_titles(count, vocabulary=50_000, seed=9):
+    """(ISBN, title) pairs drawing words from a Zipf-distributed vocabulary, like real titles."""
+    rng = random.Random(seed)
+    words = COMMON + [''.join(rng.choices(SYLLABLES, k=rng.randint(2, 4))) + str(i)
+                      for i in range(vocabulary - len(COMMON))]
+    cumulative, total = [], 0.0
+    for rank in range(1, len(words) + 1):
+        total += 1 / rank
+        cumulative.append(total)
+    for i in range(count):
+        title = ' '.join(rng.choices(words, cum_weights=cumulative, k=rng.randint(2, 6)))
+        yield f"{9780000000000 + i}", title.title()
+
+
+def main(argv=None):
+    from library import Library
+
+    parser = argparse.ArgumentParser(description="Search Books index demo")
+    parser.add_argument('--books', type=int, default=1_000_000)
+    args = parser.parse_args(argv)
+
+    library = Library()
+    library.add_books(random_titles(args.books))
+    index = SearchIndex(library)
+    start = time.perf_counter()
+    index.refresh()
+    print(f"🔎 Indexed {index.indexed:,} titles ({len(index.postings):,} terms) "
+          f"in {time.perf_counter() - start:.2f}s")
+
+    member = library.register_member("Ayesha")
+    for book in index.search("python machine", limit=3):
+        library.issue_book(book.isbn, member)
+
+    for query, available_only in [("python machine", False), ("python machine", True),
+                                  ("ancient hist", False), ("compu", True), ("lost ocean war ", False),
+                                  ("history", False)]:
+        start = time.perf_counter()
+        results = index.search(query, limit=3, available_only=available_only)
+        elapsed = (time.perf_counter() - start) * 1000
+        flag = " (available only)" if available_only else ""
+        print(f"\n📖 '{query}'{flag}: {elapsed:.3f} ms")
+        for book in results:
+            print(f"   {book.get_info()}")
+    print(f"\n💡 Autocomplete 'modern mu' -> {index.autocomplete('modern mu', 5)}")
+
+    library.add_book("9781111111111", "Quantum Gardening For Beginners")
+    print(f"➕ New title found incrementally: {[b.title for b in index.search('quantum gard')]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,351 @@
+"""
+Experiment 9: Declarative UML Diagrams
+Objective: Describe diagrams as data and render only the ones that changed.
+
+A spec is a plain dict (JSON-serializable):
+  class     -> classes (name, attributes, methods) and relations
+  use_case  -> system name, actors, use cases and actor/use-case links
+  sequence  -> lifelines and messages (from, to, label, reply)
+
+layout() turns a spec into drawing primitives with automatic positions.
+Primitives are written either straight to SVG text (no matplotlib needed) or
+through matplotlib for PNG/PDF, on a standalone figure that leaves pyplot and
+its backend alone. render_all() keeps a cache of spec hashes so unchanged
+diagrams are skipped. fail.py and man.py draw their diagrams from these specs.
+"""
+
+import hashlib
+import json
+import os
+import sys
+from xml.sax.saxutils import escape
+
+RENDERER_VERSION = 1
+CHAR_WIDTH = 7.5   # approximate width of one 12px sans-serif character
+LINE_HEIGHT = 18
+FONT = 'DejaVu Sans, Arial, sans-serif'
+
+# =============================================================================
+# LIBRARY MANAGEMENT SYSTEM SPECS
+# =============================================================================
+# The three diagrams drawn by fail.py
+LMS_DIAGRAMS = {
+    '1_class_diagram': {
+        'type': 'class',
+        'title': 'UML Class Diagram: Library Management System',
+        'classes': [
+            {'name': 'Library', 'fill': '#fff9c4',
+             'attributes': ['- books: List', '- members: List'],
+             'methods': ['+ add_book()', '+ register_member()', '+ issue_book()', '+ return_book()']},
+            {'name': 'Book', 'fill': '#e1f5fe',
+             'attributes': ['- isbn: String', '- title: String', '- is_available: bool'],
+             'methods': ['+ get_details()']},
+        ],
+        'relations': [{'from': 'Library', 'to': 'Book', 'label': '1..* contains', 'kind': 'association'}],
+    },
+    '2_use_case_diagram': {
+        'type': 'use_case',
+        'title': 'UML Use Case Diagram: Library Management System',
+        'system': 'Library System',
+        'actors': ['Librarian'],
+        'use_cases': ['Search Books', 'Issue Book', 'Return Book', 'Manage Members'],
+        'links': [['Librarian', 'Search Books'], ['Librarian', 'Issue Book'],
+                  ['Librarian', 'Return Book'], ['Librarian', 'Manage Members']],
+    },
+    '3_sequence_diagram': {
+        'type': 'sequence',
+        'title': 'UML Sequence Diagram: Issue Book Process',
+        'lifelines': ['Member', 'Librarian', 'Database'],
+        'messages': [
+            {'from': 'Member', 'to': 'Librarian', 'label': '1: Request(ISBN)'},
+            {'from': 'Librarian', 'to': 'Database', 'label': '2: CheckAvailability()'},
+            {'from': 'Database', 'to': 'Librarian', 'label': '3: StatusAvailable', 'reply': True},
+            {'from': 'Librarian', 'to': 'Member', 'label': '4: IssueBook()'},
+        ],
+    },
+}
+
+# The overview drawn by man.py's UML phase
+LMS_OVERVIEW_DIAGRAMS = {
+    'class_diagram': {
+        'type': 'class',
+        'title': 'LMS Class Diagram',
+        'classes': [
+            {'name': 'Library', 'fill': '#fff9c4',
+             'attributes': ['- books: List', '- members: List'],
+             'methods': ['+ add_book()', '+ issue_book()', '+ return_book()']},
+            {'name': 'Book', 'fill': '#e1f5fe',
+             'attributes': ['- isbn: String', '- title: String', '- status: bool'],
+             'methods': ['+ get_info()']},
+        ],
+        'relations': [{'from': 'Library', 'to': 'Book', 'label': '1..* contains', 'kind': 'association'}],
+    },
+    'sequence_diagram': {
+        'type': 'sequence',
+        'title': 'LMS Sequence Diagram: Issue Book',
+        'lifelines': ['Member', 'Librarian', 'Database'],
+        'messages': [
+            {'from': 'Member', 'to': 'Librarian', 'label': '1: Request Book'},
+            {'from': 'Librarian', 'to': 'Database', 'label': '2: Check ISBN'},
+            {'from': 'Database', 'to': 'Librarian', 'label': '3: Available', 'reply': True},
+        ],
+    },
+}
+
+# =============================================================================
+# LAYOUT: spec -> (width, height, primitives)
+# Primitives: ('rect', x, y, w, h, style), ('ellipse', cx, cy, rx, ry, style),
+#             ('line', x1, y1, x2, y2, style), ('text', x, y, text, style)
+# =============================================================================
+def _text_width(lines):
+    return max((len(line) for line in lines), default=0) * CHAR_WIDTH
+
+
+def _layout_class(spec):
+    prims, boxes = [], {}
+    x, top, gap, pad = 40, 60, 140, 10
+    for cls in spec['classes']:
+        attributes, methods = cls.get('attributes', []), cls.get('methods', [])
+        width = max(_text_width([cls['name']] + attributes + methods) + 2 * pad, 120)
+        height = 30 + (len(attributes) + len(methods)) * LINE_HEIGHT + 2 * pad
+        prims.append(('rect', x, top, width, height, {'fill': cls.get('fill', '#ffffff')}))
+        prims.append(('text', x + width / 2, top + 20, cls['name'], {'anchor': 'middle', 'bold': True}))
+        y = top + 30
+        prims.append(('line', x, y, x + width, y, {}))
+        for line in attributes:
+            y += LINE_HEIGHT
+            prims.append(('text', x + pad, y, line, {}))
+        y += pad
+        prims.append(('line', x, y, x + width, y, {}))
+        for line in methods:
+            y += LINE_HEIGHT
+            prims.append(('text', x + pad, y, line, {}))
+        boxes[cls['name']] = (x, top, width, height)
+        x += width + gap
+
+    for rel in spec.get('relations', []):
+        x1, y1, w1, h1 = boxes[rel['from']]
+        x2, y2, w2, h2 = boxes[rel['to']]
+        y = min(y1 + h1, y2 + h2) / 2 + top / 2
+        start, end = (x1 + w1, x2) if x1 < x2 else (x1, x2 + w2)
+        both = rel.get('kind', 'association') == 'association'
+        prims.append(('line', start, y, end, y, {'arrow_end': True, 'arrow_start': both}))
+        prims.append(('text', (start + end) / 2, y - 6, rel.get('label', ''), {'anchor': 'middle', 'size': 11}))
+    height = max((t + h for _, t, _, h in boxes.values()), default=top) + 40
+    return x - gap + 40, height, prims
+
+
+def _layout_use_case(spec):
+    prims = []
+    cases, actors = spec['use_cases'], spec['actors']
+    case_w = max(_text_width(cases) + 50, 160)
+    system_x, system_w = 220, case_w + 80
+    row_h = 70
+    height = 80 + len(cases) * row_h + 20
+    prims.append(('rect', system_x, 50, system_w, height - 70, {'fill': 'none', 'dash': True}))
+    prims.append(('text', system_x + system_w / 2, 72, spec.get('system', ''), {'anchor': 'middle', 'bold': True}))
+
+    centers = {}
+    for i, case in enumerate(cases):
+        cy = 120 + i * row_h
+        cx = system_x + system_w / 2
+        prims.append(('ellipse', cx, cy, case_w / 2, 22, {'fill': '#ffffff'}))
+        prims.append(('text', cx, cy + 4, case, {'anchor': 'middle', 'size': 11}))
+        centers[case] = (cx - case_w / 2, cy)
+
+    actor_pos = {}
+    for i, actor in enumerate(actors):
+        ax = 90
+        ay = 50 + (i + 1) * (height - 50) / (len(actors) + 1)
+        # Stick figure
+        prims.append(('ellipse', ax, ay - 30, 9, 9, {'fill': '#ffffff'}))
+        prims.append(('line', ax, ay - 21, ax, ay + 5, {}))
+        prims.append(('line', ax - 15, ay - 12, ax + 15, ay - 12, {}))
+        prims.append(('line', ax, ay + 5, ax - 12, ay + 25, {}))
+        prims.append(('line', ax, ay + 5, ax + 12, ay + 25, {}))
+        prims.append(('text', ax, ay + 42, actor, {'anchor': 'middle', 'bold': True}))
+        actor_pos[actor] = (ax + 18, ay - 10)
+
+    for actor, case in spec.get('links', []):
+        (x1, y1), (x2, y2) = actor_pos[actor], centers[case]
+        prims.append(('line', x1, y1, x2, y2, {}))
+    return system_x + system_w + 40, height, prims
+
+
+def _layout_sequence(spec):
+    prims = []
+    lifelines, messages = spec['lifelines'], spec['messages']
+    spacing = max(_text_width([m['label'] for m in messages] + lifelines) + 40, 180)
+    xs = {name: 100 + i * spacing for i, name in enumerate(lifelines)}
+    bottom = 110 + len(messages) * 50 + 20
+    for name, x in xs.items():
+        head_w = max(_text_width([name]) + 24, 100)
+        prims.append(('rect', x - head_w / 2, 50, head_w, 32, {'fill': '#d3d3d3'}))
+        prims.append(('text', x, 71, name, {'anchor': 'middle', 'bold': True}))
+        prims.append(('line', x, 82, x, bottom, {'dash': True}))
+    for i, message in enumerate(messages):
+        y = 120 + i * 50
+        x1, x2 = xs[message['from']], xs[message['to']]
+        reply = message.get('reply', False)
+        prims.append(('line', x1, y, x2, y, {'arrow_end': True, 'dash': reply}))
+        prims.append(('text', (x1 + x2) / 2, y - 7, message['label'], {'anchor': 'middle', 'size': 11}))
+    return 100 + (len(lifelines) - 1) * spacing + 100, bottom + 20, prims
+
+
+LAYOUTS = {'class': _layout_class, 'use_case': _layout_use_case, 'sequence': _layout_sequence}
+
+
+def layout(spec):
+    """Return (width, height, primitives) for a spec, title included."""
+    try:
+        layout_fn = LAYOUTS[spec['type']]
+    except KeyError:
+        raise ValueError(f"Unknown diagram type: {spec.get('type')!r}") from None
+    width, height, prims = layout_fn(spec)
+    if spec.get('title'):
+        width = max(width, len(spec['title']) * CHAR_WIDTH * 16 / 12 + 40)
+        prims.insert(0, ('text', width / 2, 28, spec['title'], {'anchor': 'middle', 'bold': True, 'size': 16}))
+    return width, height, prims
+
+# =============================================================================
+# WRITERS
+# =============================================================================
+def to_svg(spec):
+    """Render a spec to SVG text directly (no matplotlib)."""
+    width, height, prims = layout(spec)
+    out = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width:.0f}" height="{height:.0f}" '
+        f'viewBox="0 0 {width:.0f} {height:.0f}" font-family="{FONT}" font-size="12">',
+        '<defs><marker id="arrow" markerWidth="10" markerHeight="8" refX="9" refY="4" orient="auto-start-reverse">'
+        '<path d="M0,0 L10,4 L0,8" fill="none" stroke="black"/></marker></defs>',
+        f'<rect width="{width:.0f}" height="{height:.0f}" fill="white"/>',
+    ]
+    for kind, *args, style in prims:
+        dash = ' stroke-dasharray="6,4"' if style.get('dash') else ''
+        if kind == 'rect':
+            x, y, w, h = args
+            out.append(f'<rect x="{x:.1f}" y="{y:.1f}" width="{w:.1f}" height="{h:.1f}" '
+                       f'fill="{style.get("fill", "none")}" stroke="black" stroke-width="1.5"{dash}/>')
+        elif kind == 'ellipse':
+            cx, cy, rx, ry = args
+            out.append(f'<ellipse cx="{cx:.1f}" cy="{cy:.1f}" rx="{rx:.1f}" ry="{ry:.1f}" '
+                       f'fill="{style.get("fill", "none")}" stroke="black"/>')
+        elif kind == 'line':
+            x1, y1, x2, y2 = args
+            markers = (' marker-end="url(#arrow)"' if style.get('arrow_end') else '') + \
+                      (' marker-start="url(#arrow)"' if style.get('arrow_start') else '')
+            out.append(f'<line x1="{x1:.1f}" y1="{y1:.1f}" x2="{x2:.1f}" y2="{y2:.1f}" '
+                       f'stroke="black"{dash}{markers}/>')
+        elif kind == 'text':
+            x, y, text = args
+            attrs = f' text-anchor="{style["anchor"]}"' if 'anchor' in style else ''
+            attrs += ' font-weight="bold"' if style.get('bold') else ''
+            attrs += f' font-size="{style["size"]}"' if 'size' in style else ''
+            out.append(f'<text x="{x:.1f}" y="{y:.1f}"{attrs}>{escape(text)}</text>')
+    out.append('</svg>')
+    return '\n'.join(out)
+
+
+def draw(spec, fig):
+    """Draw a spec onto a matplotlib Figure (resized to the layout) using the same primitives."""
+    from matplotlib.patches import Ellipse, FancyArrowPatch, Rectangle
+
+    width, height, prims = layout(spec)
+    fig.set_size_inches(width / 100, height / 100)
+    ax = fig.add_axes([0, 0, 1, 1])
+    ax.set_xlim(0, width)
+    ax.set_ylim(height, 0)  # SVG coordinates: y grows downwards
+    ax.axis('off')
+    for kind, *args, style in prims:
+        ls = '--' if style.get('dash') else '-'
+        if kind == 'rect':
+            x, y, w, h = args
+            fill = style.get('fill', 'none')
+            ax.add_patch(Rectangle((x, y), w, h, facecolor=fill, fill=fill != 'none', ec='black', ls=ls))
+        elif kind == 'ellipse':
+            cx, cy, rx, ry = args
+            ax.add_patch(Ellipse((cx, cy), 2 * rx, 2 * ry, facecolor=style.get('fill', 'white'), ec='black'))
+        elif kind == 'line':
+            x1, y1, x2, y2 = args
+            arrow = ('<' if style.get('arrow_start') else '') + '-' + ('>' if style.get('arrow_end') else '')
+            ax.add_patch(FancyArrowPatch((x1, y1), (x2, y2), arrowstyle=arrow, mutation_scale=12, ls=ls))
+        elif kind == 'text':
+            x, y, text = args
+            ax.text(x, y, text, ha={'middle': 'center'}.get(style.get('anchor'), 'left'), va='baseline',
+                    fontsize=style.get('size', 12) * 0.75, weight='bold' if style.get('bold') else 'normal')
+    return fig
+
+
+def save_with_matplotlib(spec, path, dpi=150):
+    """Render a spec to PNG/PDF on a standalone Agg figure (pyplot's backend is untouched)."""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    draw(spec, fig)
+    fig.savefig(path, dpi=dpi)
+
+
+def render(spec, path, dpi=150):
+    """Write one spec to path; the extension picks SVG (direct) or matplotlib output."""
+    if path.endswith('.svg'):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(to_svg(spec))
+    else:
+        save_with_matplotlib(spec, path, dpi)
+    return path
+
+
+def show(spec):
+    """Display a spec in a pyplot window (blocks until it is closed)."""
+    import matplotlib.pyplot as plt
+
+    fig = draw(spec, plt.figure())
+    plt.show()
+    plt.close(fig)
+
+# =============================================================================
+# INCREMENTAL RENDERING
+# =============================================================================
+def spec_hash(spec, fmt, dpi):
+    payload = json.dumps({'spec': spec, 'fmt': fmt, 'dpi': dpi, 'renderer': RENDERER_VERSION}, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def render_all(specs, output_dir, fmt='svg', dpi=150, cache_name='.uml_cache.json'):
+    """
+    Render every {name: spec} into output_dir, skipping diagrams whose spec hash
+    matches the cache and whose output file still exists.
+    Returns (rendered names, skipped names).
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    cache_path = os.path.join(output_dir, cache_name)
+    try:
+        with open(cache_path) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        cache = {}
+
+    rendered, skipped = [], []
+    for name, spec in specs.items():
+        path = os.path.join(output_dir, f"{name}.{fmt}")
+        digest = spec_hash(spec, fmt, dpi)
+        if cache.get(path) == digest and os.path.exists(path):
+            skipped.append(name)
+            continue
+        render(spec, path, dpi)
+        cache[path] = digest
+        rendered.append(name)
+
+    if rendered:
+        with open(cache_path, 'w') as f:
+            json.dump(cache, f, indent=2, sort_keys=True)
+    return rendered, skipped
+
+
+if __name__ == "__main__":
+    fmt = sys.argv[1] if len(sys.argv) > 1 else 'svg'
+    rendered, skipped = render_all({**LMS_DIAGRAMS, **LMS_OVERVIEW_DIAGRAMS}, 'uml_diagrams', fmt=fmt)
+    print(f"✅ Rendered: {rendered or 'none'}")
+    print(f"⏭️  Unchanged (cached): {skipped or 'none'}")
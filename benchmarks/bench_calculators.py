@@ -0,0 +1,256 @@
+"""
+Benchmark suite for the Calculator and DataProcessor implementations.
+
+Covers Experiment 4 (clean.Calculator and mess.f), Experiment 5
+(test.Calculator), Experiment 7 (marven.Calculator, scalar and batch) and
+Experiment 6 (DataProcessor). For each input size it records:
+  latency_ns     - time per operation (best of several repeats)
+  throughput_ops - operations per second over the whole run
+  peak_bytes     - tracemalloc peak during one run
+  allocated_blocks - memory blocks allocated during one run, summed per
+                   allocation site. tracemalloc only sees blocks that are
+                   still alive at the end, so allocations freed within the
+                   run are not counted; peak_bytes covers those
+
+Usage:
+  python benchmarks/bench_calculators.py run --output baseline.json
+  python benchmarks/bench_calculators.py compare baseline.json current.json --threshold 0.10
+"""
+
+import argparse
+import ast
+import contextlib
+import importlib.util
+import io
+import json
+import logging
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+
+
+# =============================================================================
+# LOADING THE EXPERIMENT MODULES (folders have spaces, so load by path)
+# =============================================================================
+def load_module(alias, relative_path):
+    path = os.path.join(ROOT, relative_path)
+    sys.path.insert(0, os.path.dirname(path))  # for sibling imports
+    try:
+        spec = importlib.util.spec_from_file_location(alias, path)
+        module = importlib.util.module_from_spec(spec)
+        with contextlib.redirect_stdout(io.StringIO()):
+            spec.loader.exec_module(module)
+    finally:
+        sys.path.pop(0)
+    return module
+
+
+def load_function(relative_path, name):
+    """Compile a single function from a script that does work at import (mess.py)."""
+    path = os.path.join(ROOT, relative_path)
+    with open(path) as f:
+        tree = ast.parse(f.read(), path)
+    node = next(n for n in tree.body if isinstance(n, ast.FunctionDef) and n.name == name)
+    namespace = {}
+    exec(compile(ast.Module([node], []), path, 'exec'), namespace)
+    return namespace[name]
+
+
+def operands(size, zero_share=0.0, seed=42):
+    rng = random.Random(seed)
+    a = [rng.uniform(-1000, 1000) for _ in range(size)]
+    b = [0.0 if rng.random() < zero_share else rng.uniform(1, 1000) for _ in range(size)]
+    return a, b
+
+
+# =============================================================================
+# BENCHMARK CASES: name -> setup(size) returning a zero-argument run function
+# =============================================================================
+def build_cases():
+    clean = load_module('exp4_clean', 'Experiment 4/clean.py')
+    unit = load_module('exp5_test', 'Experiment 5/test.py')
+    marven = load_module('exp7_marven', 'Experiment 7/marven.py')
+    debug = load_module('exp6_debug', 'Experiment 6/debug.py')
+    mess_f = load_function('Experiment 4/mess.py', 'f')
+
+    def scalar_loop(method_factory, zero_share=0.0):
+        def setup(size):
+            a, b = operands(size, zero_share)
+            method = method_factory()
+            def run():
+                for x, y in zip(a, b):
+                    method(x, y)
+            return run
+        return setup
+
+    def quiet(factory):
+        """Calculator constructors that print (marven) are silenced."""
+        def make():
+            with contextlib.redirect_stdout(io.StringIO()):
+                return factory()
+        return make
+
+    def marven_batch(method_name, zero_share=0.0):
+        def setup(size):
+            np = marven.np
+            a, b = (np.asarray(col) for col in operands(size, zero_share))
+            calc = quiet(marven.Calculator)()
+            method = getattr(calc, method_name)
+            return lambda: method(a, b)
+        return setup
+
+    def mess_loop(op):
+        def setup(size):
+            a, b = operands(size)
+            def run():
+                for x, y in zip(a, b):
+                    mess_f(x, y, op)
+            return run
+        return setup
+
+    def processor(method_name):
+        def setup(size):
+            data = operands(size)[1]
+            proc = debug.DataProcessor(data)
+            return getattr(proc, method_name)
+        return setup
+
+    return {
+        'exp4.clean.add': scalar_loop(lambda: clean.Calculator().add),
+        'exp4.clean.divide': scalar_loop(lambda: clean.Calculator().divide),
+        'exp4.mess.f(add)': mess_loop('add'),
+        'exp4.mess.f(div)': mess_loop('div'),
+        'exp5.test.add': scalar_loop(lambda: unit.Calculator().add),
+        'exp5.test.divide': scalar_loop(lambda: unit.Calculator().divide, zero_share=0.1),
+        'exp7.marven.add': scalar_loop(lambda: quiet(marven.Calculator)().add),
+        'exp7.marven.divide': scalar_loop(lambda: quiet(marven.Calculator)().divide, zero_share=0.1),
+        'exp7.marven.add_batch': marven_batch('add_batch'),
+        'exp7.marven.divide_batch': marven_batch('divide_batch', zero_share=0.1),
+        'exp6.DataProcessor.calculate_results': processor('calculate_results'),
+        'exp6.DataProcessor.calculate_results_streaming': processor('calculate_results_streaming'),
+    }
+
+
+# =============================================================================
+# MEASUREMENT
+# =============================================================================
+def measure(setup, size, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        run = setup(size)
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+
+    # Memory pass (separate, since tracing slows execution down)
+    run = setup(size)
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()  # the snapshot itself must not count towards the run's peak
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    # Count new blocks per allocation site; frees of older blocks at other sites must not offset them
+    ignore = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    diff = after.filter_traces(ignore).compare_to(before.filter_traces(ignore), 'traceback')
+    blocks = sum(stat.count_diff for stat in diff if stat.count_diff > 0)
+
+    return {
+        'latency_ns': best / size * 1e9,
+        'throughput_ops': size / best if best else float('inf'),
+        'peak_bytes': peak,
+        'allocated_blocks': blocks,
+    }
+
+
+def run_suite(sizes, only=None, repeat=3):
+    # DataProcessor logs at DEBUG level; drop the output so it is not timed
+    logging.disable(logging.CRITICAL)
+    cases = build_cases()
+    results = {}
+    for name, setup in cases.items():
+        if only and not any(pattern in name for pattern in only):
+            continue
+        for size in sizes:
+            key = f"{name}[{size}]"
+            results[key] = measure(setup, size, repeat)
+            r = results[key]
+            print(f"{key:<58} {r['latency_ns']:10.1f} ns/op {r['throughput_ops']:14,.0f} ops/s "
+                  f"{r['peak_bytes'] / 1024:10.1f} KiB peak {r['allocated_blocks']:8d} allocated blocks")
+    logging.disable(logging.NOTSET)
+    return {
+        'meta': {
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'sizes': sizes,
+        },
+        'results': results,
+    }
+
+
+# Metric -> +1 if higher is worse, -1 if lower is worse
+METRICS = {'latency_ns': 1, 'throughput_ops': -1, 'peak_bytes': 1, 'allocated_blocks': 1}
+
+
+def compare(baseline, current, threshold=0.10):
+    """Return a list of (case, metric, old, new, change) beyond `threshold`."""
+    regressions = []
+    for key, new in current['results'].items():
+        old = baseline['results'].get(key)
+        if old is None:
+            continue
+        for metric, direction in METRICS.items():
+            if not old.get(metric):
+                continue
+            change = (new[metric] - old[metric]) / old[metric]
+            if change * direction > threshold:
+                regressions.append((key, metric, old[metric], new[metric], change))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Calculator/DataProcessor benchmark suite")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_cmd = commands.add_parser('run', help="run benchmarks and save a JSON baseline")
+    run_cmd.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    run_cmd.add_argument('--only', nargs='+', help="substring filter on case names")
+    run_cmd.add_argument('--repeat', type=int, default=3)
+    run_cmd.add_argument('--output', default='bench_results.json')
+
+    cmp_cmd = commands.add_parser('compare', help="flag regressions between two result files")
+    cmp_cmd.add_argument('baseline')
+    cmp_cmd.add_argument('current')
+    cmp_cmd.add_argument('--threshold', type=float, default=0.10, help="relative change, e.g. 0.10 = 10%%")
+
+    args = parser.parse_args(argv)
+    if args.command == 'run':
+        report = run_suite(args.sizes, args.only, args.repeat)
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✅ Saved {len(report['results'])} results to {args.output}")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    regressions = compare(baseline, current, args.threshold)
+    for key, metric, old, new, change in regressions:
+        print(f"❌ {key}: {metric} {old:,.1f} -> {new:,.1f} ({change:+.1%})")
+    if not regressions:
+        print(f"✅ No regressions beyond {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())